@@ -0,0 +1 @@
+"""Benchmarks of gitp against a fake GitHub server."""
@@ -0,0 +1,97 @@
+"""Benchmarks of gitp commands, prompts answered without waiting."""
+import subprocess  # noqa: S404
+import sys
+from typing import Any
+from typing import List
+from typing import Tuple
+
+import pytest
+from benchmarks import conftest
+from benchmarks import fake_github as fg
+from click.testing import CliRunner
+
+import git_portfolio.__main__ as gp
+import git_portfolio.config_manager as cm
+import git_portfolio.domain.issue as i
+import git_portfolio.domain.pull_request as pr
+import git_portfolio.domain.pull_request_merge as prm
+import git_portfolio.prompt as p
+
+# command line, prompt method and its answer
+COMMANDS: List[Tuple[List[str], str, Any]] = [
+    (["rate-limit"], "", None),
+    (["cache", "refresh"], "", None),
+    (
+        ["create", "issues"],
+        "create_issues",
+        i.Issue(0, "benchmark issue", "body", {"bench"}),
+    ),
+    (["close", "issues"], "close_objects", "bench issue"),
+    (
+        ["create", "prs"],
+        "create_pull_requests",
+        pr.PullRequest(
+            "benchmark PR",
+            "body",
+            {"bench"},
+            True,
+            "bench issue",
+            True,
+            "feature-0",
+            fg.DEFAULT_BRANCH,
+            False,
+        ),
+    ),
+    (["close", "prs"], "close_objects", "bench PR"),
+    (
+        ["merge", "prs"],
+        "merge_pull_requests",
+        prm.PullRequestMerge(fg.DEFAULT_BRANCH, "feature-0", "bench", True),
+    ),
+    (["delete", "branches"], "delete_branches", "feature-1"),
+]
+
+
+@pytest.mark.parametrize("api", ["rest", "graphql"])
+@pytest.mark.parametrize(
+    "args,prompt,answer", COMMANDS, ids=[" ".join(c[0]) for c in COMMANDS]
+)
+def bench_command(
+    monkeypatch: pytest.MonkeyPatch,
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    api: str,
+    args: List[str],
+    prompt: str,
+    answer: Any,
+) -> None:
+    """Run command as a new gitp process would, with caches kept on disk."""
+    monkeypatch.setattr(gp, "CONFIG_MANAGER", config_manager)
+    if prompt:
+        monkeypatch.setattr(
+            p.InquirerPrompter, prompt, staticmethod(lambda *args: answer)
+        )
+    runner = CliRunner()
+
+    def setup() -> None:
+        fake_github.reset()
+        gp.GITHUB_SERVICES.clear()
+        gp.CONFIG_MANAGER = cm.ConfigManager()
+
+    result = benchmark(lambda: runner.invoke(gp.main, ["--api", api, *args]), setup)
+    gp.GITHUB_SERVICES.clear()
+    assert result.exit_code == 0, result.output
+
+
+def bench_startup(benchmark: conftest.Benchmark) -> None:
+    """Start a gitp process up to command parsing, as each shell command does.
+
+    Compared to saved results with --benchmark-compare rather than to a fixed
+    budget, which depends on the machine.
+    """
+    benchmark(
+        lambda: subprocess.run(  # noqa: S603
+            [sys.executable, "-c", "import git_portfolio.__main__"], check=True
+        )
+    )
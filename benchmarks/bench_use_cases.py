@@ -0,0 +1,274 @@
+"""Benchmarks of GitHub use cases on each read backend."""
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+
+import pytest
+from benchmarks import conftest
+from benchmarks import fake_github as fg
+
+import git_portfolio.config_manager as cm
+import git_portfolio.domain.issue as i
+import git_portfolio.domain.pull_request as pr
+import git_portfolio.domain.pull_request_merge as prm
+import git_portfolio.domain.repo_result as rr
+import git_portfolio.github_service as ghs
+import git_portfolio.issue_mirror as im
+import git_portfolio.request_objects.issue_list as il
+import git_portfolio.responses as res
+import git_portfolio.use_cases.gh as gh
+import git_portfolio.use_cases.gh_close_issue as ghcli
+import git_portfolio.use_cases.gh_create_issue as ghci
+import git_portfolio.use_cases.gh_create_pr as ghcp
+import git_portfolio.use_cases.gh_delete_branch as ghdb
+import git_portfolio.use_cases.gh_merge_pr as ghmp
+
+
+@pytest.fixture(params=["rest", "graphql"])
+def backend(request: pytest.FixtureRequest) -> str:
+    """Read backend of service."""
+    param: str = request.param
+    return param
+
+
+def run_use_case(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    backend: str,
+    use_case: Callable[..., gh.GhUseCase],
+    *args: Any,
+    issue_mirror: Optional[im.IssueMirror] = None,
+) -> None:
+    """Benchmark use case on selected portfolio, with new state each round."""
+    # created by setup, execute signatures differ
+    use_cases: List[Any] = []
+
+    def setup() -> None:
+        fake_github.reset()
+        service = conftest.make_service(fake_github, backend, issue_mirror)
+        use_cases[:] = [use_case(config_manager, service)]
+
+    def run() -> Any:
+        return use_cases[0].execute(*args)
+
+    response = benchmark(run, setup)
+    assert isinstance(response, res.ResponseSuccess), response.value
+    assert not use_cases[0].error, use_cases[0].errors
+    failed = [r for r in use_cases[0].results if r.status != rr.SUCCESS]
+    assert not failed, failed
+
+
+def bench_list_catalog(
+    benchmark: conftest.Benchmark, fake_github: fg.FakeGithub, size: int
+) -> None:
+    """List repositories of the token."""
+    services: List[ghs.GithubService] = []
+
+    def setup() -> None:
+        services[:] = [conftest.make_service(fake_github)]
+
+    repo_names = benchmark(lambda: services[0].get_repo_names(), setup)
+    assert len(repo_names) == size
+
+
+def bench_create_issues(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    backend: str,
+) -> None:
+    """Create an issue in each repository."""
+    issue = i.Issue(0, "benchmark issue", "body", {"bench"})
+    run_use_case(
+        benchmark,
+        fake_github,
+        config_manager,
+        backend,
+        ghci.GhCreateIssueUseCase,
+        issue,
+    )
+
+
+def bench_close_issues(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    backend: str,
+) -> None:
+    """Close all open issues of each repository."""
+    request = il.build_list_request(
+        filters={"obj__eq": "issue", "state__eq": "open", "title__contains": "bench"}
+    )
+    run_use_case(
+        benchmark,
+        fake_github,
+        config_manager,
+        backend,
+        ghcli.GhCloseIssueUseCase,
+        request,
+    )
+
+
+def bench_close_issues_mirror(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    issue_mirror: im.IssueMirror,
+) -> None:
+    """Close all open issues of each repository listed from issue mirror.
+
+    The first round fills the mirror, the next ones sync issues reopened by
+    reset.
+    """
+    request = il.build_list_request(
+        filters={"obj__eq": "issue", "state__eq": "open", "title__contains": "bench"}
+    )
+    run_use_case(
+        benchmark,
+        fake_github,
+        config_manager,
+        "rest",
+        ghcli.GhCloseIssueUseCase,
+        request,
+        issue_mirror=issue_mirror,
+    )
+
+
+def bench_list_open_issues(
+    benchmark: conftest.Benchmark, fake_github: fg.FakeGithub, backend: str
+) -> None:
+    """List open issues of all repositories."""
+    request = il.build_list_request(filters={"obj__eq": "issue", "state__eq": "open"})
+    services: List[ghs.GithubService] = []
+
+    def setup() -> None:
+        services[:] = [conftest.make_service(fake_github, backend)]
+
+    issues = benchmark(
+        lambda: services[0].list_issues_from_repos(
+            fake_github.portfolio.repo_names(), request
+        ),
+        setup,
+    )
+    assert len(issues) == fake_github.portfolio.repos
+
+
+def bench_list_open_issues_title_substring(
+    benchmark: conftest.Benchmark, fake_github: fg.FakeGithub, backend: str
+) -> None:
+    """List issues of all repositories by part of a word of their title.
+
+    Search matches whole words, so titles are filtered locally to match
+    substrings as the list API does.
+    """
+    request = il.build_list_request(
+        filters={"obj__eq": "issue", "state__eq": "open", "title__contains": "ench iss"}
+    )
+    services: List[ghs.GithubService] = []
+
+    def setup() -> None:
+        services[:] = [conftest.make_service(fake_github, backend)]
+
+    issues = benchmark(
+        lambda: services[0].list_issues_from_repos(
+            fake_github.portfolio.repo_names(), request
+        ),
+        setup,
+    )
+    assert [len(repo_issues) for repo_issues in issues.values()] == [
+        fake_github.portfolio.issues
+    ] * fake_github.portfolio.repos
+
+
+def bench_list_open_issues_mirror(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    issue_mirror: im.IssueMirror,
+) -> None:
+    """List open issues of all repositories from a mirror without changes.
+
+    Even unchanged, each repo costs one revalidation request, paced by the
+    read bucket outside benchmarks, where search or GraphQL send one.
+    """
+    request = il.build_list_request(filters={"obj__eq": "issue", "state__eq": "open"})
+    repos = fake_github.portfolio.repo_names()
+    services: List[ghs.GithubService] = []
+
+    def setup() -> None:
+        services[:] = [conftest.make_service(fake_github, issue_mirror=issue_mirror)]
+        services[0].sync_issue_mirror(repos)
+
+    issues = benchmark(
+        lambda: services[0].list_issues_from_repos(repos, request), setup
+    )
+    assert len(issues) == fake_github.portfolio.repos
+
+
+def bench_create_prs(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    backend: str,
+) -> None:
+    """Create a pull request linking issues in each repository."""
+    pull_request = pr.PullRequest(
+        "benchmark PR",
+        "body",
+        {"bench"},
+        True,
+        "bench issue",
+        True,
+        "feature-0",
+        fg.DEFAULT_BRANCH,
+        False,
+    )
+    request = il.build_list_request(
+        filters={
+            "obj__eq": "issue",
+            "state__eq": "open",
+            "title__contains": "bench issue",
+        }
+    )
+    run_use_case(
+        benchmark,
+        fake_github,
+        config_manager,
+        backend,
+        ghcp.GhCreatePrUseCase,
+        pull_request,
+        request,
+    )
+
+
+def bench_merge_prs(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    backend: str,
+) -> None:
+    """Merge a pull request and delete its branch in each repository."""
+    pr_merge = prm.PullRequestMerge(
+        fg.DEFAULT_BRANCH, "feature-0", fake_github.portfolio.owner, True
+    )
+    run_use_case(
+        benchmark, fake_github, config_manager, backend, ghmp.GhMergePrUseCase, pr_merge
+    )
+
+
+def bench_delete_branches(
+    benchmark: conftest.Benchmark,
+    fake_github: fg.FakeGithub,
+    config_manager: cm.ConfigManager,
+    backend: str,
+) -> None:
+    """Delete a branch in each repository."""
+    run_use_case(
+        benchmark,
+        fake_github,
+        config_manager,
+        backend,
+        ghdb.GhDeleteBranchUseCase,
+        "feature-1",
+    )
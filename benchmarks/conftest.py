@@ -0,0 +1,275 @@
+"""Benchmark fixtures, options and report.
+
+Benchmarks are in bench_*.py files, run with `nox -s benchmarks`. Each one
+times gitp against a FakeGithub server and records requests it received.
+"""
+import dataclasses
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+import _pytest.config.argparsing
+import _pytest.fixtures
+import _pytest.python
+import _pytest.terminal
+import pytest
+import yaml
+from benchmarks import fake_github as fg
+
+import git_portfolio.config_manager as cm
+import git_portfolio.defaults as dfl
+import git_portfolio.domain.config as c
+import git_portfolio.domain.gh_connection_settings as cs
+import git_portfolio.github_service as ghs
+import git_portfolio.issue_mirror as im
+import git_portfolio.rate_limit as rl
+
+DEFAULT_SIZES = "10,100"
+# relative slowdown over baseline reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+RECORDS: List[Dict[str, Any]] = []
+REGRESSIONS: List[str] = []
+
+
+def pytest_addoption(parser: _pytest.config.argparsing.Parser) -> None:
+    """Add benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma separated portfolio sizes in repos (default {DEFAULT_SIZES}).",
+    )
+    group.addoption(
+        "--issues", type=int, default=5, help="Open issues per repo (default 5)."
+    )
+    group.addoption(
+        "--pulls", type=int, default=2, help="Open PRs per repo (default 2)."
+    )
+    group.addoption(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds the fake server waits before each response (default 0).",
+    )
+    group.addoption(
+        "--rate-limit",
+        type=int,
+        default=0,
+        help="Requests per second allowed by the fake server (default no limit).",
+    )
+    group.addoption(
+        "--paced",
+        action="store_true",
+        help="Keep gitp client-side request pacing, disabled by default.",
+    )
+    group.addoption(
+        "--rounds", type=int, default=3, help="Timed runs of each benchmark."
+    )
+    group.addoption("--benchmark-save", help="Save results to JSON file.")
+    group.addoption(
+        "--benchmark-compare", help="Compare results to JSON file saved before."
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative slowdown reported as regression (default 0.25).",
+    )
+
+
+def pytest_generate_tests(metafunc: _pytest.python.Metafunc) -> None:
+    """Run benchmarks using a portfolio for each size."""
+    if "size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("sizes").split(",")]
+        metafunc.parametrize("size", sizes, ids=[f"{size}repos" for size in sizes])
+
+
+@pytest.fixture(autouse=True)
+def pacing(
+    request: _pytest.fixtures.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Disable client-side pacing, it would measure the buckets only."""
+    if not request.config.getoption("paced"):
+        monkeypatch.setattr(rl.TokenBucket, "acquire", lambda self: None)
+
+
+@pytest.fixture
+def portfolio(request: _pytest.fixtures.FixtureRequest, size: int) -> fg.Portfolio:
+    """Synthetic portfolio of size repos."""
+    return fg.Portfolio(
+        size, request.config.getoption("issues"), request.config.getoption("pulls")
+    )
+
+
+@pytest.fixture
+def fake_github(
+    request: _pytest.fixtures.FixtureRequest, portfolio: fg.Portfolio
+) -> Iterator[fg.FakeGithub]:
+    """Fake GitHub server for portfolio."""
+    fake = fg.FakeGithub(
+        portfolio,
+        latency=request.config.getoption("latency"),
+        rate_limit=request.config.getoption("rate_limit"),
+    ).start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def config_manager(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, fake_github: fg.FakeGithub
+) -> cm.ConfigManager:
+    """Config selecting all repos of fake server, in a temporary home."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    manager = cm.ConfigManager()
+    os.makedirs(manager.config_folder)
+    config = c.Config(fake_github.url, fg.TOKEN, fake_github.portfolio.repo_names())
+    with open(manager.config_path, "w") as config_file:
+        yaml.dump(dataclasses.asdict(config), config_file)
+    return manager
+
+
+@pytest.fixture
+def issue_mirror(config_manager: cm.ConfigManager) -> im.IssueMirror:
+    """Issue mirror of config, kept between rounds as between gitp runs."""
+    return config_manager.get_issue_mirror(dfl.ISSUE_MIRROR_FILENAME)
+
+
+def make_service(
+    fake: fg.FakeGithub,
+    read_backend: str = "rest",
+    issue_mirror: Optional[im.IssueMirror] = None,
+) -> ghs.GithubService:
+    """Return service connected to fake server, without caches but mirror."""
+    settings = cs.GhConnectionSettings(fg.TOKEN, fake.url)
+    return ghs.GithubService(
+        settings, read_backend=read_backend, issue_mirror=issue_mirror
+    )
+
+
+class Benchmark:
+    """Time a function and count requests it sends to the fake server."""
+
+    def __init__(self, name: str, fake: fg.FakeGithub, rounds: int, size: int) -> None:
+        """Constructor."""
+        self.name = name
+        self.fake = fake
+        self.rounds = rounds
+        self.size = size
+
+    def __call__(
+        self, fn: Callable[[], Any], setup: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """Run setup then fn for each round, time and record fn only.
+
+        Args:
+            fn: benchmarked function.
+            setup: prepares a round, eg. resets state changed by fn.
+
+        Returns:
+            Any: result of the last fn call.
+        """
+        timings = []
+        result = None
+        for _ in range(self.rounds):
+            if setup is not None:
+                setup()
+            self.fake.reset_counts()
+            start = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - start)
+        with self.fake.lock:
+            routes = dict(self.fake.requests)
+        RECORDS.append(
+            {
+                "name": self.name,
+                "repos": self.size,
+                "min": min(timings),
+                "median": statistics.median(timings),
+                "requests": sum(routes.values()),
+                "routes": routes,
+            }
+        )
+        return result
+
+
+@pytest.fixture
+def benchmark(
+    request: _pytest.fixtures.FixtureRequest, fake_github: fg.FakeGithub, size: int
+) -> Benchmark:
+    """Benchmark of the test, recorded in report."""
+    return Benchmark(
+        request.node.name, fake_github, request.config.getoption("rounds"), size
+    )
+
+
+def _regressions(baseline: List[Dict[str, Any]], tolerance: float) -> Iterator[str]:
+    """Yield benchmarks slower or sending more requests than baseline."""
+    previous = {record["name"]: record for record in baseline}
+    for record in RECORDS:
+        old = previous.get(record["name"])
+        if old is None:
+            continue
+        if record["min"] > old["min"] * (1 + tolerance):
+            yield f"{record['name']}: {old['min']:.3f}s -> {record['min']:.3f}s"
+        if record["requests"] > old["requests"]:
+            yield (
+                f"{record['name']}: {old['requests']} -> {record['requests']} "
+                "requests"
+            )
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Save results, fail on regressions against compared results."""
+    if not RECORDS:
+        return
+    save_path = session.config.getoption("benchmark_save")
+    if save_path:
+        with open(save_path, "w") as save_file:
+            json.dump(RECORDS, save_file, indent=2)
+    compare_path = session.config.getoption("benchmark_compare")
+    if compare_path:
+        with open(compare_path) as compare_file:
+            baseline = json.load(compare_file)
+        tolerance = session.config.getoption("benchmark_tolerance")
+        REGRESSIONS.extend(_regressions(baseline, tolerance))
+        if REGRESSIONS:
+            session.exitstatus = 1
+
+
+def pytest_terminal_summary(
+    terminalreporter: _pytest.terminal.TerminalReporter,
+    exitstatus: int,
+    config: _pytest.config.Config,
+) -> None:
+    """Report benchmark results, save or compare them."""
+    if not RECORDS:
+        return
+    terminalreporter.section("benchmarks")
+    width = max(len(record["name"]) for record in RECORDS)
+    terminalreporter.write_line(
+        f"{'name':<{width}} {'min (s)':>9} {'median (s)':>11} {'requests':>9}"
+    )
+    for record in RECORDS:
+        terminalreporter.write_line(
+            f"{record['name']:<{width}} {record['min']:>9.3f} "
+            f"{record['median']:>11.3f} {record['requests']:>9}"
+        )
+    save_path = config.getoption("benchmark_save")
+    if save_path:
+        terminalreporter.write_line(f"Saved to {save_path}.")
+    compare_path = config.getoption("benchmark_compare")
+    if compare_path:
+        for regression in REGRESSIONS:
+            terminalreporter.write_line(f"Regression {regression}", red=True)
+        if not REGRESSIONS:
+            terminalreporter.write_line(f"No regression against {compare_path}.")
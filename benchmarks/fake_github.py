@@ -0,0 +1,1043 @@
+"""Fake GitHub REST and GraphQL API serving a synthetic portfolio.
+
+Only the endpoints and GraphQL documents used by gitp are implemented, with
+just enough fields for github3 models. Requests are counted by route, and
+latency and rate limits can be injected to see how gitp copes with them.
+"""
+import collections
+import datetime
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from dataclasses import field
+from http import server
+from typing import Any
+from typing import Counter
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+HOST = "127.0.0.1"
+TOKEN = "fake-token"  # noqa: S105
+DEFAULT_BRANCH = "main"
+PAGE_SIZE = 30
+# update times of issues, increasing across servers and resets, so mirrors
+# kept on disk between rounds see every change
+_updates = itertools.count()
+_EPOCH = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _timestamp() -> str:
+    """Return a new update time, later than all previous ones."""
+    moment = _EPOCH + datetime.timedelta(seconds=next(_updates))
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass
+class Portfolio:
+    """Synthetic repositories of one owner."""
+
+    repos: int = 10
+    # open issues and pull requests of each repo
+    issues: int = 5
+    pulls: int = 2
+    owner: str = "bench"
+
+    def repo_names(self) -> List[str]:
+        """Return full names of repositories."""
+        return [f"{self.owner}/repo{n}" for n in range(self.repos)]
+
+
+@dataclass
+class FakeIssue:
+    """Issue or pull request of a fake repository."""
+
+    number: int
+    title: str
+    body: str
+    labels: Set[str]
+    state: str = "open"
+    # pull requests only
+    head: str = ""
+    base: str = ""
+    updated_at: str = field(default_factory=_timestamp)
+
+    def close(self) -> None:
+        """Close issue, updating it."""
+        self.state = "closed"
+        self.updated_at = _timestamp()
+
+
+@dataclass
+class FakeRepo:
+    """Repository with issues, pull requests and branches."""
+
+    id: int
+    owner: str
+    name: str
+    issues: Dict[int, FakeIssue] = field(default_factory=dict)
+    branches: Set[str] = field(default_factory=set)
+
+    @property
+    def full_name(self) -> str:
+        """Return owner/name."""
+        return f"{self.owner}/{self.name}"
+
+    def add(self, issue: FakeIssue) -> FakeIssue:
+        """Add issue with next number."""
+        issue.number = len(self.issues) + 1
+        self.issues[issue.number] = issue
+        return issue
+
+    def pulls(self) -> List[FakeIssue]:
+        """Return pull requests."""
+        return [issue for issue in self.issues.values() if issue.head]
+
+
+def _node_id(repo: FakeRepo, issue: FakeIssue) -> str:
+    prefix = "PR" if issue.head else "I"
+    return f"{prefix}_{repo.id}_{issue.number}"
+
+
+def _add_issue(
+    nodes: Dict[str, Tuple[FakeRepo, FakeIssue]], repo: FakeRepo, issue: FakeIssue
+) -> FakeIssue:
+    """Add issue to repo and to GraphQL nodes by id."""
+    repo.add(issue)
+    nodes[_node_id(repo, issue)] = (repo, issue)
+    return issue
+
+
+class Response:
+    """Status, headers and JSON body of a response."""
+
+    def __init__(
+        self,
+        status: int,
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Constructor."""
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+class FakeGithub:
+    """In-memory GitHub state and HTTP server exposing it.
+
+    Args:
+        portfolio: repositories to create.
+        latency: seconds waited before answering each request.
+        rate_limit: requests allowed per `rate_window` seconds, 0 for no
+            limit. Requests beyond it get rate limited responses.
+        rate_window: seconds of each rate limit window.
+    """
+
+    def __init__(
+        self,
+        portfolio: Portfolio,
+        latency: float = 0.0,
+        rate_limit: int = 0,
+        rate_window: float = 1.0,
+    ) -> None:
+        """Constructor."""
+        self.portfolio = portfolio
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.lock = threading.Lock()
+        self.requests: Counter[str] = collections.Counter()
+        self.window_start = time.time()
+        self.window_requests = 0
+        self.repos: Dict[str, FakeRepo] = {}
+        self.nodes: Dict[str, Tuple[FakeRepo, FakeIssue]] = {}
+        self.reset()
+        self.httpd = server.ThreadingHTTPServer((HOST, 0), _Handler)
+        self.httpd.daemon_threads = True
+        setattr(self.httpd, "fake", self)  # noqa: B010
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Return root url, used as GitHub Enterprise hostname."""
+        return f"http://{HOST}:{self.httpd.server_port}"
+
+    @property
+    def api_url(self) -> str:
+        """Return REST API url."""
+        return f"{self.url}/api/v3"
+
+    def start(self) -> "FakeGithub":
+        """Serve requests in background."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset(self) -> None:
+        """Restore portfolio as created, undoing changes made by requests."""
+        repos: Dict[str, FakeRepo] = {}
+        nodes: Dict[str, Tuple[FakeRepo, FakeIssue]] = {}
+        for n, full_name in enumerate(self.portfolio.repo_names()):
+            owner, name = full_name.split("/")
+            repo = FakeRepo(n + 1, owner, name, branches={DEFAULT_BRANCH})
+            for number in range(self.portfolio.issues):
+                _add_issue(
+                    nodes, repo, FakeIssue(0, f"bench issue {number}", "", {"bench"})
+                )
+            for number in range(self.portfolio.pulls):
+                branch = f"feature-{number}"
+                repo.branches.add(branch)
+                pull = FakeIssue(
+                    0, f"bench PR {number}", "", set(), head=branch, base=DEFAULT_BRANCH
+                )
+                _add_issue(nodes, repo, pull)
+            repos[full_name.lower()] = repo
+        with self.lock:
+            self.repos = repos
+            self.nodes = nodes
+
+    def reset_counts(self) -> None:
+        """Forget counted requests."""
+        with self.lock:
+            self.requests.clear()
+
+    @property
+    def total_requests(self) -> int:
+        """Return number of requests received since last reset."""
+        with self.lock:
+            return sum(self.requests.values())
+
+    def _rate_limit_headers(self, count: bool = True) -> Tuple[bool, Dict[str, str]]:
+        """Count request in rate limit window, return if it is allowed."""
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= self.rate_window:
+                self.window_start = now
+                self.window_requests = 0
+            self.window_requests += count
+            limit = self.rate_limit or 5000
+            remaining = max(limit - self.window_requests, 0)
+            allowed = not self.rate_limit or self.window_requests <= limit
+            reset = self.window_start + self.rate_window
+        return allowed, {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(reset) + 1),
+        }
+
+    def handle(
+        self, method: str, path: str, headers: Dict[str, str], body: Any
+    ) -> Response:
+        """Answer one request.
+
+        Args:
+            method: HTTP method.
+            path: request path with query string.
+            headers: request headers.
+            body: decoded JSON body, if any.
+
+        Returns:
+            Response: answer.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        parsed = urllib.parse.urlsplit(path)
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        route = parsed.path
+        if route.startswith("/api/v3"):
+            route = route[len("/api/v3") :]
+        route_name, response = self._route(method, route, query, headers, body)
+        with self.lock:
+            self.requests[f"{method} {route_name}"] += 1
+        if headers.get("Authorization") != f"token {TOKEN}":
+            return Response(401, {"message": "Bad credentials"})
+        # like GitHub, checking the rate limit does not count against it
+        allowed, limit_headers = self._rate_limit_headers(route_name != "rate_limit")
+        if not allowed:
+            limit_headers["X-RateLimit-Remaining"] = "0"
+            return Response(403, {"message": "API rate limit exceeded"}, limit_headers)
+        response.headers.update(limit_headers)
+        return response
+
+    def _route(
+        self,
+        method: str,
+        route: str,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+    ) -> Tuple[str, Response]:
+        """Return route name and response, without side effects on errors."""
+        for pattern, route_method, name in ROUTES:
+            match = re.fullmatch(pattern, route)
+            if match and route_method == method:
+                handler = getattr(self, f"_{name}")
+                return name, handler(query, headers, body, *match.groups())
+        return "unknown", Response(404, {"message": "Not Found"})
+
+    def _repo(self, owner: str, name: str) -> Optional[FakeRepo]:
+        return self.repos.get(f"{owner}/{name}".lower())
+
+    # REST endpoints
+
+    def _rate_limit(
+        self, query: Dict[str, str], headers: Dict[str, str], body: Any
+    ) -> Response:
+        _, limit_headers = self._rate_limit_headers(count=False)
+        core = {
+            "limit": int(limit_headers["X-RateLimit-Limit"]),
+            "remaining": int(limit_headers["X-RateLimit-Remaining"]),
+            "reset": int(limit_headers["X-RateLimit-Reset"]),
+        }
+        return Response(200, {"resources": {"core": core}, "rate": core})
+
+    def _user(
+        self, query: Dict[str, str], headers: Dict[str, str], body: Any
+    ) -> Response:
+        user = dict(
+            _user_json(self.api_url, self.portfolio.owner),
+            bio=None,
+            blog=None,
+            company=None,
+            created_at="2020-01-01T00:00:00Z",
+            email=None,
+            followers=0,
+            following=0,
+            hireable=None,
+            location=None,
+            name=None,
+            public_gists=0,
+            public_repos=len(self.repos),
+            updated_at="2020-01-01T00:00:00Z",
+        )
+        return Response(200, user, {"X-OAuth-Scopes": "repo"})
+
+    def _user_repos(
+        self, query: Dict[str, str], headers: Dict[str, str], body: Any
+    ) -> Response:
+        per_page = int(query.get("per_page", PAGE_SIZE))
+        page = int(query.get("page", 1))
+        repos = list(self.repos.values())
+        items = repos[(page - 1) * per_page : page * per_page]
+        etag = f'"repos-{page}-{len(repos)}"'
+        response_headers = {"ETag": etag}
+        if page * per_page < len(repos):
+            next_url = f"{self.api_url}/user/repos?per_page={per_page}&page={page + 1}"
+            response_headers["Link"] = f'<{next_url}>; rel="next"'
+        if headers.get("If-None-Match") == etag:
+            return Response(304, None, response_headers)
+        return Response(
+            200,
+            [{"id": repo.id, "full_name": repo.full_name} for repo in items],
+            response_headers,
+        )
+
+    def _get_repo(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None:
+            return Response(404, {"message": "Not Found"})
+        return Response(200, _repo_json(self.api_url, self.url, repo))
+
+    def _create_issue(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None:
+            return Response(404, {"message": "Not Found"})
+        with self.lock:
+            issue = _add_issue(
+                self.nodes,
+                repo,
+                FakeIssue(
+                    0,
+                    body["title"],
+                    body.get("body") or "",
+                    set(body.get("labels") or []),
+                ),
+            )
+        return Response(201, _issue_json(self.api_url, self.url, repo, issue))
+
+    def _list_issues(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None:
+            return Response(404, {"message": "Not Found"})
+        state = query.get("state", "open")
+        since = query.get("since", "")
+        by_update = query.get("sort") == "updated"
+        issues = [
+            issue
+            for issue in sorted(
+                repo.issues.values(),
+                key=lambda issue: (issue.updated_at if by_update else "", issue.number),
+                reverse=query.get("direction", "desc") == "desc",
+            )
+            if (state == "all" or issue.state == state) and issue.updated_at >= since
+        ]
+        response = self._page(
+            f"/repos/{repo.full_name}/issues",
+            query,
+            [_issue_json(self.api_url, self.url, repo, issue) for issue in issues],
+        )
+        digest = hashlib.sha256(json.dumps(response.body).encode()).hexdigest()
+        response.headers["ETag"] = f'"issues-{digest[:16]}"'
+        if headers.get("If-None-Match") == response.headers["ETag"]:
+            return Response(304, None, response.headers)
+        return response
+
+    def _get_issue(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+        number: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None or int(number) not in repo.issues:
+            return Response(404, {"message": "Not Found"})
+        issue = repo.issues[int(number)]
+        return Response(200, _issue_json(self.api_url, self.url, repo, issue))
+
+    def _update_issue(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+        number: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None or int(number) not in repo.issues:
+            return Response(404, {"message": "Not Found"})
+        issue = repo.issues[int(number)]
+        if body.get("state", issue.state) != issue.state:
+            issue.state = body["state"]
+            issue.updated_at = _timestamp()
+        return Response(200, _issue_json(self.api_url, self.url, repo, issue))
+
+    def _add_labels(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+        number: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None or int(number) not in repo.issues:
+            return Response(404, {"message": "Not Found"})
+        issue = repo.issues[int(number)]
+        labels = body.get("labels", body) if isinstance(body, dict) else body
+        issue.labels.update(labels)
+        issue.updated_at = _timestamp()
+        return Response(
+            200, [_label_json(self.api_url, label) for label in issue.labels]
+        )
+
+    def _create_pull(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None:
+            return Response(404, {"message": "Not Found"})
+        head = body["head"].split(":")[-1]
+        if head not in repo.branches:
+            return Response(
+                422,
+                {
+                    "message": "Validation Failed",
+                    "errors": [
+                        {"resource": "PullRequest", "field": "head", "code": "invalid"}
+                    ],
+                },
+            )
+        with self.lock:
+            pull = _add_issue(
+                self.nodes,
+                repo,
+                FakeIssue(
+                    0,
+                    body["title"],
+                    body.get("body") or "",
+                    set(),
+                    head=head,
+                    base=body["base"],
+                ),
+            )
+        return Response(201, _pull_json(self.api_url, self.url, repo, pull))
+
+    def _list_pulls(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None:
+            return Response(404, {"message": "Not Found"})
+        state = query.get("state", "open")
+        head = query.get("head", "")
+        pulls = [
+            pull
+            for pull in repo.pulls()
+            if (state == "all" or pull.state == state)
+            and (not query.get("base") or pull.base == query["base"])
+            and (not head or f"{repo.owner}:{pull.head}".lower() == head.lower())
+        ]
+        return self._page(
+            f"/repos/{repo.full_name}/pulls",
+            query,
+            [_pull_json(self.api_url, self.url, repo, pull) for pull in pulls],
+        )
+
+    def _merge_pull(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+        number: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None or int(number) not in repo.issues:
+            return Response(404, {"message": "Not Found"})
+        pull = repo.issues[int(number)]
+        if pull.state != "open":
+            return Response(405, {"message": "Pull Request is not mergeable"})
+        pull.close()
+        return Response(
+            200, {"merged": True, "message": "Pull Request successfully merged"}
+        )
+
+    def _get_ref(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+        branch: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None or branch not in repo.branches:
+            return Response(404, {"message": "Not Found"})
+        url = f"{self.api_url}/repos/{repo.full_name}/git/refs/heads/{branch}"
+        return Response(
+            200,
+            {
+                "ref": f"refs/heads/{branch}",
+                "url": url,
+                "object": {"sha": "0" * 40, "type": "commit", "url": url},
+            },
+        )
+
+    def _delete_ref(
+        self,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: Any,
+        owner: str,
+        name: str,
+        branch: str,
+    ) -> Response:
+        repo = self._repo(owner, name)
+        if repo is None or branch not in repo.branches:
+            return Response(422, {"message": "Reference does not exist"})
+        repo.branches.discard(branch)
+        return Response(204)
+
+    def _search_issues(
+        self, query: Dict[str, str], headers: Dict[str, str], body: Any
+    ) -> Response:
+        terms = query.get("q", "")
+        repos = [
+            self.repos[name.lower()]
+            for name in re.findall(r"repo:(\S+)", terms)
+            if name.lower() in self.repos
+        ]
+        title_match = re.search(r'"([^"]*)" in:title', terms)
+        items = []
+        for repo in repos:
+            for issue in sorted(repo.issues.values(), key=lambda issue: -issue.number):
+                if (
+                    "is:issue" in terms
+                    and issue.head
+                    or "is:pr" in terms
+                    and not issue.head
+                ):
+                    continue
+                if f"is:{'closed' if issue.state == 'open' else 'open'}" in terms:
+                    continue
+                phrase = title_match.group(1) if title_match else ""
+                if phrase and not _title_matches(phrase, issue.title):
+                    continue
+                items.append(
+                    dict(_issue_json(self.api_url, self.url, repo, issue), score=1.0)
+                )
+        response = self._page("/search/issues", query, items)
+        response.body = {
+            "total_count": len(items),
+            "incomplete_results": False,
+            "items": response.body,
+        }
+        return response
+
+    def _page(self, path: str, query: Dict[str, str], items: List[Any]) -> Response:
+        """Return page of items with Link header to next one."""
+        per_page = int(query.get("per_page", PAGE_SIZE))
+        page = int(query.get("page", 1))
+        headers = {}
+        if page * per_page < len(items):
+            next_query = dict(query, page=str(page + 1), per_page=str(per_page))
+            next_url = f"{self.api_url}{path}?{urllib.parse.urlencode(next_query)}"
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return Response(200, items[(page - 1) * per_page : page * per_page], headers)
+
+    # GraphQL endpoint
+
+    def _graphql(
+        self, query: Dict[str, str], headers: Dict[str, str], body: Any
+    ) -> Response:
+        document = body["query"]
+        variables = body.get("variables") or {}
+        if document.lstrip().startswith("mutation"):
+            return Response(200, self._graphql_mutations(document, variables))
+        return Response(200, self._graphql_repos(document, variables))
+
+    def _graphql_repos(
+        self, document: str, variables: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        errors = []
+        for match in re.finditer(
+            r"r(\d+): repository\(owner: \$o\1, name: \$n\1\) \{ (\w+)(\(([^)]*)\))?",
+            document,
+        ):
+            alias = f"r{match.group(1)}"
+            repo = self._repo(
+                variables[f"o{match.group(1)}"], variables[f"n{match.group(1)}"]
+            )
+            if repo is None:
+                data[alias] = None
+                errors.append(
+                    {
+                        "type": "NOT_FOUND",
+                        "path": [alias],
+                        "message": "Could not resolve to a Repository.",
+                    }
+                )
+                continue
+            selection = match.group(2)
+            if selection == "sshUrl":
+                data[alias] = {
+                    "sshUrl": f"git@{self.url.split('://')[1]}:{repo.full_name}.git"
+                }
+            else:
+                data[alias] = {
+                    selection: self._graphql_connection(
+                        repo, selection, match.group(4) or "", variables
+                    )
+                }
+        body: Dict[str, Any] = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return body
+
+    def _graphql_connection(
+        self, repo: FakeRepo, connection: str, arguments: str, variables: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Return page of issues or pullRequests connection."""
+
+        def argument(name: str) -> Optional[str]:
+            found = re.search(rf"{name}: (\$?[\w]+|\[[^\]]*\])", arguments)
+            if found is None:
+                return None
+            value = found.group(1)
+            return variables.get(value[1:]) if value.startswith("$") else value
+
+        first = int(argument("first") or PAGE_SIZE)
+        offset = int(argument("after") or 0)
+        states = argument("states") or ""
+        base = argument("baseRefName")
+        head = argument("headRefName")
+        issues = [
+            issue
+            for issue in sorted(repo.issues.values(), key=lambda issue: -issue.number)
+            if bool(issue.head) == (connection == "pullRequests")
+            and (not states or _graphql_state(issue) in states)
+            and (base is None or issue.base == base)
+            and (head is None or issue.head == head)
+        ]
+        page = issues[offset : offset + first]
+        return {
+            "pageInfo": {
+                "hasNextPage": offset + first < len(issues),
+                "endCursor": str(offset + first),
+            },
+            "nodes": [_graphql_node(repo, issue) for issue in page],
+        }
+
+    def _graphql_mutations(
+        self, document: str, variables: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        errors = []
+        for match in re.finditer(
+            r"m(\d+): (closeIssue|mergePullRequest)\(input: \$i\1\)", document
+        ):
+            alias = f"m{match.group(1)}"
+            mutation_input = variables[f"i{match.group(1)}"]
+            node_id = mutation_input.get("issueId") or mutation_input.get(
+                "pullRequestId"
+            )
+            with self.lock:
+                found = self.nodes.get(node_id)
+                if found is None or found[1].state != "open":
+                    data[alias] = None
+                    errors.append(
+                        {
+                            "path": [alias],
+                            "message": f"Could not resolve node {node_id}.",
+                        }
+                    )
+                    continue
+                found[1].close()
+            data[alias] = {"clientMutationId": None}
+        body: Dict[str, Any] = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return body
+
+
+# path pattern, method and handler name
+ROUTES = [
+    (r"/rate_limit", "GET", "rate_limit"),
+    (r"/user", "GET", "user"),
+    (r"/user/repos", "GET", "user_repos"),
+    (r"/repos/([^/]+)/([^/]+)", "GET", "get_repo"),
+    (r"/repos/([^/]+)/([^/]+)/issues", "POST", "create_issue"),
+    (r"/repos/([^/]+)/([^/]+)/issues", "GET", "list_issues"),
+    (r"/repos/([^/]+)/([^/]+)/issues/(\d+)", "GET", "get_issue"),
+    (r"/repos/([^/]+)/([^/]+)/issues/(\d+)", "PATCH", "update_issue"),
+    (r"/repos/([^/]+)/([^/]+)/issues/(\d+)/labels", "POST", "add_labels"),
+    (r"/repos/([^/]+)/([^/]+)/pulls", "POST", "create_pull"),
+    (r"/repos/([^/]+)/([^/]+)/pulls", "GET", "list_pulls"),
+    (r"/repos/([^/]+)/([^/]+)/pulls/(\d+)/merge", "PUT", "merge_pull"),
+    (r"/repos/([^/]+)/([^/]+)/git/ref/heads/(.+)", "GET", "get_ref"),
+    (r"/repos/([^/]+)/([^/]+)/git/refs/heads/(.+)", "DELETE", "delete_ref"),
+    (r"/search/issues", "GET", "search_issues"),
+    (r"/api/graphql", "POST", "graphql"),
+]
+
+
+def _title_matches(phrase: str, title: str) -> bool:
+    """Return if title has the words of phrase in a row, like GitHub search.
+
+    Search matches whole words, so "fix" does not match "hotfix".
+    """
+    words = re.findall(r"\w+", phrase.lower())
+    title_words = re.findall(r"\w+", title.lower())
+    return any(
+        title_words[start : start + len(words)] == words
+        for start in range(len(title_words) - len(words) + 1)
+    )
+
+
+def _graphql_state(issue: FakeIssue) -> str:
+    if issue.state == "open":
+        return "OPEN"
+    return "MERGED" if issue.head else "CLOSED"
+
+
+def _graphql_node(repo: FakeRepo, issue: FakeIssue) -> Dict[str, Any]:
+    """Return all fields gitp selects on issues and pull requests."""
+    node = {
+        "id": _node_id(repo, issue),
+        "number": issue.number,
+        "title": issue.title,
+        "body": issue.body,
+        "state": _graphql_state(issue),
+        "labels": {"nodes": [{"name": label} for label in sorted(issue.labels)]},
+    }
+    if issue.head:
+        node.update(
+            baseRefName=issue.base,
+            headRefName=issue.head,
+            headRepositoryOwner={"login": repo.owner},
+        )
+    return node
+
+
+def _urls(base: str, *names: str) -> Dict[str, str]:
+    return {name: f"{base}/{name[: -len('_url')]}" for name in names}
+
+
+def _user_json(api_url: str, login: str) -> Dict[str, Any]:
+    url = f"{api_url}/users/{login}"
+    return dict(
+        _urls(
+            url,
+            "avatar_url",
+            "events_url",
+            "followers_url",
+            "following_url",
+            "gists_url",
+            "organizations_url",
+            "received_events_url",
+            "repos_url",
+            "starred_url",
+            "subscriptions_url",
+        ),
+        gravatar_id="",
+        html_url=url,
+        id=1,
+        login=login,
+        site_admin=False,
+        type="User",
+        url=url,
+    )
+
+
+def _label_json(api_url: str, name: str) -> Dict[str, Any]:
+    return {"name": name, "color": "ededed", "url": f"{api_url}/labels/{name}"}
+
+
+def _repo_json(api_url: str, root_url: str, repo: FakeRepo) -> Dict[str, Any]:
+    url = f"{api_url}/repos/{repo.full_name}"
+    return dict(
+        _urls(
+            url,
+            "archive_url",
+            "assignees_url",
+            "blobs_url",
+            "branches_url",
+            "collaborators_url",
+            "comments_url",
+            "commits_url",
+            "compare_url",
+            "contents_url",
+            "contributors_url",
+            "deployments_url",
+            "downloads_url",
+            "events_url",
+            "forks_url",
+            "git_commits_url",
+            "git_refs_url",
+            "git_tags_url",
+            "hooks_url",
+            "issue_comment_url",
+            "issue_events_url",
+            "issues_url",
+            "keys_url",
+            "labels_url",
+            "languages_url",
+            "merges_url",
+            "milestones_url",
+            "notifications_url",
+            "pulls_url",
+            "releases_url",
+            "stargazers_url",
+            "statuses_url",
+            "subscribers_url",
+            "subscription_url",
+            "tags_url",
+            "teams_url",
+            "trees_url",
+        ),
+        archived=False,
+        clone_url=f"{root_url}/{repo.full_name}.git",
+        created_at="2020-01-01T00:00:00Z",
+        default_branch=DEFAULT_BRANCH,
+        description=None,
+        fork=False,
+        forks_count=0,
+        full_name=repo.full_name,
+        git_url=f"{root_url}/{repo.full_name}.git",
+        has_downloads=True,
+        has_issues=True,
+        has_pages=False,
+        has_projects=True,
+        has_wiki=True,
+        homepage=None,
+        html_url=f"{root_url}/{repo.full_name}",
+        id=repo.id,
+        language=None,
+        mirror_url=None,
+        name=repo.name,
+        network_count=0,
+        open_issues_count=len(repo.issues),
+        owner=_user_json(api_url, repo.owner),
+        private=False,
+        pushed_at="2020-01-01T00:00:00Z",
+        size=0,
+        ssh_url=f"git@{root_url.split('://')[1]}:{repo.full_name}.git",
+        stargazers_count=0,
+        subscribers_count=0,
+        svn_url=f"{root_url}/{repo.full_name}",
+        updated_at="2020-01-01T00:00:00Z",
+        url=url,
+        watchers_count=0,
+    )
+
+
+def _issue_json(
+    api_url: str, root_url: str, repo: FakeRepo, issue: FakeIssue
+) -> Dict[str, Any]:
+    url = f"{api_url}/repos/{repo.full_name}/issues/{issue.number}"
+    kind = "pull" if issue.head else "issues"
+    data = dict(
+        _urls(url, "comments_url", "events_url", "labels_url"),
+        assignee=None,
+        assignees=[],
+        body=issue.body,
+        body_html="",
+        body_text="",
+        closed_at=None,
+        closed_by=None,
+        comments=0,
+        created_at="2020-01-01T00:00:00Z",
+        html_url=f"{root_url}/{repo.full_name}/{kind}/{issue.number}",
+        id=repo.id * 100000 + issue.number,
+        labels=[_label_json(api_url, label) for label in sorted(issue.labels)],
+        locked=False,
+        milestone=None,
+        node_id=_node_id(repo, issue),
+        number=issue.number,
+        state=issue.state,
+        title=issue.title,
+        updated_at=issue.updated_at,
+        url=url,
+        user=_user_json(api_url, repo.owner),
+    )
+    if issue.head:
+        data["pull_request"] = {
+            "url": f"{api_url}/repos/{repo.full_name}/pulls/{issue.number}"
+        }
+    return data
+
+
+def _pull_json(
+    api_url: str, root_url: str, repo: FakeRepo, pull: FakeIssue
+) -> Dict[str, Any]:
+    url = f"{api_url}/repos/{repo.full_name}/pulls/{pull.number}"
+    repo_json = _repo_json(api_url, root_url, repo)
+
+    def destination(branch: str) -> Dict[str, Any]:
+        return {
+            "label": f"{repo.owner}:{branch}",
+            "ref": branch,
+            "sha": "0" * 40,
+            "user": _user_json(api_url, repo.owner),
+            "repo": repo_json,
+        }
+
+    return dict(
+        _urls(
+            url,
+            "comments_url",
+            "commits_url",
+            "diff_url",
+            "patch_url",
+            "review_comment_url",
+            "review_comments_url",
+            "statuses_url",
+        ),
+        _links={},
+        active_lock_reason=None,
+        assignee=None,
+        assignees=[],
+        base=destination(pull.base),
+        body=pull.body,
+        body_html="",
+        body_text="",
+        closed_at=None,
+        created_at="2020-01-01T00:00:00Z",
+        head=destination(pull.head),
+        html_url=f"{root_url}/{repo.full_name}/pull/{pull.number}",
+        id=repo.id * 100000 + pull.number,
+        issue_url=f"{api_url}/repos/{repo.full_name}/issues/{pull.number}",
+        locked=False,
+        merge_commit_sha=None,
+        merged_at=None,
+        node_id=_node_id(repo, pull),
+        number=pull.number,
+        state=pull.state,
+        title=pull.title,
+        updated_at="2020-01-01T00:00:00Z",
+        url=url,
+        user=_user_json(api_url, repo.owner),
+    )
+
+
+class _Handler(server.BaseHTTPRequestHandler):
+    """Pass requests to the FakeGithub of the server."""
+
+    # keep connections alive, as GitHub does
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        body = json.loads(raw_body) if raw_body else None
+        fake: FakeGithub = getattr(self.server, "fake")  # noqa: B009
+        response = fake.handle(self.command, self.path, dict(self.headers), body)
+        payload = b"" if response.body is None else json.dumps(response.body).encode()
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _dispatch  # noqa: N815
+    do_POST = _dispatch  # noqa: N815
+    do_PATCH = _dispatch  # noqa: N815
+    do_PUT = _dispatch  # noqa: N815
+    do_DELETE = _dispatch  # noqa: N815
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Do not log requests."""
@@ -108,7 +108,7 @@ def safety(session: Session) -> None:
 @nox.session(python=python_versions)
 def mypy(session: Session) -> None:
     """Type-check using mypy."""
-    args = session.posargs or ["src", "tests", "docs/conf.py"]
+    args = session.posargs or ["src", "tests", "benchmarks", "docs/conf.py"]
     session.install(".")
     session.install("mypy")
     session.run("mypy", *args)
@@ -128,6 +128,22 @@ def tests(session: Session) -> None:
             session.notify("coverage")
 
 
+@nox.session(python="3.9")
+def benchmarks(session: Session) -> None:
+    """Time commands and use cases against a fake GitHub server."""
+    session.install(".")
+    session.install("pytest")
+    session.run(
+        "pytest",
+        "benchmarks",
+        "-o",
+        "python_files=bench_*.py",
+        "-o",
+        "python_functions=bench_*",
+        *session.posargs,
+    )
+
+
 @nox.session
 def coverage(session: Session) -> None:
     """Produce the coverage report."""
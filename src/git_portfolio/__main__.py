@@ -1,34 +1,56 @@
 """Command-line interface."""
+import contextlib
 import functools
+import io
+import json
+import os
+import shlex
 import sys
+import time
 from typing import Any
 from typing import Callable
 from typing import cast
+from typing import Dict
+from typing import List
+from typing import Optional
 from typing import Tuple
+from typing import TYPE_CHECKING
 from typing import TypeVar
 from typing import Union
 
 import click
 
+import git_portfolio.chrome_trace as ct
 import git_portfolio.config_manager as cm
+import git_portfolio.daemon as dm
+import git_portfolio.defaults as dfl
 import git_portfolio.domain.config as c
 import git_portfolio.domain.gh_connection_settings as cs
-import git_portfolio.github_service as ghs
-import git_portfolio.prompt as p
+import git_portfolio.domain.repo_result as rr
+import git_portfolio.local_cache as lc
+import git_portfolio.profiling as prof
 import git_portfolio.request_objects.issue_list as il
 import git_portfolio.responses as res
-import git_portfolio.use_cases.config_init as ci
-import git_portfolio.use_cases.config_repos as cr
-import git_portfolio.use_cases.gh_close_issue as ghcli
-import git_portfolio.use_cases.gh_create_issue as ghci
-import git_portfolio.use_cases.gh_create_pr as ghcp
-import git_portfolio.use_cases.gh_delete_branch as ghdb
-import git_portfolio.use_cases.gh_merge_pr as ghmp
 import git_portfolio.use_cases.git as git
-import git_portfolio.use_cases.git_clone as gcuc
 
+if TYPE_CHECKING:  # pragma: no cover
+    import git_portfolio.github_service as ghs
+    import git_portfolio.issue_mirror as im
+
+# modules using github3, requests or inquirer are imported by the commands
+# needing them, local git commands and --help start without loading them
 F = TypeVar("F", bound=Callable[..., Any])
 CONFIG_MANAGER = cm.ConfigManager()
+# services by settings, kept for the whole process
+GITHUB_SERVICES: Dict[
+    Tuple[str, str, str, int, int, int, bool], "ghs.GithubService"
+] = {}
+# ndjson writes a JSON record per repository once it and earlier ones are done
+OUTPUT_MODES = ("text", "json", "ndjson")
+ARGS_KEY = "gitp.args"
+# context object of commands run by `gitp shell`
+SHELL = "shell"
+SHELL_PROMPT = "gitp> "
 
 
 def gitp_config_check(func: F) -> F:
@@ -43,7 +65,17 @@ def gitp_config_check(func: F) -> F:
             )
             sys.exit(3)
         else:
-            value = func(*args, **kwargs)
+            command = click.get_current_context().command_path
+            try:
+                with prof.span(command, "command"):
+                    value = func(*args, **kwargs)
+            except cs.AuthError:
+                # token revoked after its identity was cached
+                value = _auth_failure()
+            finally:
+                # data prefetched for this command may be outdated for the next
+                for github_service in GITHUB_SERVICES.values():
+                    github_service.cancel_prefetch()
             _echo_outputs(value)
             if not bool(value):
                 sys.exit(4)
@@ -52,14 +84,204 @@ def gitp_config_check(func: F) -> F:
     return cast(F, wrapper)
 
 
-@click.group("cli")
-def main() -> None:
+def _auth_failure() -> res.ResponseFailure:
+    return res.ResponseFailure(
+        res.ResponseTypes.PARAMETERS_ERROR,
+        "Wrong GitHub permissions. Please check your token.",
+    )
+
+
+class GitpGroup(click.Group):
+    """Root command group keeping its arguments, to send them to the daemon."""
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        """Keep arguments and parse them."""
+        ctx.meta[ARGS_KEY] = list(args)
+        return super().parse_args(ctx, args)
+
+
+@click.group("cli", cls=GitpGroup)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of repositories processed in parallel.",
+)
+@click.option(
+    "--api",
+    type=click.Choice(dfl.READ_BACKENDS),
+    default="rest",
+    show_default=True,
+    help="GitHub API used to read many repositories at once.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=dfl.MUTATION_BATCH_SIZE,
+    show_default=True,
+    help="Number of changes sent per request with `--api graphql`.",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=dfl.DEFAULT_RETRIES,
+    show_default=True,
+    help="Number of retries of GitHub requests on transient failures.",
+)
+@click.option(
+    "--mirror",
+    is_flag=True,
+    envvar=dfl.MIRROR_ENV_VAR,
+    help=(
+        "List issues from a local mirror, synced with one request per "
+        "repository. Faster for few repositories listed often."
+    ),
+)
+@click.option(
+    "--output",
+    type=click.Choice(OUTPUT_MODES),
+    default="text",
+    show_default=True,
+    help="Output format, JSON ones give a record per repository.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    envvar=prof.ENV_VAR,
+    help="Show GitHub requests and git commands run, on standard error.",
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar=ct.ENV_VAR,
+    help="Write Chrome trace of the command, eg. for chrome://tracing.",
+)
+def main(
+    jobs: Optional[int],
+    api: str,
+    batch_size: int,
+    retries: int,
+    mirror: bool,
+    output: str,
+    profile: bool,
+    trace: Optional[str],
+) -> None:
     """Git Portfolio."""
-    pass
+    ctx = click.get_current_context()
+    # a shell session keeps its own connections and caches
+    if (
+        ctx.invoked_subcommand in dm.COMMANDS
+        and not dm.is_serving()
+        and ctx.obj != SHELL
+    ):
+        _forward_to_daemon(ctx)
+    if profile or trace:
+        prof.start()
+        ctx.call_on_close(functools.partial(_finish_profile, profile, trace))
+
+
+def _forward_to_daemon(ctx: click.Context) -> None:
+    """Run command in daemon and exit, if one is running."""
+    result = dm.forward(CONFIG_MANAGER.config_folder, ctx.meta[ARGS_KEY], os.getcwd())
+    if result is not None:
+        exit_code, stdout, stderr = result
+        click.echo(stdout, nl=False)
+        click.echo(stderr, nl=False, err=True)
+        ctx.exit(exit_code)
+
+
+def _finish_profile(summary: bool, trace_path: Optional[str]) -> None:
+    """Show summary of profiled command and write its trace."""
+    profiler = prof.stop()
+    if profiler is None:
+        return
+    if summary:
+        click.echo(profiler.summary(), nl=False, err=True)
+    if trace_path:
+        ct.write(profiler, trace_path)
+
+
+def _run_command(args: List[str], cwd: str) -> dm.Result:
+    """Run command line in this process for the daemon.
+
+    Args:
+        args: command line arguments.
+        cwd: working directory of command.
+
+    Returns:
+        dm.Result: exit code and outputs.
+    """
+    global CONFIG_MANAGER
+    # config may have been changed by other gitp processes
+    CONFIG_MANAGER = cm.ConfigManager()
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    previous_cwd = os.getcwd()
+    os.chdir(cwd)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            main.main(args, prog_name="gitp")
+    except SystemExit as error:
+        exit_code = int(error.code or 0)
+    finally:
+        os.chdir(previous_cwd)
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+def _get_jobs() -> Optional[int]:
+    """Return `--jobs` given to the root command, if any."""
+    return click.get_current_context().find_root().params.get("jobs")
+
+
+def _get_api() -> str:
+    """Return `--api` given to the root command, if any."""
+    api: str = click.get_current_context().find_root().params.get("api", "rest")
+    return api
+
+
+def _get_mirror() -> bool:
+    """Return if `--mirror` was given to the root command."""
+    return bool(click.get_current_context().find_root().params.get("mirror"))
+
+
+def _get_batch_size() -> int:
+    """Return `--batch-size` given to the root command, if any."""
+    params = click.get_current_context().find_root().params
+    batch_size: int = params.get("batch_size") or dfl.MUTATION_BATCH_SIZE
+    return batch_size
+
+
+def _get_retries() -> int:
+    """Return `--retries` given to the root command, if any."""
+    retries: Optional[int] = (
+        click.get_current_context().find_root().params.get("retries")
+    )
+    return dfl.DEFAULT_RETRIES if retries is None else retries
+
+
+def _get_output() -> str:
+    """Return `--output` given to the root command, if any."""
+    output: str = click.get_current_context().find_root().params.get("output", "text")
+    return output
+
+
+def _get_output_handler() -> Optional[res.OutputHandler]:
+    """Return handler streaming results, None to print them all at the end."""
+    return None if _get_output() == "json" else _echo_output
+
+
+def _echo_output(result: rr.RepoResult) -> None:
+    """Show result of one repository while others are still running."""
+    if _get_output() == "ndjson":
+        click.echo(json.dumps(result.to_dict()))
+    else:
+        click.echo(result.output, nl=False)
 
 
 def _echo_outputs(response: Union[res.ResponseFailure, res.ResponseSuccess]) -> None:
-    if bool(response):
+    if _get_output() != "text":
+        _echo_records(response)
+    elif bool(response):
         success = cast(res.ResponseSuccess, response)
         click.secho(success.value)
     else:
@@ -68,17 +290,65 @@ def _echo_outputs(response: Union[res.ResponseFailure, res.ResponseSuccess]) ->
         )
 
 
-def _get_github_service(config: c.Config) -> ghs.GithubService:
+def _echo_records(response: Union[res.ResponseFailure, res.ResponseSuccess]) -> None:
+    """Print response in JSON output modes."""
+    results = response.results
+    if results is None:
+        # failure or command without results by repository
+        record = response.value
+        if bool(response):
+            record = {"type": response.type, "message": record}
+        click.echo(json.dumps(record, default=str))
+    elif _get_output() == "json":
+        click.echo(json.dumps([result.to_dict() for result in results]))
+
+
+def _get_catalog_cache() -> lc.LocalCache:
+    return CONFIG_MANAGER.get_cache(dfl.CATALOG_CACHE_FILENAME, dfl.CATALOG_TTL)
+
+
+def _get_identity_cache() -> lc.LocalCache:
+    return CONFIG_MANAGER.get_cache(dfl.IDENTITY_CACHE_FILENAME, dfl.IDENTITY_TTL)
+
+
+def _get_issue_mirror() -> "im.IssueMirror":
+    return CONFIG_MANAGER.get_issue_mirror(dfl.ISSUE_MIRROR_FILENAME)
+
+
+def _get_github_service(config: c.Config) -> "ghs.GithubService":
+    """Return service for config, reusing it and its connections if created."""
+    import git_portfolio.github_service as ghs
+    import git_portfolio.use_cases.gh as gh
+
+    jobs = _get_jobs() or gh.DEFAULT_JOBS
+    key = (
+        config.github_access_token,
+        config.github_hostname,
+        _get_api(),
+        _get_batch_size(),
+        _get_retries(),
+        jobs,
+        _get_mirror(),
+    )
+    if key in GITHUB_SERVICES:
+        return GITHUB_SERVICES[key]
     settings = cs.GhConnectionSettings(
         config.github_access_token, config.github_hostname
     )
     try:
-        return ghs.GithubService(settings)
-    except AttributeError:
-        response = res.ResponseFailure(
-            res.ResponseTypes.PARAMETERS_ERROR,
-            "Wrong GitHub permissions. Please check your token.",
+        GITHUB_SERVICES[key] = ghs.GithubService(
+            settings,
+            _get_catalog_cache(),
+            read_backend=_get_api(),
+            mutation_batch_size=_get_batch_size(),
+            retries=_get_retries(),
+            pool_size=max(jobs, dfl.DEFAULT_POOL_SIZE),
+            identity_cache=_get_identity_cache(),
+            issue_mirror=_get_issue_mirror() if _get_mirror() else None,
         )
+        return GITHUB_SERVICES[key]
+    except cs.AuthError:
+        response = _auth_failure()
     except ConnectionError:
         response = res.ResponseFailure(
             res.ResponseTypes.SYSTEM_ERROR,
@@ -96,7 +366,7 @@ def _get_github_service(config: c.Config) -> ghs.GithubService:
 @gitp_config_check
 def add(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch `git add` command."""
-    return git.GitUseCase().execute(
+    return git.GitUseCase(jobs=_get_jobs(), on_output=_get_output_handler()).execute(
         CONFIG_MANAGER.config.github_selected_repos, "add", args
     )
 
@@ -106,7 +376,7 @@ def add(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
 @gitp_config_check
 def checkout(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch `git checkout` command."""
-    return git.GitUseCase().execute(
+    return git.GitUseCase(jobs=_get_jobs(), on_output=_get_output_handler()).execute(
         CONFIG_MANAGER.config.github_selected_repos, "checkout", args
     )
 
@@ -116,7 +386,7 @@ def checkout(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess
 @gitp_config_check
 def commit(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch `git commit` command."""
-    return git.GitUseCase().execute(
+    return git.GitUseCase(jobs=_get_jobs(), on_output=_get_output_handler()).execute(
         CONFIG_MANAGER.config.github_selected_repos, "commit", args
     )
 
@@ -126,7 +396,7 @@ def commit(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
 @gitp_config_check
 def pull(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch `git pull` command."""
-    return git.GitUseCase().execute(
+    return git.GitUseCase(jobs=_get_jobs(), on_output=_get_output_handler()).execute(
         CONFIG_MANAGER.config.github_selected_repos, "pull", args
     )
 
@@ -136,7 +406,7 @@ def pull(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
 @gitp_config_check
 def push(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch `git push` command."""
-    return git.GitUseCase().execute(
+    return git.GitUseCase(jobs=_get_jobs(), on_output=_get_output_handler()).execute(
         CONFIG_MANAGER.config.github_selected_repos, "push", args
     )
 
@@ -146,7 +416,7 @@ def push(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
 @gitp_config_check
 def reset(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch `git reset` command."""
-    return git.GitUseCase().execute(
+    return git.GitUseCase(jobs=_get_jobs(), on_output=_get_output_handler()).execute(
         CONFIG_MANAGER.config.github_selected_repos, "reset", args
     )
 
@@ -156,7 +426,7 @@ def reset(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
 @gitp_config_check
 def status(args: Tuple[str]) -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch `git status` command."""
-    return git.GitUseCase().execute(
+    return git.GitUseCase(jobs=_get_jobs(), on_output=_get_output_handler()).execute(
         CONFIG_MANAGER.config.github_selected_repos, "status", args
     )
 
@@ -194,6 +464,9 @@ def delete() -> None:
 @configure.command("init")
 def config_init() -> None:
     """Initialize `gitp` config."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.config_init as ci
+
     while True:
         settings = p.InquirerPrompter.connect_github(
             CONFIG_MANAGER.config.github_access_token
@@ -213,12 +486,16 @@ def config_init() -> None:
 @gitp_config_check
 def config_repos() -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Configure current working `gitp` repositories."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.config_repos as cr
+
+    github_service = _get_github_service(CONFIG_MANAGER.config)
+    github_service.start_prefetch_catalog()
     new_repos = p.InquirerPrompter.new_repos(
         CONFIG_MANAGER.config.github_selected_repos
     )
     if not new_repos:
         return res.ResponseSuccess()
-    github_service = _get_github_service(CONFIG_MANAGER.config)
     repo_names = github_service.get_repo_names()
     selected_repos = p.InquirerPrompter.select_repos(repo_names)
     return cr.ConfigReposUseCase(CONFIG_MANAGER).execute(
@@ -227,32 +504,196 @@ def config_repos() -> Union[res.ResponseFailure, res.ResponseSuccess]:
 
 
 @main.command("clone")
+@click.option("--depth", type=click.IntRange(min=1), help="Create shallow clones.")
+@click.option(
+    "--filter",
+    "filter_spec",
+    metavar="FILTER-SPEC",
+    help="Create partial clones, eg. blob:none.",
+)
+@click.option(
+    "--single-branch", is_flag=True, help="Clone only the default branch history."
+)
 @gitp_config_check
-def clone() -> Union[res.ResponseFailure, res.ResponseSuccess]:
-    """Batch `git clone` command on current folder. Does not accept aditional args."""
+def clone(
+    depth: Optional[int], filter_spec: Optional[str], single_branch: bool
+) -> Union[res.ResponseFailure, res.ResponseSuccess]:
+    """Batch `git clone` command on current folder."""
+    import git_portfolio.use_cases.git_clone as gcuc
+
+    args: Tuple[str, ...] = ()
+    if depth:
+        args += (f"--depth={depth}",)
+    if filter_spec:
+        args += (f"--filter={filter_spec}",)
+    if single_branch:
+        args += ("--single-branch",)
     github_service = _get_github_service(CONFIG_MANAGER.config)
-    return gcuc.GitCloneUseCase(github_service).execute(
-        CONFIG_MANAGER.config.github_selected_repos
-    )
+    return gcuc.GitCloneUseCase(
+        github_service, jobs=_get_jobs(), on_output=_get_output_handler()
+    ).execute(CONFIG_MANAGER.config.github_selected_repos, args)
+
+
+@click.group("cache")
+def cache() -> None:
+    """Cache command group."""
+    pass
+
+
+@cache.command("refresh")
+@gitp_config_check
+def cache_refresh() -> Union[res.ResponseFailure, res.ResponseSuccess]:
+    """Revalidate cached list of GitHub repositories."""
+    github_service = _get_github_service(CONFIG_MANAGER.config)
+    repo_count = github_service.refresh_catalog()
+    return res.ResponseSuccess(f"gitp cache refreshed with {repo_count} repositories.")
+
+
+@cache.command("clear")
+def cache_clear() -> None:
+    """Remove cached list of GitHub repositories, token identity and issues."""
+    _get_catalog_cache().clear()
+    _get_identity_cache().clear()
+    _get_issue_mirror().clear()
+    # services of a daemon keep repos in memory
+    GITHUB_SERVICES.clear()
+    click.secho("gitp cache cleared.")
+
+
+@main.command("rate-limit")
+@gitp_config_check
+def rate_limit() -> Union[res.ResponseFailure, res.ResponseSuccess]:
+    """Show GitHub API requests left."""
+    github_service = _get_github_service(CONFIG_MANAGER.config)
+    budgets = github_service.fetch_rate_limit_budget()
+    output = ""
+    for resource, budget in sorted(budgets.items()):
+        reset = time.strftime("%H:%M:%S", time.localtime(budget.reset))
+        output += (
+            f"{resource}: {budget.remaining}/{budget.limit} requests left, "
+            f"resets at {reset}.\n"
+        )
+    return res.ResponseSuccess(output or "No GitHub rate limit reported.")
+
+
+@main.command("shell")
+def shell() -> None:
+    """Run commands in one session, reusing GitHub connection and data.
+
+    Global options given before `shell` apply to every command. Use
+    `refresh` to reload config and GitHub data and `exit` to quit.
+    """
+    try:
+        # line editing and history for input()
+        import readline  # noqa: F401
+    except ImportError:  # pragma: no cover
+        pass
+    args = click.get_current_context().find_root().meta[ARGS_KEY]
+    root_args = args[: args.index("shell")]
+    click.secho("gitp shell, type `help` for commands and `exit` to quit.")
+    while True:
+        try:
+            line = input(SHELL_PROMPT)
+        except EOFError:
+            click.echo()
+            return
+        except KeyboardInterrupt:
+            click.echo()
+            continue
+        if not _run_shell_line(line, root_args):
+            return
+
+
+def _run_shell_line(line: str, root_args: List[str]) -> bool:
+    """Run command line of shell, return False when session ends."""
+    global CONFIG_MANAGER
+    try:
+        command = shlex.split(line)
+    except ValueError as error:
+        click.secho(f"Error: {error}.", fg="red")
+        return True
+    if not command:
+        return True
+    if command[0] in ("exit", "quit"):
+        return False
+    if command[0] == "refresh":
+        CONFIG_MANAGER = cm.ConfigManager()
+        GITHUB_SERVICES.clear()
+        click.secho("gitp shell refreshed.")
+    elif command[0] == "shell":
+        click.secho("Error: already in gitp shell.", fg="red")
+    else:
+        if command[0] == "help":
+            command = command[1:] + ["--help"]
+        try:
+            main.main(root_args + command, prog_name="gitp", obj=SHELL)
+        except SystemExit:
+            pass
+    return True
+
+
+@click.group("daemon")
+def daemon() -> None:
+    """Daemon command group."""
+    pass
+
+
+@daemon.command("start")
+def daemon_start() -> None:
+    """Run commands of other gitp processes, keeping connections warm.
+
+    The daemon runs until stopped, start it in background eg. with
+    `gitp daemon start &`. Commands prompting the user always run in their
+    own process.
+    """
+    if dm.is_running(CONFIG_MANAGER.config_folder):
+        raise click.ClickException("gitp daemon is already running.")
+    server = dm.Daemon(CONFIG_MANAGER.config_folder, _run_command)
+    click.secho(f"gitp daemon listening on {server.socket_path}.")
+    server.serve()
+    click.secho("gitp daemon stopped.")
+
+
+@daemon.command("stop")
+def daemon_stop() -> None:
+    """Stop gitp daemon."""
+    if dm.stop(CONFIG_MANAGER.config_folder):
+        click.secho("gitp daemon stopping.")
+    else:
+        click.secho("gitp daemon is not running.")
 
 
 @create.command("issues")
 @gitp_config_check
 def create_issues() -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch creation of issues on GitHub."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.gh_create_issue as ghci
+
     github_service = _get_github_service(CONFIG_MANAGER.config)
     issue = p.InquirerPrompter.create_issues(
         CONFIG_MANAGER.config.github_selected_repos
     )
-    return ghci.GhCreateIssueUseCase(CONFIG_MANAGER, github_service).execute(issue)
+    return ghci.GhCreateIssueUseCase(
+        CONFIG_MANAGER,
+        github_service,
+        jobs=_get_jobs(),
+        on_output=_get_output_handler(),
+    ).execute(issue)
 
 
 @close.command("issues")
 @gitp_config_check
 def close_issues() -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch close issues on GitHub."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.gh_close_issue as ghcli
+
     github_service = _get_github_service(CONFIG_MANAGER.config)
     list_object = "issue"
+    github_service.start_prefetch_open_issues(
+        CONFIG_MANAGER.config.github_selected_repos, list_object
+    )
     title_query = p.InquirerPrompter.close_objects(
         CONFIG_MANAGER.config.github_selected_repos, list_object
     )
@@ -263,16 +704,26 @@ def close_issues() -> Union[res.ResponseFailure, res.ResponseSuccess]:
             "title__contains": title_query,
         }
     )
-    return ghcli.GhCloseIssueUseCase(CONFIG_MANAGER, github_service).execute(
-        list_request
-    )
+    return ghcli.GhCloseIssueUseCase(
+        CONFIG_MANAGER,
+        github_service,
+        jobs=_get_jobs(),
+        on_output=_get_output_handler(),
+    ).execute(list_request)
 
 
 @create.command("prs")
 @gitp_config_check
 def create_prs() -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch creation of pull requests on GitHub."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.gh_create_pr as ghcp
+
     github_service = _get_github_service(CONFIG_MANAGER.config)
+    # for linked issues
+    github_service.start_prefetch_open_issues(
+        CONFIG_MANAGER.config.github_selected_repos, "issue"
+    )
     pr = p.InquirerPrompter.create_pull_requests(
         CONFIG_MANAGER.config.github_selected_repos
     )
@@ -284,17 +735,26 @@ def create_prs() -> Union[res.ResponseFailure, res.ResponseSuccess]:
             "title__contains": pr.issues_title_query,
         }
     )
-    return ghcp.GhCreatePrUseCase(CONFIG_MANAGER, github_service).execute(
-        pr, list_request
-    )
+    return ghcp.GhCreatePrUseCase(
+        CONFIG_MANAGER,
+        github_service,
+        jobs=_get_jobs(),
+        on_output=_get_output_handler(),
+    ).execute(pr, list_request)
 
 
 @close.command("prs")
 @gitp_config_check
 def close_prs() -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch close pull requests on GitHub."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.gh_close_issue as ghcli
+
     github_service = _get_github_service(CONFIG_MANAGER.config)
     list_object = "pull request"
+    github_service.start_prefetch_open_issues(
+        CONFIG_MANAGER.config.github_selected_repos, list_object
+    )
     title_query = p.InquirerPrompter.close_objects(
         CONFIG_MANAGER.config.github_selected_repos, list_object
     )
@@ -305,35 +765,59 @@ def close_prs() -> Union[res.ResponseFailure, res.ResponseSuccess]:
             "title__contains": title_query,
         }
     )
-    return ghcli.GhCloseIssueUseCase(CONFIG_MANAGER, github_service).execute(
-        list_request
-    )
+    return ghcli.GhCloseIssueUseCase(
+        CONFIG_MANAGER,
+        github_service,
+        jobs=_get_jobs(),
+        on_output=_get_output_handler(),
+    ).execute(list_request)
 
 
 @merge.command("prs")
 @gitp_config_check
 def merge_prs() -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch merge of pull requests on GitHub."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.gh_merge_pr as ghmp
+
     github_service = _get_github_service(CONFIG_MANAGER.config)
+    github_service.start_prefetch_pull_requests(
+        CONFIG_MANAGER.config.github_selected_repos
+    )
     pr_merge = p.InquirerPrompter.merge_pull_requests(
         github_service.get_username(),
         CONFIG_MANAGER.config.github_selected_repos,
     )
-    return ghmp.GhMergePrUseCase(CONFIG_MANAGER, github_service).execute(pr_merge)
+    return ghmp.GhMergePrUseCase(
+        CONFIG_MANAGER,
+        github_service,
+        jobs=_get_jobs(),
+        on_output=_get_output_handler(),
+    ).execute(pr_merge)
 
 
 @delete.command("branches")
 @gitp_config_check
 def delete_branches() -> Union[res.ResponseFailure, res.ResponseSuccess]:
     """Batch deletion of branches on GitHub."""
+    import git_portfolio.prompt as p
+    import git_portfolio.use_cases.gh_delete_branch as ghdb
+
     github_service = _get_github_service(CONFIG_MANAGER.config)
     branch = p.InquirerPrompter.delete_branches(
         CONFIG_MANAGER.config.github_selected_repos
     )
-    return ghdb.GhDeleteBranchUseCase(CONFIG_MANAGER, github_service).execute(branch)
+    return ghdb.GhDeleteBranchUseCase(
+        CONFIG_MANAGER,
+        github_service,
+        jobs=_get_jobs(),
+        on_output=_get_output_handler(),
+    ).execute(branch)
 
 
 main.add_command(configure)
+main.add_command(cache)
+main.add_command(daemon)
 main.add_command(create)
 main.add_command(close)
 main.add_command(merge)
@@ -0,0 +1,133 @@
+"""Chrome trace module."""
+import json
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+
+import git_portfolio.profiling as prof
+
+ENV_VAR = "GITP_TRACE"
+
+
+def _event(
+    profiler: prof.Profiler,
+    name: str,
+    category: str,
+    start: float,
+    duration: float,
+    thread: int,
+    args: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Return complete event, times in microseconds since profiler started."""
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": round((start - profiler.started) * 1e6),
+        "dur": round(duration * 1e6),
+        "pid": os.getpid(),
+        "tid": thread,
+        "args": args,
+    }
+
+
+def trace_events(profiler: prof.Profiler) -> List[Dict[str, Any]]:
+    """Return trace events of all records of profiler.
+
+    Each thread is a track named after it, showing commands, use cases,
+    repos, HTTP requests, git subprocesses and rate limit waits.
+
+    Args:
+        profiler: profiler of a command.
+
+    Returns:
+        List[Dict[str, Any]]: events in Chrome trace event format.
+    """
+    with profiler.lock:
+        http_calls = list(profiler.http_calls)
+        git_calls = list(profiler.git_calls)
+        repo_spans = list(profiler.repo_spans)
+        spans = list(profiler.spans)
+        threads = dict(profiler.threads)
+    pid = os.getpid()
+    events = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": thread,
+            "args": {"name": name},
+        }
+        for thread, name in sorted(threads.items())
+    ]
+    for span in spans:
+        events.append(
+            _event(
+                profiler,
+                span.name,
+                span.category,
+                span.start,
+                span.duration,
+                span.thread,
+                span.args,
+            )
+        )
+    for repo_span in repo_spans:
+        events.append(
+            _event(
+                profiler,
+                repo_span.repo,
+                "repo",
+                repo_span.start,
+                repo_span.duration,
+                repo_span.thread,
+                {"action": repo_span.action},
+            )
+        )
+    for http_call in http_calls:
+        events.append(
+            _event(
+                profiler,
+                f"{http_call.method} {http_call.endpoint}",
+                "http",
+                http_call.start,
+                http_call.duration,
+                http_call.thread,
+                {
+                    "repo": http_call.repo,
+                    "status": http_call.status,
+                    "bytes": http_call.size,
+                    "cached": http_call.cached,
+                },
+            )
+        )
+    for git_call in git_calls:
+        events.append(
+            _event(
+                profiler,
+                " ".join(git_call.argv[:2]),
+                "git",
+                git_call.start,
+                git_call.duration,
+                git_call.thread,
+                {
+                    "repo": git_call.repo,
+                    "argv": git_call.argv,
+                    "returncode": git_call.returncode,
+                },
+            )
+        )
+    return events
+
+
+def write(profiler: prof.Profiler, path: str) -> None:
+    """Write trace of profiler to a JSON file, to open in a trace viewer.
+
+    Args:
+        profiler: profiler of a command.
+        path: trace file path.
+    """
+    trace = {"traceEvents": trace_events(profiler), "displayTimeUnit": "ms"}
+    with open(path, "w") as trace_file:
+        json.dump(trace, trace_file)
@@ -1,34 +1,89 @@
 """Configuration manager module."""
+import json
 import os
-import pathlib
-
-import yaml
+import sys
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import TYPE_CHECKING
 
 import git_portfolio.domain.config as c
+import git_portfolio.local_cache as lc
+
+if TYPE_CHECKING:  # pragma: no cover
+    import git_portfolio.issue_mirror as im
 
 
 class ConfigManager:
-    """Configuration manager class."""
+    """Configuration manager class.
+
+    Parsing YAML is slow with many selected repositories, so the parsed
+    config is also kept in a JSON snapshot, used while the YAML file keeps
+    the modification time and size it had when parsed.
+    """
 
     def __init__(self, config_filename: str = "config.yaml") -> None:
-        """Load config if it exists."""
+        """Constructor, config is only loaded when first used."""
         self.config_folder = os.path.join(os.path.expanduser("~"), ".gitp")
         self.config_path = os.path.join(self.config_folder, config_filename)
+        self.snapshot_path = f"{os.path.splitext(self.config_path)[0]}.json"
+        self._config: Optional[c.Config] = None
+
+    @property
+    def config(self) -> c.Config:
+        """Config loaded from file, empty if there is no valid one."""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
 
+    def _load_config(self) -> c.Config:
+        """Load config if it exists."""
         if os.path.exists(self.config_path):
-            print("Loading previous config...\n")
+            # on stderr, stdout may carry json output
+            print("Loading previous config...\n", file=sys.stderr)
+            data = self._load_snapshot()
+            if data is not None:
+                try:
+                    return c.Config(**data)
+                except TypeError:
+                    pass
+            # imported here, commands without config do not pay for it
+            import yaml
+
             with open(self.config_path, "r+") as config_file:
                 try:
-                    data = yaml.safe_load(config_file)
+                    data = yaml.load(config_file, Loader=_yaml_loader())  # noqa: S506
                     if data:
                         try:
-                            self.config = c.Config(**data)
-                            return
+                            config = c.Config(**data)
+                            self._save_snapshot(os.fstat(config_file.fileno()), data)
+                            return config
                         except TypeError:
                             config_file.truncate(0)
                 except yaml.scanner.ScannerError:
                     config_file.truncate(0)
-        self.config = c.Config("", "", [])
+        return c.Config("", "", [])
+
+    def _load_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Return config data of snapshot if YAML file did not change since."""
+        try:
+            stat = os.stat(self.config_path)
+            with open(self.snapshot_path) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("key") != _stat_key(stat):
+            return None
+        data: Optional[Dict[str, Any]] = snapshot.get("config")
+        return data
+
+    def _save_snapshot(self, stat: os.stat_result, data: Dict[str, Any]) -> None:
+        """Save parsed config data of YAML file with given stat."""
+        snapshot = {"key": _stat_key(stat), "config": data}
+        try:
+            lc.write_atomic(self.snapshot_path, json.dumps(snapshot))
+        except OSError:
+            pass
 
     def config_is_empty(self) -> bool:
         """Check if config is empty."""
@@ -36,12 +91,45 @@ class ConfigManager:
             return False
         return True
 
+    def get_cache(self, cache_filename: str, ttl: float) -> lc.LocalCache:
+        """Get cache stored alongside config file."""
+        return lc.LocalCache(self.config_folder, cache_filename, ttl)
+
+    def get_issue_mirror(self, cache_filename: str) -> "im.IssueMirror":
+        """Get issue mirror stored alongside config file."""
+        # sqlite3 is only loaded by commands using the mirror
+        import git_portfolio.issue_mirror as im
+
+        return im.IssueMirror(self.config_folder, cache_filename)
+
     def save_config(self) -> None:
-        """Write config to YAML file."""
+        """Write config to YAML file.
+
+        The file is replaced at once, other gitp processes never read it
+        partially written.
+
+        Raises:
+            AttributeError: config is empty.
+        """
+        import yaml
+
         if not self.config_is_empty():
-            pathlib.Path(self.config_folder).mkdir(parents=True, exist_ok=True)
             config_dict = vars(self.config)
-            with open(self.config_path, "w") as config_file:
-                yaml.dump(config_dict, config_file)
+            lc.write_atomic(self.config_path, yaml.dump(config_dict))
+            self._save_snapshot(os.stat(self.config_path), config_dict)
         else:
             raise AttributeError
+
+
+def _yaml_loader() -> Any:
+    """Return libyaml based safe loader if available, it is many times faster."""
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # pragma: no cover
+        from yaml import SafeLoader  # type: ignore
+
+    return SafeLoader
+
+
+def _stat_key(stat: os.stat_result) -> Dict[str, int]:
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
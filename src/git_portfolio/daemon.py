@@ -0,0 +1,182 @@
+"""Daemon module."""
+import hashlib
+import json
+import os
+import secrets
+import sys
+import traceback
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+SOCKET_FILENAME = "daemon.sock"
+AUTHKEY_FILENAME = "daemon.key"
+# commands using GitHub services kept warm by the daemon, others prompt the
+# user or only run git, better in the environment of the caller
+COMMANDS = ("cache", "clone", "rate-limit")
+
+# exit code, standard output and standard error of a command
+Result = Tuple[int, str, str]
+Handler = Callable[[List[str], str], Result]
+
+_serving = False
+
+
+def is_serving() -> bool:
+    """Check if this process is the daemon running commands."""
+    return _serving
+
+
+def _paths(config_folder: str) -> Tuple[str, str]:
+    return (
+        os.path.join(config_folder, SOCKET_FILENAME),
+        os.path.join(config_folder, AUTHKEY_FILENAME),
+    )
+
+
+def _address(config_folder: str) -> Tuple[str, str]:
+    """Return address and family of daemon listener for config folder.
+
+    Windows has no Unix sockets, a named pipe is used there instead.
+    """
+    if sys.platform == "win32":
+        digest = hashlib.sha256(config_folder.encode("utf-8")).hexdigest()[:16]
+        return f"\\\\.\\pipe\\gitp-{digest}", "AF_PIPE"
+    return _paths(config_folder)[0], "AF_UNIX"
+
+
+def _request(config_folder: str, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Send request to daemon and return its reply.
+
+    Args:
+        config_folder: folder of daemon socket and key.
+        request: JSON serializable request.
+
+    Returns:
+        Optional[Dict[str, Any]]: reply, None if no daemon accepted the request.
+            A daemon stopping before replying gives an empty reply.
+    """
+    _, key_path = _paths(config_folder)
+    # written by the daemon before listening, removed when it stops
+    if not os.path.exists(key_path):
+        return None
+    import multiprocessing
+    from multiprocessing import connection
+
+    address, family = _address(config_folder)
+    try:
+        with open(key_path, "rb") as key_file:
+            authkey = key_file.read()
+        conn = connection.Client(address, family=family, authkey=authkey)
+    except (OSError, EOFError, ValueError, multiprocessing.AuthenticationError):
+        return None
+    with conn:
+        try:
+            conn.send_bytes(json.dumps(request).encode("utf-8"))
+            reply: Dict[str, Any] = json.loads(conn.recv_bytes())
+        except (OSError, EOFError):
+            # the request may have been run, it must not be run again
+            return {}
+    return reply
+
+
+def forward(config_folder: str, args: List[str], cwd: str) -> Optional[Result]:
+    """Run command in daemon.
+
+    Args:
+        config_folder: folder of daemon socket and key.
+        args: command line arguments.
+        cwd: working directory of command.
+
+    Returns:
+        Optional[Result]: result, None if no daemon is running.
+    """
+    reply = _request(config_folder, {"action": "run", "args": args, "cwd": cwd})
+    if reply is None:
+        return None
+    if not reply:
+        return 1, "", "Error: gitp daemon stopped before answering.\n"
+    return reply["exit_code"], reply["stdout"], reply["stderr"]
+
+
+def is_running(config_folder: str) -> bool:
+    """Check if a daemon answers on socket of config folder."""
+    return bool(_request(config_folder, {"action": "ping"}))
+
+
+def stop(config_folder: str) -> bool:
+    """Stop daemon, return False if none was running."""
+    return bool(_request(config_folder, {"action": "stop"}))
+
+
+class Daemon:
+    """Run commands sent by gitp clients over a local socket or named pipe.
+
+    Commands run one at a time in this process, so GitHub services, their
+    connections and caches stay warm between them. Clients authenticate with
+    a key readable only by the user.
+    """
+
+    def __init__(self, config_folder: str, handler: Handler) -> None:
+        """Constructor."""
+        self.config_folder = config_folder
+        _, self.key_path = _paths(config_folder)
+        self.socket_path, self.family = _address(config_folder)
+        self.handler = handler
+
+    def serve(self) -> None:
+        """Serve requests until stopped."""
+        global _serving
+        import multiprocessing
+        from multiprocessing import connection
+
+        if self.family == "AF_UNIX" and os.path.exists(self.socket_path):
+            # left by a daemon that did not stop cleanly
+            os.remove(self.socket_path)
+        authkey = secrets.token_bytes(32)
+        os.makedirs(self.config_folder, exist_ok=True)
+        fd = os.open(self.key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as key_file:
+            key_file.write(authkey)
+        listener = connection.Listener(
+            self.socket_path, family=self.family, authkey=authkey
+        )
+        _serving = True
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError, multiprocessing.AuthenticationError):
+                    continue
+                with conn:
+                    if not self._serve_client(conn):
+                        break
+        finally:
+            _serving = False
+            listener.close()
+            os.remove(self.key_path)
+
+    def _serve_client(self, conn: Any) -> bool:
+        """Answer one request, return False on stop request."""
+        try:
+            request = json.loads(conn.recv_bytes())
+        except (OSError, EOFError, ValueError):
+            return True
+        action: str = request.get("action", "")
+        reply: Dict[str, Any] = {"ok": True}
+        if action == "run":
+            try:
+                exit_code, stdout, stderr = self.handler(
+                    request["args"], request["cwd"]
+                )
+            except Exception:
+                exit_code, stdout, stderr = 1, "", traceback.format_exc()
+            reply.update(exit_code=exit_code, stdout=stdout, stderr=stderr)
+        try:
+            conn.send_bytes(json.dumps(reply).encode("utf-8"))
+        except OSError:
+            pass
+        return action != "stop"
@@ -0,0 +1,15 @@
+"""Defaults module."""
+# kept free of imports, the command-line reads them on startup while modules
+# using github3, requests or sqlite3 are imported by the commands needing them
+READ_BACKENDS = ("rest", "graphql")
+# each mutation is processed in sequence by the server, keep requests short
+MUTATION_BATCH_SIZE = 50
+DEFAULT_RETRIES = 3
+# same as requests default
+DEFAULT_POOL_SIZE = 10
+CATALOG_CACHE_FILENAME = "catalog.json"
+CATALOG_TTL = 60 * 60
+IDENTITY_CACHE_FILENAME = "identity.json"
+IDENTITY_TTL = 24 * 60 * 60
+ISSUE_MIRROR_FILENAME = "issues.sqlite3"
+MIRROR_ENV_VAR = "GITP_MIRROR"
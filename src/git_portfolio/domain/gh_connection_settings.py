@@ -2,6 +2,10 @@
 from dataclasses import dataclass
 
 
+class AuthError(Exception):
+    """Token rejected by Github, or not scoped for gitp."""
+
+
 @dataclass
 class GhConnectionSettings:
     """Github connection settings class."""
@@ -11,3 +11,7 @@ class Issue:
     title: str
     body: str
     labels: Set[str]
+    # GraphQL global id, empty when not read with GraphQL
+    node_id: str = ""
+    # "open" or "closed", empty when unknown
+    state: str = ""
@@ -0,0 +1,42 @@
+"""Repository result model."""
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Dict
+
+SUCCESS = "success"
+ERROR = "error"
+# nothing to change, eg. no issues match
+SKIPPED = "skipped"
+
+
+@dataclass
+class Output:
+    """Output of a change on one repository, with its status."""
+
+    status: str
+    text: str
+
+
+@dataclass
+class RepoResult:
+    """Result of a command on one repository."""
+
+    repo: str
+    action: str
+    # SUCCESS, SKIPPED or ERROR
+    status: str
+    detail: str
+    # seconds
+    duration: float = 0.0
+    # GitHub API requests sent for this repository
+    api_calls: int = 0
+    # block shown in text output mode
+    output: str = field(default="", repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return JSON serializable record, without text output."""
+        record = asdict(self)
+        del record["output"]
+        return record
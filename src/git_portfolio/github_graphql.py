@@ -0,0 +1,376 @@
+"""Github GraphQL module."""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import github3
+
+import git_portfolio.defaults as dfl
+import git_portfolio.domain.issue as i
+
+# keeps query cost and server time low, each repo may bring 100 nodes
+REPOS_PER_QUERY = 25
+PAGE_SIZE = 100
+
+ISSUE_FIELDS = "id number title body state labels(first: 100) { nodes { name } }"
+PULL_REQUEST_FIELDS = "id number baseRefName headRefName headRepositoryOwner { login }"
+ISSUE_STATES = {"open": "[OPEN]", "closed": "[CLOSED]"}
+PULL_REQUEST_STATES = {"open": "[OPEN]", "closed": "[CLOSED, MERGED]"}
+MUTATION_INPUTS = {
+    "closeIssue": "CloseIssueInput",
+    "mergePullRequest": "MergePullRequestInput",
+}
+
+
+class GraphqlError(Exception):
+    """Error returned by Github GraphQL API."""
+
+
+def graphql_url(api_url: str) -> str:
+    """Get GraphQL endpoint from REST API url.
+
+    Args:
+        api_url: REST API url, eg. https://api.github.com or
+            https://myhost.com/api/v3 for Github Enterprise.
+
+    Returns:
+        str: GraphQL endpoint.
+    """
+    api_url = api_url.rstrip("/")
+    if api_url.endswith("/v3"):
+        return f"{api_url[:-3]}/graphql"
+    return f"{api_url}/graphql"
+
+
+def post_query(
+    session: github3.session.GitHubSession,
+    url: str,
+    query: str,
+    variables: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Post GraphQL document and return response body.
+
+    Args:
+        session: authenticated session.
+        url: GraphQL endpoint.
+        query: GraphQL document.
+        variables: document variables.
+
+    Raises:
+        GitHubError: on HTTP error.
+
+    Returns:
+        Dict[str, Any]: body with data and/or errors.
+    """
+    response = session.post(url, json={"query": query, "variables": variables})
+    if response.status_code != 200:
+        raise github3.exceptions.error_for(response)
+    body: Dict[str, Any] = response.json()
+    return body
+
+
+def _split_repo(github_repo: str) -> Tuple[str, str]:
+    owner, _, name = github_repo.partition("/")
+    return owner, name
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+class GithubGraphqlReader:
+    """Read data of many repositories with aliased GraphQL queries.
+
+    Each query fetches data of up to `REPOS_PER_QUERY` repositories in one
+    round trip, asking only the fields needed by domain models. Repositories
+    that could not be read are left out of the results.
+    """
+
+    def __init__(self, session: github3.session.GitHubSession) -> None:
+        """Constructor."""
+        self.session = session
+        self.url = graphql_url(session.base_url)
+
+    def query(self, query: str, variables: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """Execute query.
+
+        Args:
+            query: GraphQL document.
+            variables: query variables.
+
+        Raises:
+            GraphqlError: when no data is returned.
+            GitHubError: on HTTP error.
+
+        Returns:
+            Dict[str, Any]: data by alias. Aliases of failed fields are None.
+        """
+        body = post_query(self.session, self.url, query, variables)
+        if not body.get("data"):
+            messages = [error.get("message", "") for error in body.get("errors", [])]
+            raise GraphqlError("; ".join(messages))
+        data: Dict[str, Any] = body["data"]
+        return data
+
+    def _query_repos(
+        self,
+        github_repos: List[str],
+        selection: str,
+        variables: Optional[Dict[str, str]] = None,
+        cursors: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Dict[str, Any]:
+        """Query same selection on each repo.
+
+        Args:
+            github_repos: repository names.
+            selection: fields selected on each repository.
+            variables: string variables shared by all repositories.
+            cursors: cursor by repository, used in place of `$after`.
+
+        Returns:
+            Dict[str, Any]: repository data by name.
+        """
+        variables = variables or {}
+        found: Dict[str, Any] = {}
+        for chunk in _chunks(github_repos, REPOS_PER_QUERY):
+            definitions = [f"${name}: String!" for name in variables]
+            chunk_variables: Dict[str, Optional[str]] = dict(variables)
+            fields = []
+            for n, github_repo in enumerate(chunk):
+                owner, name = _split_repo(github_repo)
+                definitions += [f"$o{n}: String!", f"$n{n}: String!"]
+                chunk_variables.update({f"o{n}": owner, f"n{n}": name})
+                repo_selection = selection
+                if cursors is not None:
+                    definitions.append(f"$a{n}: String")
+                    chunk_variables[f"a{n}"] = cursors.get(github_repo)
+                    repo_selection = selection.replace("$after", f"$a{n}")
+                fields.append(
+                    f"r{n}: repository(owner: $o{n}, name: $n{n}) "
+                    f"{{ {repo_selection} }}"
+                )
+            data = self.query(
+                f"query({', '.join(definitions)}) {{ {' '.join(fields)} }}",
+                chunk_variables,
+            )
+            for n, github_repo in enumerate(chunk):
+                if data.get(f"r{n}") is not None:
+                    found[github_repo] = data[f"r{n}"]
+        return found
+
+    def list_issues(
+        self, github_repos: List[str], filters: Dict[str, str]
+    ) -> Dict[str, List[i.Issue]]:
+        """Return issues and/or pull requests of many repositories.
+
+        Args:
+            github_repos: repository names.
+            filters: valid list request filters.
+
+        Returns:
+            Dict[str, List[i.Issue]]: matching issues by repository name, newest
+                first. Empty when filters are not supported.
+        """
+        obj = filters.get("obj__eq")
+        state = filters.get("state__eq")
+        title_query = filters.get("title__contains")
+        if state not in (None, "all", "open", "closed"):
+            return {}
+        connections = []
+        if obj in (None, "all", "issue"):
+            connections.append(("issues", ISSUE_STATES.get(state or "")))
+        if obj in (None, "all", "pull request"):
+            connections.append(("pullRequests", PULL_REQUEST_STATES.get(state or "")))
+
+        nodes: Dict[str, List[Dict[str, Any]]] = {}
+        for connection, states in connections:
+            for github_repo, repo_nodes in self._list_connection(
+                github_repos, connection, states
+            ).items():
+                nodes.setdefault(github_repo, []).extend(repo_nodes)
+
+        found = {}
+        for github_repo, repo_nodes in nodes.items():
+            repo_nodes.sort(key=lambda node: node["number"], reverse=True)
+            found[github_repo] = [
+                i.Issue(
+                    node["number"],
+                    node["title"],
+                    node["body"],
+                    set(label["name"] for label in node["labels"]["nodes"]),
+                    node["id"],
+                    # merged pull requests are closed as well
+                    "open" if node["state"] == "OPEN" else "closed",
+                )
+                for node in repo_nodes
+                if not title_query or title_query in node["title"]
+            ]
+        return found
+
+    def _list_connection(
+        self,
+        github_repos: List[str],
+        connection: str,
+        states: Optional[str],
+        fields: str = ISSUE_FIELDS,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Page through issues or pullRequests of many repos."""
+        arguments = f"first: {PAGE_SIZE}, after: $after"
+        arguments += ", orderBy: {field: CREATED_AT, direction: DESC}"
+        if states:
+            arguments += f", states: {states}"
+        nodes: Dict[str, List[Dict[str, Any]]] = {}
+        cursors: Dict[str, Optional[str]] = {repo: None for repo in github_repos}
+        while cursors:
+            data = self._query_repos(
+                list(cursors),
+                f"{connection}({arguments}) {{ pageInfo {{ hasNextPage "
+                f"endCursor }} nodes {{ {fields} }} }}",
+                cursors=cursors,
+            )
+            cursors = {}
+            for github_repo, repo_data in data.items():
+                page = repo_data[connection]
+                nodes.setdefault(github_repo, []).extend(page["nodes"])
+                if page["pageInfo"]["hasNextPage"]:
+                    cursors[github_repo] = page["pageInfo"]["endCursor"]
+        return nodes
+
+    def find_pull_requests(
+        self, github_repos: List[str], base: str, head: str, prefix: str
+    ) -> Dict[str, List[Tuple[int, str]]]:
+        """Return open pull requests from head to base by repo.
+
+        Args:
+            github_repos: repository names.
+            base: base branch name.
+            head: head branch name.
+            prefix: owner of the head repository.
+
+        Returns:
+            Dict[str, List[Tuple[int, str]]]: pull request numbers and node ids
+                by repository name.
+        """
+        data = self._query_repos(
+            github_repos,
+            "pullRequests(first: 5, states: [OPEN], baseRefName: $base, "
+            "headRefName: $head) { nodes { id number headRepositoryOwner { login } } }",
+            {"base": base, "head": head},
+        )
+        return {
+            github_repo: [
+                (node["number"], node["id"])
+                for node in repo_data["pullRequests"]["nodes"]
+                if (node["headRepositoryOwner"] or {}).get("login", "").lower()
+                == prefix.lower()
+            ]
+            for github_repo, repo_data in data.items()
+        }
+
+    def list_open_pull_requests(
+        self, github_repos: List[str]
+    ) -> Dict[str, List[Tuple[int, str, str, str, str]]]:
+        """Return all open pull requests by repo.
+
+        Args:
+            github_repos: repository names.
+
+        Returns:
+            Dict[str, List[Tuple[int, str, str, str, str]]]: number, node id,
+                base branch, head branch and owner of head repository of pull
+                requests by repository name.
+        """
+        nodes = self._list_connection(
+            github_repos, "pullRequests", "[OPEN]", PULL_REQUEST_FIELDS
+        )
+        return {
+            github_repo: [
+                (
+                    node["number"],
+                    node["id"],
+                    node["baseRefName"],
+                    node["headRefName"],
+                    (node["headRepositoryOwner"] or {}).get("login", ""),
+                )
+                for node in repo_nodes
+            ]
+            for github_repo, repo_nodes in nodes.items()
+        }
+
+    def get_repo_urls(self, github_repos: List[str]) -> Dict[str, str]:
+        """Return SSH clone URL by repository name."""
+        data = self._query_repos(github_repos, "sshUrl")
+        return {
+            github_repo: repo_data["sshUrl"] for github_repo, repo_data in data.items()
+        }
+
+
+class GithubGraphqlMutator:
+    """Run many mutations with aliased GraphQL documents.
+
+    Mutations are sent in batches of `batch_size`, each outcome is reported
+    on its own so one failure does not hide the others.
+    """
+
+    def __init__(
+        self,
+        session: github3.session.GitHubSession,
+        batch_size: int = dfl.MUTATION_BATCH_SIZE,
+    ) -> None:
+        """Constructor."""
+        self.session = session
+        self.url = graphql_url(session.base_url)
+        self.batch_size = batch_size
+
+    def run(self, operations: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Run mutations.
+
+        Args:
+            operations: mutation names from `MUTATION_INPUTS` and their input.
+
+        Returns:
+            List[str]: error message of each operation, empty on success.
+        """
+        errors: List[str] = []
+        for chunk in _chunks(operations, self.batch_size):
+            definitions = []
+            fields = []
+            variables = {}
+            for n, (mutation, mutation_input) in enumerate(chunk):
+                definitions.append(f"$i{n}: {MUTATION_INPUTS[mutation]}!")
+                fields.append(f"m{n}: {mutation}(input: $i{n}) {{ clientMutationId }}")
+                variables[f"i{n}"] = mutation_input
+            try:
+                body = post_query(
+                    self.session,
+                    self.url,
+                    f"mutation({', '.join(definitions)}) {{ {' '.join(fields)} }}",
+                    variables,
+                )
+            except github3.exceptions.GitHubError as github_error:
+                errors += [str(github_error.msg)] * len(chunk)
+                continue
+            errors += self._chunk_errors(body, len(chunk))
+        return errors
+
+    @staticmethod
+    def _chunk_errors(body: Dict[str, Any], size: int) -> List[str]:
+        """Match errors to aliases, errors without path fail every alias."""
+        alias_errors: Dict[str, str] = {}
+        general_errors = []
+        for error in body.get("errors") or []:
+            path = error.get("path") or []
+            if path:
+                alias_errors.setdefault(str(path[0]), error.get("message", ""))
+            else:
+                general_errors.append(error.get("message", ""))
+        data = body.get("data") or {}
+        general_error = "; ".join(general_errors) or "no result"
+        return [
+            ""
+            if data.get(f"m{n}") is not None
+            else alias_errors.get(f"m{n}", general_error)
+            for n in range(size)
+        ]
@@ -1,27 +1,100 @@
 """Github service module."""
 import copy
+import functools
+import sqlite3
+import urllib.parse
+from concurrent import futures
 from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Union
 
 import github3
+import requests
 
+import git_portfolio.defaults as dfl
 import git_portfolio.domain.gh_connection_settings as cs
 import git_portfolio.domain.issue as i
 import git_portfolio.domain.pull_request as pr
 import git_portfolio.domain.pull_request_merge as prm
+import git_portfolio.domain.repo_result as rr
+import git_portfolio.github_graphql as ghg
+import git_portfolio.issue_mirror as im
+import git_portfolio.local_cache as lc
+import git_portfolio.prefetch as pf
+import git_portfolio.profiling as prof
+import git_portfolio.rate_limit as rl
 import git_portfolio.request_objects.issue_list as il
+import git_portfolio.retry as rt
+
+CATALOG_PAGE_SIZE = 100
+ISSUE_PAGE_SIZE = 100
+# https://docs.github.com/en/rest/reference/search#limitations-on-query-length
+SEARCH_QUERY_MAX_LENGTH = 256
+SEARCH_MAX_RESULTS = 1000
+# GitHub.com uses api and uploads hosts, Enterprise a single one
+POOL_HOSTS = 4
 
 
 class GithubService:
     """Github service class."""
 
-    def __init__(self, github_config: cs.GhConnectionSettings) -> None:
+    def __init__(
+        self,
+        github_config: cs.GhConnectionSettings,
+        catalog_cache: Optional[lc.LocalCache] = None,
+        read_backend: str = "rest",
+        mutation_batch_size: int = dfl.MUTATION_BATCH_SIZE,
+        retries: int = dfl.DEFAULT_RETRIES,
+        pool_size: int = dfl.DEFAULT_POOL_SIZE,
+        identity_cache: Optional[lc.LocalCache] = None,
+        issue_mirror: Optional[im.IssueMirror] = None,
+    ) -> None:
         """Constructor."""
         self.config = github_config
+        self.catalog_cache = catalog_cache
+        self.identity_cache = identity_cache
+        self.issue_mirror = issue_mirror
+        self.pool_size = pool_size
         self.connection = self._get_connection()
-        self.user = self._test_connection(self.connection)
-        self.repos = self.connection.repositories()
+        self._configure_pool(self.connection.session, pool_size)
+        # innermost, to record each request sent, retries included
+        prof.install(self.connection.session)
+        self.connection.session.request = functools.partial(
+            self._check_auth, self.connection.session.request
+        )
+        self.rate_limit = rl.RateLimitScheduler()
+        self.rate_limit.install(self.connection.session)
+        # each retry goes through the rate limit scheduler again
+        rt.RetryPolicy(retries).install(self.connection.session)
+        self.token_scopes = ""
+        self.identity_verified = False
+        # message of the token test once it failed, later requests fail alike
+        self.auth_failure = ""
+        self.username = self._load_identity()
+        # names of all accessible repos, only loaded when they are needed
+        self.catalog: Optional[List[str]] = None
+        # same names, to check repos in constant time
+        self.catalog_names: Set[str] = set()
+        # repos fetched one by one when needed
+        self.repos: Dict[str, github3.repos.Repository] = {}
+        # bulk reads and writes, only with GraphQL backend
+        self.graphql: Optional[ghg.GithubGraphqlReader] = None
+        self.mutator: Optional[ghg.GithubGraphqlMutator] = None
+        if read_backend == "graphql":
+            self.graphql = ghg.GithubGraphqlReader(self.connection.session)
+            self.mutator = ghg.GithubGraphqlMutator(
+                self.connection.session, mutation_batch_size
+            )
+        self.repo_urls: Dict[str, str] = {}
+        # numbers and node ids of PRs to merge by repo, base and head
+        self.pull_numbers: Dict[Tuple[str, str, str], List[Tuple[int, str]]] = {}
+        # reads started before they are needed, eg. while prompting
+        self.prefetcher = pf.Prefetcher()
 
     def _get_connection(self) -> Union[github3.GitHub, github3.GitHubEnterprise]:
         """Get Github connection, create one if does not exist."""
@@ -30,14 +103,101 @@ class GithubService:
 
         # GitHub Enterprise
         if self.config.hostname:
-            base_url = f"https://{self.config.hostname}/api/v3"
-            return github3.enterprise_login(
-                url=base_url, token=self.config.access_token
-            )
+            # a scheme can be given, eg. for a local server over plain HTTP
+            # github3 adds /api/v3 to it
+            url = self.config.hostname
+            if "://" not in url:
+                url = f"https://{url}"
+            return github3.enterprise_login(url=url, token=self.config.access_token)
         # GitHub.com
         else:
             return github3.login(token=self.config.access_token)
 
+    @staticmethod
+    def _configure_pool(session: github3.session.GitHubSession, pool_size: int) -> None:
+        """Keep up to pool_size connections alive per host.
+
+        Each concurrent request needs its own connection, with a smaller pool
+        connections beyond it are closed after use and reopened later with a
+        new TLS handshake.
+        """
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=POOL_HOSTS, pool_maxsize=pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def _identity_key(self) -> str:
+        return lc.fingerprint(self.config.hostname, self.config.access_token)
+
+    def _load_identity(self) -> str:
+        """Return login of token, testing connection only if not cached."""
+        if self.identity_cache is not None:
+            entry = self.identity_cache.get(self._identity_key())
+            if entry is not None and self.identity_cache.is_fresh(entry):
+                self.token_scopes = entry["scopes"]
+                login: str = entry["login"]
+                return login
+        return self._verify_identity()
+
+    def _verify_identity(self) -> str:
+        """Test connection and cache identity of token.
+
+        Returns:
+            str: login of token.
+        """
+        # set first, auth errors of the test itself must not test again
+        self.identity_verified = True
+        try:
+            login: str = self._test_connection(self.connection).login
+        except cs.AuthError as auth_error:
+            self.auth_failure = str(auth_error)
+            raise
+        if self.identity_cache is not None:
+            self.identity_cache.set(
+                self._identity_key(),
+                {
+                    "login": login,
+                    "scopes": self.token_scopes,
+                    "hostname": self.config.hostname,
+                },
+            )
+        return login
+
+    def _check_auth(
+        self, send: Callable[..., Any], method: str, url: str, **kwargs: Any
+    ) -> Any:
+        """Send request, testing connection on first auth error.
+
+        An identity taken from cache may be outdated, eg. the token was
+        revoked, in which case the cache entry is dropped and the connection
+        test raises the same errors it raises on startup.
+
+        Args:
+            send: original request function.
+            method: HTTP method.
+            url: request url.
+            **kwargs: keyword arguments of `send`.
+
+        Raises:
+            AuthError: token rejected.
+
+        Returns:
+            Any: response.
+        """
+        response = send(method, url, **kwargs)
+        if "X-OAuth-Scopes" in response.headers:
+            self.token_scopes = response.headers["X-OAuth-Scopes"]
+        if response.status_code != 401:
+            return response
+        if self.auth_failure:
+            raise cs.AuthError(self.auth_failure)
+        # only identities taken from cache are not verified
+        if not self.identity_verified and self.identity_cache is not None:
+            self.identity_cache.delete(self._identity_key())
+            self.username = self._verify_identity()
+        return response
+
     @staticmethod
     def _test_connection(
         connection: Union[github3.GitHub, github3.GitHubEnterprise]
@@ -46,19 +206,143 @@ class GithubService:
         try:
             return connection.me()
         except github3.exceptions.AuthenticationFailed:
-            raise AttributeError("Invalid token.")
+            raise cs.AuthError("Invalid token.")
         except github3.exceptions.ConnectionError:
             raise ConnectionError()
         except github3.exceptions.IncompleteResponse:
-            raise AttributeError(
+            raise cs.AuthError(
                 "Invalid response. Your token might not be properly scoped."
             )
 
-    def _get_repo(self, repo_name: str) -> github3.repos.ShortRepository:
-        for repo in self.repos:
-            if repo.full_name == repo_name:
-                return repo
-        raise NameError(f"Repository {repo_name} not found.")
+    def _get_catalog(self) -> List[str]:
+        """Get all accessible repo names, listing them once."""
+        if self.catalog is None:
+            catalog: Optional[List[str]] = self.prefetcher.get("catalog")
+            if catalog is None:
+                catalog = self._load_catalog()
+            self._set_catalog(catalog)
+            return catalog
+        return self.catalog
+
+    def _set_catalog(self, catalog: List[str]) -> None:
+        self.catalog = catalog
+        self.catalog_names = set(catalog)
+
+    def _load_catalog(self, force_revalidation: bool = False) -> List[str]:
+        """Load repo names from cache, revalidating it if expired."""
+        if self.catalog_cache is None:
+            pages = self._list_catalog_pages([])
+        else:
+            cache_key = lc.fingerprint(self.config.hostname, self.config.access_token)
+            entry = self.catalog_cache.get(cache_key)
+            if (
+                entry is not None
+                and not force_revalidation
+                and self.catalog_cache.is_fresh(entry)
+            ):
+                pages = entry["pages"]
+            else:
+                pages = self._list_catalog_pages(entry["pages"] if entry else [])
+                self.catalog_cache.set(cache_key, {"pages": pages})
+        return [name for page in pages for name in page["names"]]
+
+    def _list_catalog_pages(
+        self, cached_pages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """List repos page by page using conditional requests.
+
+        Unchanged pages are answered with 304 Not Modified, which does not
+        count against the rate limit.
+
+        Args:
+            cached_pages: pages from a previous listing.
+
+        Raises:
+            GitHubError: on unexpected response.
+
+        Returns:
+            List[Dict[str, Any]]: pages with url, etag, names and next url.
+        """
+        session = self.connection.session
+        cached_by_url = {page["url"]: page for page in cached_pages}
+        url = f"{session.build_url('user', 'repos')}?per_page={CATALOG_PAGE_SIZE}"
+        pages = []
+        while url:
+            headers = {}
+            if url in cached_by_url:
+                headers["If-None-Match"] = cached_by_url[url]["etag"]
+            response = session.get(url, headers=headers)
+            if response.status_code == 304:
+                page = cached_by_url[url]
+            elif response.status_code == 200:
+                page = {
+                    "url": url,
+                    "etag": response.headers.get("ETag", ""),
+                    "names": [repo["full_name"] for repo in response.json()],
+                    "next": response.links.get("next", {}).get("url"),
+                }
+            else:
+                raise github3.exceptions.error_for(response)
+            pages.append(page)
+            url = page["next"]
+        return pages
+
+    def refresh_catalog(self) -> int:
+        """Revalidate cached repo names even if not expired.
+
+        Returns:
+            int: number of repos.
+        """
+        catalog = self._load_catalog(force_revalidation=True)
+        self._set_catalog(catalog)
+        return len(catalog)
+
+    def _get_repo(self, repo_name: str) -> github3.repos.Repository:
+        if self.catalog is not None and repo_name not in self.catalog_names:
+            raise NameError(f"Repository {repo_name} not found.")
+        if repo_name not in self.repos:
+            owner, _, name = repo_name.partition("/")
+            try:
+                repo = self.connection.repository(owner, name)
+            except github3.exceptions.NotFoundError as e:
+                raise NameError(f"Repository {repo_name} not found.") from e
+            self.repos[repo_name] = repo
+        return self.repos[repo_name]
+
+    def start_prefetch_catalog(self) -> None:
+        """Start loading repo names in background."""
+        if self.catalog is None:
+            self.prefetcher.submit("catalog", self._load_catalog)
+
+    def start_prefetch_open_issues(self, github_repos: List[str], obj: str) -> None:
+        """Start listing open issues or pull requests in background.
+
+        `list_issues_from_repos` uses the listing for requests of open objects
+        of the same type, whatever their title filter.
+
+        Args:
+            github_repos: repository names.
+            obj: "issue" or "pull request".
+        """
+        request = il.build_list_request(filters={"obj__eq": obj, "state__eq": "open"})
+        self.prefetcher.submit(
+            ("issues", obj), self._list_issues_from_repos, github_repos, request
+        )
+
+    def start_prefetch_pull_requests(self, github_repos: List[str]) -> None:
+        """Start listing open PRs in background when using GraphQL backend.
+
+        `prefetch_pull_requests` then finds PRs to merge without requests.
+        """
+        if self.graphql is None:
+            return
+        self.prefetcher.submit(
+            "pulls", self.graphql.list_open_pull_requests, github_repos
+        )
+
+    def cancel_prefetch(self) -> None:
+        """Drop prefetched data, eg. when command is done."""
+        self.prefetcher.cancel()
 
     def get_config(self) -> cs.GhConnectionSettings:
         """Get service config."""
@@ -66,35 +350,76 @@ class GithubService:
 
     def get_repo_names(self) -> List[str]:
         """Get list of repository names."""
-        return [repo.full_name for repo in self.repos]
+        return self._get_catalog()
+
+    def prefetch_repo_urls(self, github_repos: List[str]) -> None:
+        """Read URLs of many repos at once when using GraphQL backend.
+
+        Repos not prefetched, eg. on failure, are read one by one later.
+        """
+        if self.graphql is None:
+            return
+        try:
+            self.repo_urls.update(self.graphql.get_repo_urls(github_repos))
+        except (ghg.GraphqlError, github3.exceptions.GitHubError):
+            pass
 
     def get_repo_url(self, repo_name: str) -> str:
         """Get URL for repo."""
-        for repo in self.repos:
-            if repo.full_name == repo_name:
-                host = self.config.hostname if self.config.hostname else "github.com"
-                return f"git@{host}:{repo.full_name}.git"
-        raise NameError(f"Repository {repo_name} not found.")
+        if repo_name in self.repo_urls:
+            return self.repo_urls[repo_name]
+        repo = self._get_repo(repo_name)
+        host = self.config.hostname.split("://")[-1] or "github.com"
+        return f"git@{host}:{repo.full_name}.git"
+
+    def requests_sent(self) -> int:
+        """Return number of API requests sent by the current thread."""
+        return self.rate_limit.sent_by_thread()
+
+    def get_rate_limit_budget(self) -> Dict[str, rl.Budget]:
+        """Get requests left by rate limit resource, as of last response."""
+        return self.rate_limit.budget()
+
+    def fetch_rate_limit_budget(self) -> Dict[str, rl.Budget]:
+        """Get requests left by rate limit resource from GitHub.
+
+        The rate limit endpoint does not count against the rate limit. On
+        error, budgets seen on previous responses are returned.
+
+        Returns:
+            Dict[str, rl.Budget]: budget by resource.
+        """
+        session = self.connection.session
+        try:
+            response = session.get(session.build_url("rate_limit"))
+        except requests.RequestException:
+            return self.rate_limit.budget()
+        if response.status_code == 200:
+            self.rate_limit.set_budgets(response.json().get("resources", {}))
+        return self.rate_limit.budget()
 
     def get_username(self) -> Any:
         """Get Github username."""
-        return self.user.login
+        return self.username
 
-    def create_issue_from_repo(self, github_repo: str, issue: i.Issue) -> str:
+    def create_issue_from_repo(self, github_repo: str, issue: i.Issue) -> rr.Output:
         """Create issue from one repository."""
         repo = self._get_repo(github_repo)
         try:
             repo.create_issue(
                 title=issue.title, body=issue.body, labels=list(issue.labels)
             )
-            return f"{github_repo}: create issue successful.\n"
+            return rr.Output(rr.SUCCESS, f"{github_repo}: create issue successful.\n")
         except github3.exceptions.ClientError as client_error:
             if client_error.msg == "Issues are disabled for this repo":
-                return f"{github_repo}: {client_error.msg}. It may be a fork.\n"
+                message = f"{client_error.msg}. It may be a fork."
+                return rr.Output(rr.SKIPPED, f"{github_repo}: {message}\n")
             else:
-                return f"{github_repo}: {client_error.msg}.\n"
+                return rr.Output(rr.ERROR, f"{github_repo}: {client_error.msg}.\n")
         except github3.exceptions.GitHubError as github_error:
-            raise AttributeError(f"{github_repo}: {github_error.msg}\n")
+            raise AttributeError(
+                f"{github_repo}: {github_error.msg}\n"
+            ) from github_error
 
     def list_issues_from_repo(
         self,
@@ -102,18 +427,14 @@ class GithubService:
         request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
     ) -> List[i.Issue]:
         """Return list of issues from one repository."""
+        mirrored = self._list_mirrored_issues([github_repo], request)
+        if mirrored is not None and github_repo in mirrored:
+            return mirrored[github_repo]
         if isinstance(request, il.IssueListValidRequest):
             repo = self._get_repo(github_repo)
 
-            domain_issues = []
             if not request.filters:
-                issues = list(repo.issues())
-                for issue in issues:
-                    labels = set(label.name for label in issue.labels())
-                    domain_issues.append(
-                        i.Issue(issue.number, issue.title, issue.body, labels)
-                    )
-                return issues
+                return [self._to_domain_issue(issue) for issue in repo.issues()]
 
             obj = request.filters.get("obj__eq")
             state = request.filters.get("state__eq")
@@ -128,32 +449,395 @@ class GithubService:
             if title_query:
                 issues = [issue for issue in issues if title_query in issue.title]
 
-            for issue in issues:
-                labels = set(label.name for label in issue.labels())
-                domain_issues.append(
-                    i.Issue(issue.number, issue.title, issue.body, labels)
+            return [self._to_domain_issue(issue) for issue in issues]
+        return []
+
+    @staticmethod
+    def _to_domain_issue(issue: github3.issues.ShortIssue) -> i.Issue:
+        """Convert issue using labels embedded in listing, without requests."""
+        labels = set(label.name for label in issue.original_labels or [])
+        return i.Issue(issue.number, issue.title, issue.body, labels, state=issue.state)
+
+    def list_issues_from_repos(
+        self,
+        github_repos: List[str],
+        request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
+    ) -> Dict[str, List[i.Issue]]:
+        """Return issues from many repositories in few requests.
+
+        Uses GraphQL backend when selected, search API otherwise. Repos
+        missing from the result should be listed with `list_issues_from_repo`.
+
+        Args:
+            github_repos: repository names.
+            request: list request.
+
+        Returns:
+            Dict[str, List[i.Issue]]: matching issues by repository name.
+        """
+        prefetched = self._get_prefetched_issues(github_repos, request)
+        if prefetched is not None:
+            return prefetched
+        return self._list_issues_from_repos(github_repos, request)
+
+    def _get_prefetched_issues(
+        self,
+        github_repos: List[str],
+        request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
+    ) -> Optional[Dict[str, List[i.Issue]]]:
+        """Filter open objects prefetched for request, None if there are none."""
+        filters = self._open_objects_filters(request)
+        if filters is None:
+            return None
+        listing = self.prefetcher.get(("issues", filters.get("obj__eq")))
+        if listing is None:
+            return None
+        title_query = filters.get("title__contains")
+        return {
+            github_repo: [
+                issue
+                for issue in listing[github_repo]
+                if not title_query or title_query in issue.title
+            ]
+            for github_repo in github_repos
+            if github_repo in listing
+        }
+
+    @staticmethod
+    def _open_objects_filters(
+        request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
+    ) -> Optional[Dict[str, str]]:
+        """Return filters of request of open objects by type and title, or None."""
+        if not isinstance(request, il.IssueListValidRequest) or not request.filters:
+            return None
+        filters = request.filters
+        if filters.get("state__eq") != "open" or not set(filters) <= {
+            "obj__eq",
+            "state__eq",
+            "title__contains",
+        }:
+            return None
+        return filters
+
+    def _list_mirrored_issues(
+        self,
+        github_repos: List[str],
+        request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
+    ) -> Optional[Dict[str, List[i.Issue]]]:
+        """Sync mirror then filter its open objects, None if it cannot answer.
+
+        Repos whose sync failed are missing from the result.
+        """
+        filters = self._open_objects_filters(request)
+        if self.issue_mirror is None or filters is None:
+            return None
+        account = self._identity_key()
+        title_query = filters.get("title__contains")
+        return {
+            github_repo: [
+                issue
+                for issue in self.issue_mirror.list_open(
+                    account, github_repo, filters.get("obj__eq")
                 )
+                if not title_query or title_query in issue.title
+            ]
+            for github_repo in self.sync_issue_mirror(github_repos)
+        }
 
-            return domain_issues
-        return []
+    def sync_issue_mirror(self, github_repos: List[str]) -> List[str]:
+        """Update issue mirror with changes since last sync, repos in parallel.
+
+        Args:
+            github_repos: repository names.
+
+        Returns:
+            List[str]: repos synced, the others are left as they were.
+        """
+        if self.issue_mirror is None:
+            return []
+        sync = functools.partial(self._try_sync_issues, self.issue_mirror)
+        with futures.ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            synced = list(executor.map(sync, github_repos))
+        return [repo for repo, ok in zip(github_repos, synced) if ok]
+
+    def _try_sync_issues(self, mirror: im.IssueMirror, github_repo: str) -> bool:
+        with prof.repo_scope(github_repo):
+            try:
+                self._sync_issues(mirror, github_repo)
+            except (
+                github3.exceptions.GitHubError,
+                requests.RequestException,
+                sqlite3.Error,
+            ):
+                return False
+        return True
+
+    def _sync_issues(self, mirror: im.IssueMirror, github_repo: str) -> None:
+        """List issues of repo updated since last sync into the mirror.
+
+        Issues are listed oldest update first and each page is saved with
+        the update time reached, so an interrupted sync resumes where it
+        stopped. The first sync lists open issues only, the next ones all
+        issues updated since, to see them closed. A sync without changes is
+        answered with 304 Not Modified, which does not count against the rate
+        limit.
+
+        Args:
+            mirror: issue mirror.
+            github_repo: repository name.
+
+        Raises:
+            GitHubError: on unexpected response.
+        """
+        account = self._identity_key()
+        session = self.connection.session
+        owner, _, name = github_repo.partition("/")
+        sync = mirror.get_sync(account, github_repo)
+        query = {
+            "state": "all" if sync.since else "open",
+            "sort": "updated",
+            "direction": "asc",
+            "per_page": str(ISSUE_PAGE_SIZE),
+        }
+        if sync.since:
+            query["since"] = sync.since
+        url = session.build_url("repos", owner, name, "issues")
+        url = f"{url}?{urllib.parse.urlencode(query)}"
+        headers = {}
+        if url == sync.url and sync.etag:
+            headers["If-None-Match"] = sync.etag
+        first_page = True
+        while url:
+            response = session.get(url, headers=headers)
+            if response.status_code == 304:
+                return
+            if response.status_code != 200:
+                raise github3.exceptions.error_for(response)
+            issues = response.json()
+            since = max([sync.since] + [issue["updated_at"] for issue in issues])
+            if first_page:
+                sync = im.SyncState(since, url, response.headers.get("ETag", ""))
+            else:
+                sync = im.SyncState(since, sync.url, sync.etag)
+            mirror.save_page(account, github_repo, issues, sync)
+            url = response.links.get("next", {}).get("url")
+            headers = {}
+            first_page = False
+
+    def _list_issues_from_repos(
+        self,
+        github_repos: List[str],
+        request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
+    ) -> Dict[str, List[i.Issue]]:
+        mirrored = self._list_mirrored_issues(github_repos, request)
+        if mirrored is not None:
+            return mirrored
+        if self.graphql is None:
+            return self.search_issues_from_repos(github_repos, request)
+        if not isinstance(request, il.IssueListValidRequest):
+            return {}
+        try:
+            return self.graphql.list_issues(github_repos, request.filters or {})
+        except (ghg.GraphqlError, github3.exceptions.GitHubError):
+            return {}
+
+    def search_issues_from_repos(
+        self,
+        github_repos: List[str],
+        request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
+    ) -> Dict[str, List[i.Issue]]:
+        """Return issues from many repositories using the search API.
+
+        One paginated search covers as many repos as fit in the query. Repos
+        are missing from the result when the filters cannot be expressed in
+        search syntax or their search failed or was truncated, so callers
+        should fall back to `list_issues_from_repo` for them.
+
+        Args:
+            github_repos: repository names.
+            request: list request.
+
+        Returns:
+            Dict[str, List[i.Issue]]: matching issues by repository name.
+        """
+        if not isinstance(request, il.IssueListValidRequest) or not request.filters:
+            return {}
+        qualifiers = self._search_qualifiers(request.filters)
+        if qualifiers is None:
+            return {}
+        title_query = request.filters.get("title__contains")
+
+        found: Dict[str, List[i.Issue]] = {}
+        for chunk in self._chunk_search_repos(qualifiers, github_repos):
+            query = " ".join(qualifiers + [f"repo:{repo}" for repo in chunk])
+            chunk_issues = self._search_issues(query, chunk)
+            if chunk_issues is None:
+                continue
+            for repo, issues in chunk_issues.items():
+                # search matches words, keep list API substring semantics
+                found[repo] = [
+                    self._to_domain_issue(issue)
+                    for issue in issues
+                    if not title_query or title_query in issue.title
+                ]
+        return found
+
+    @staticmethod
+    def _search_qualifiers(filters: Dict[str, str]) -> Optional[List[str]]:
+        """Translate list filters to search qualifiers, None if not possible."""
+        qualifiers = []
+        obj = filters.get("obj__eq")
+        if obj == "issue":
+            qualifiers.append("is:issue")
+        elif obj == "pull request":
+            qualifiers.append("is:pr")
+        state = filters.get("state__eq")
+        if state in ("open", "closed"):
+            qualifiers.append(f"is:{state}")
+        elif state not in (None, "all"):
+            return None
+        # no title qualifier, search matches whole words and list API substrings
+        return qualifiers
+
+    @staticmethod
+    def _chunk_search_repos(
+        qualifiers: List[str], github_repos: List[str]
+    ) -> List[List[str]]:
+        """Split repos so each search query fits GitHub maximum length."""
+        base_length = len(" ".join(qualifiers))
+        chunks: List[List[str]] = []
+        length = SEARCH_QUERY_MAX_LENGTH
+        for repo in github_repos:
+            qualifier_length = len(f" repo:{repo}")
+            if base_length + qualifier_length > SEARCH_QUERY_MAX_LENGTH:
+                continue  # repo name too long to be searched
+            if length + qualifier_length > SEARCH_QUERY_MAX_LENGTH:
+                chunks.append([])
+                length = base_length
+            chunks[-1].append(repo)
+            length += qualifier_length
+        return chunks
+
+    def _search_issues(
+        self, query: str, github_repos: List[str]
+    ) -> Optional[Dict[str, List[github3.issues.ShortIssue]]]:
+        """Search issues grouped by repo, None when failed or incomplete.
+
+        GitHub reports incomplete results on pages of searches that timed out.
+        """
+        repos_by_lower_name = {repo.lower(): repo for repo in github_repos}
+        found: Dict[str, List[github3.issues.ShortIssue]] = {
+            repo: [] for repo in github_repos
+        }
+        results = self.connection.search_issues(query, per_page=100)
+        count = 0
+        # page response checked last, the iterator sets it before its results
+        checked = None
+        try:
+            for result in results:
+                if results.last_response is not checked:
+                    checked = results.last_response
+                    if self._is_incomplete(checked):
+                        return None
+                # html_url path is /owner/name/issues/number or /pull/number
+                path = urllib.parse.urlparse(result.issue.html_url).path
+                repo_name = "/".join(path.split("/")[1:3]).lower()
+                if repo_name in repos_by_lower_name:
+                    found[repos_by_lower_name[repo_name]].append(result.issue)
+                count += 1
+        except github3.exceptions.GitHubError:
+            return None
+        if results.total_count > count or count >= SEARCH_MAX_RESULTS:
+            return None
+        if results.last_response is not checked and self._is_incomplete(
+            results.last_response
+        ):
+            return None
+        return found
+
+    @staticmethod
+    def _is_incomplete(response: Optional[requests.Response]) -> bool:
+        """Return if search response reports it timed out before the end."""
+        return response is not None and bool(response.json().get("incomplete_results"))
 
     def close_issues_from_repo(
         self, github_repo: str, domain_issues: List[i.Issue]
-    ) -> str:
-        """Close issues from one repository."""
-        connection = self._get_connection()
-        repo_suffix = github_repo.split("/")[1]
+    ) -> rr.Output:
+        """Close issues from one repository.
+
+        Issues are closed by number with one request each, skipping the ones
+        listed as closed.
+
+        Args:
+            github_repo: repository name.
+            domain_issues: issues to close.
 
+        Raises:
+            AttributeError: on GitHub error.
+
+        Returns:
+            rr.Output: output.
+        """
         if not domain_issues:
-            return f"{github_repo}: no issues match.\n"
+            return rr.Output(rr.SKIPPED, f"{github_repo}: no issues match.\n")
 
+        session = self.connection.session
+        owner, _, name = github_repo.partition("/")
         for domain_issue in domain_issues:
-            issue = connection.issue(
-                self.get_username(), repo_suffix, domain_issue.number
+            if domain_issue.state == "closed":
+                continue
+            url = session.build_url(
+                "repos", owner, name, "issues", str(domain_issue.number)
             )
-            if not issue.is_closed():
-                issue.close()
-        return f"{github_repo}: close issues successful.\n"
+            response = session.patch(url, json={"state": "closed"})
+            if response.status_code != 200:
+                github_error = github3.exceptions.error_for(response)
+                raise AttributeError(f"{github_repo}: {github_error.msg}\n")
+        return rr.Output(rr.SUCCESS, f"{github_repo}: close issues successful.\n")
+
+    def close_issues_from_repos(
+        self, issues_by_repo: Dict[str, List[i.Issue]]
+    ) -> Dict[str, rr.Output]:
+        """Close issues of many repositories with batched GraphQL mutations.
+
+        Only repos whose issues were all read with GraphQL are closed here,
+        the others are missing from the result and should be closed with
+        `close_issues_from_repo`.
+
+        Args:
+            issues_by_repo: issues to close by repository name.
+
+        Returns:
+            Dict[str, rr.Output]: output by repository name.
+        """
+        if self.mutator is None:
+            return {}
+        open_issues_by_repo = {
+            github_repo: [issue for issue in issues if issue.state != "closed"]
+            for github_repo, issues in issues_by_repo.items()
+            if issues and all(issue.node_id for issue in issues)
+        }
+        operations = [
+            ("closeIssue", {"issueId": issue.node_id})
+            for issues in open_issues_by_repo.values()
+            for issue in issues
+        ]
+        errors = iter(self.mutator.run(operations))
+        outputs = {}
+        for github_repo, issues in open_issues_by_repo.items():
+            output = ""
+            for issue in issues:
+                error = next(errors)
+                if error:
+                    output += f"{github_repo}: close issue #{issue.number} failed."
+                    output += f" {error}\n"
+            if output:
+                outputs[github_repo] = rr.Output(rr.ERROR, output)
+            else:
+                outputs[github_repo] = rr.Output(
+                    rr.SUCCESS, f"{github_repo}: close issues successful.\n"
+                )
+        return outputs
 
     # def reopen_issues_from_repo(self, github_repo: str, number: int):
     #     """Reopen issue from one repository."""
@@ -163,7 +847,7 @@ class GithubService:
 
     def create_pull_request_from_repo(
         self, github_repo: str, pr: pr.PullRequest
-    ) -> str:
+    ) -> rr.Output:
         """Create pull request from one repository."""
         repo = self._get_repo(github_repo)
         try:
@@ -179,7 +863,7 @@ class GithubService:
             if pr.labels:
                 issue = created_pr.issue()
                 issue.add_labels(*pr.labels)
-            return f"{github_repo}: create PR successful.\n"
+            return rr.Output(rr.SUCCESS, f"{github_repo}: create PR successful.\n")
         except github3.exceptions.UnprocessableEntity as github_exception:
             extra = ""
             for error in github_exception.errors:
@@ -187,9 +871,13 @@ class GithubService:
                     extra += f" {error['message']}."
                 else:
                     extra += f" Invalid field {error['field']}."
-            return f"{github_repo}: {github_exception.msg}.{extra}\n"
+            return rr.Output(
+                rr.ERROR, f"{github_repo}: {github_exception.msg}.{extra}\n"
+            )
         except github3.exceptions.GitHubError as github_error:
-            raise AttributeError(f"{github_repo}: {github_error.msg}\n")
+            raise AttributeError(
+                f"{github_repo}: {github_error.msg}\n"
+            ) from github_error
 
     @staticmethod
     def link_issues(
@@ -208,42 +896,148 @@ class GithubService:
         pr.labels = labels
         return pr
 
-    def delete_branch_from_repo(self, github_repo: str, branch: str) -> str:
+    def delete_branch_from_repo(self, github_repo: str, branch: str) -> rr.Output:
         """Delete a branch from one repository."""
         repo = self._get_repo(github_repo)
         try:
             branch_ref = repo.ref(f"heads/{branch}")
             branch_ref.delete()
-            return f"{github_repo}: delete branch successful.\n"
+            return rr.Output(rr.SUCCESS, f"{github_repo}: delete branch successful.\n")
         except github3.exceptions.NotFoundError as github_exception:
-            return f"{github_repo}: {github_exception.msg}.\n"
+            return rr.Output(rr.ERROR, f"{github_repo}: {github_exception.msg}.\n")
         except github3.exceptions.GitHubError as github_error:
-            raise AttributeError(f"{github_repo}: {github_error.msg}\n")
+            raise AttributeError(
+                f"{github_repo}: {github_error.msg}\n"
+            ) from github_error
+
+    def prefetch_pull_requests(
+        self, github_repos: List[str], pr_merge: prm.PullRequestMerge
+    ) -> None:
+        """Find PRs to merge of many repos at once when using GraphQL backend.
+
+        Repos not prefetched, eg. on failure, are looked up one by one later.
+        """
+        if self.graphql is None:
+            return
+        numbers = self._find_prefetched_pull_requests(pr_merge)
+        missing = [repo for repo in github_repos if repo not in numbers]
+        if missing:
+            try:
+                numbers.update(
+                    self.graphql.find_pull_requests(
+                        missing, pr_merge.base, pr_merge.head, pr_merge.prefix
+                    )
+                )
+            except (ghg.GraphqlError, github3.exceptions.GitHubError):
+                pass
+        for github_repo, repo_numbers in numbers.items():
+            self.pull_numbers[self._pull_key(github_repo, pr_merge)] = repo_numbers
+
+    def _find_prefetched_pull_requests(
+        self, pr_merge: prm.PullRequestMerge
+    ) -> Dict[str, List[Tuple[int, str]]]:
+        """Return numbers and node ids of prefetched PRs to merge by repo."""
+        pulls = self.prefetcher.get("pulls") or {}
+        return {
+            github_repo: [
+                (number, node_id)
+                for number, node_id, base, head, owner in repo_pulls
+                if base == pr_merge.base
+                and head == pr_merge.head
+                and owner.lower() == pr_merge.prefix.lower()
+            ]
+            for github_repo, repo_pulls in pulls.items()
+        }
+
+    @staticmethod
+    def _pull_key(
+        github_repo: str, pr_merge: prm.PullRequestMerge
+    ) -> Tuple[str, str, str]:
+        return (github_repo, pr_merge.base, f"{pr_merge.prefix}:{pr_merge.head}")
+
+    def merge_pull_requests_from_repos(
+        self, github_repos: List[str], pr_merge: prm.PullRequestMerge
+    ) -> Dict[str, rr.Output]:
+        """Merge prefetched pull requests with batched GraphQL mutations.
+
+        Only repos with exactly one prefetched PR are merged here, the others
+        are missing from the result and should be merged with
+        `merge_pull_request_from_repo`.
+
+        Args:
+            github_repos: repository names.
+            pr_merge: merge parameters.
+
+        Returns:
+            Dict[str, rr.Output]: output by repository name.
+        """
+        if self.mutator is None:
+            return {}
+        pulls = {}
+        for github_repo in github_repos:
+            repo_pulls = self.pull_numbers.get(self._pull_key(github_repo, pr_merge))
+            if repo_pulls is not None and len(repo_pulls) == 1:
+                pulls[github_repo] = repo_pulls[0]
+        errors = self.mutator.run(
+            [
+                ("mergePullRequest", {"pullRequestId": node_id})
+                for _, node_id in pulls.values()
+            ]
+        )
+        outputs = {}
+        for (github_repo, (number, _)), error in zip(pulls.items(), errors):
+            if error:
+                outputs[github_repo] = rr.Output(
+                    rr.ERROR, f"{github_repo}: merge PR #{number} failed. {error}\n"
+                )
+            else:
+                outputs[github_repo] = rr.Output(
+                    rr.SUCCESS, f"{github_repo}: merge PR successful.\n"
+                )
+        return outputs
+
+    def _merge_pull_request(self, github_repo: str, number: int) -> None:
+        """Merge pull request by number without reading it first."""
+        session = self.connection.session
+        owner, _, name = github_repo.partition("/")
+        url = session.build_url("repos", owner, name, "pulls", str(number), "merge")
+        response = session.put(url, json={})
+        if response.status_code != 200:
+            raise github3.exceptions.error_for(response)
 
     def merge_pull_request_from_repo(
         self, github_repo: str, pr_merge: prm.PullRequestMerge
-    ) -> str:
+    ) -> rr.Output:
         """Merge pull request from one repository."""
-        repo = self._get_repo(github_repo)
-
         # Important note: base and head arguments have different import formats.
         # https://developer.github.com/v3/pulls/#list-pull-requests
         # head needs format "user/org:branch"
         head = f"{pr_merge.prefix}:{pr_merge.head}"
-        pulls = list(repo.pull_requests(base=pr_merge.base, head=head))
+        key = self._pull_key(github_repo, pr_merge)
+        prefetched = key in self.pull_numbers
+        # PR numbers and node ids when prefetched, PR objects otherwise
+        pulls: List[Any] = []
+        if prefetched:
+            pulls.extend(self.pull_numbers[key])
+        else:
+            repo = self._get_repo(github_repo)
+            pulls = list(repo.pull_requests(base=pr_merge.base, head=head))
         if not pulls:
-            return (
+            return rr.Output(
+                rr.SKIPPED,
                 f"{github_repo}: no open PR found for "
-                f"{pr_merge.base}:{pr_merge.head}.\n"
+                f"{pr_merge.base}:{pr_merge.head}.\n",
             )
         elif len(pulls) == 1:
             pull = pulls[0]
-            output = ""
-            pull.merge()
-            output += f"{github_repo}: merge PR successful.\n"
-            return output
+            if prefetched:
+                self._merge_pull_request(github_repo, pull[0])
+            else:
+                pull.merge()
+            return rr.Output(rr.SUCCESS, f"{github_repo}: merge PR successful.\n")
         else:
-            return (
+            return rr.Output(
+                rr.ERROR,
                 f"{github_repo}: unexpected number of PRs for "
-                f"{pr_merge.base}:{pr_merge.head}.\n"
+                f"{pr_merge.base}:{pr_merge.head}.\n",
             )
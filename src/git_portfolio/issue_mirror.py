@@ -0,0 +1,163 @@
+"""Issue mirror module."""
+import contextlib
+import json
+import os
+import pathlib
+import sqlite3
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+import git_portfolio.domain.issue as i
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    account TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    node_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    state TEXT NOT NULL,
+    pull_request INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (account, repo, number)
+);
+CREATE TABLE IF NOT EXISTS syncs (
+    account TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    since TEXT NOT NULL,
+    url TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    PRIMARY KEY (account, repo)
+);
+"""
+# seconds waited for other threads or processes writing
+LOCK_TIMEOUT = 30.0
+
+
+@dataclass
+class SyncState:
+    """Progress of the syncs of one repository."""
+
+    # last update time stored, empty before the first sync
+    since: str = ""
+    # first page of the last sync and its ETag, to revalidate it
+    url: str = ""
+    etag: str = ""
+
+
+class IssueMirror:
+    """SQLite database of issues and pull requests of repositories.
+
+    Rows are kept by account, so tokens seeing different repos never share
+    them. Each repo has a watermark, the last update time stored, from which
+    the next sync lists changes. Connections are opened per call, so many
+    threads can sync repos at once.
+    """
+
+    def __init__(self, cache_folder: str, cache_filename: str) -> None:
+        """Constructor."""
+        self.path = os.path.join(cache_folder, cache_filename)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open database in a transaction, committed unless an error is raised."""
+        pathlib.Path(os.path.dirname(self.path)).mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+        try:
+            # readers do not wait for writers
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_sync(self, account: str, repo: str) -> SyncState:
+        """Get sync progress of repo, empty if never synced."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT since, url, etag FROM syncs WHERE account = ? AND repo = ?",
+                (account, repo),
+            ).fetchone()
+        return SyncState(*row) if row else SyncState()
+
+    def save_page(
+        self,
+        account: str,
+        repo: str,
+        issues: List[Dict[str, Any]],
+        sync: SyncState,
+    ) -> None:
+        """Save page of issues listed by REST API and sync progress at once.
+
+        An interrupted sync resumes from the last page saved.
+
+        Args:
+            account: fingerprint of host and token.
+            repo: repository name.
+            issues: issues and pull requests as returned by GitHub.
+            sync: sync progress including this page.
+        """
+        rows = [
+            (
+                account,
+                repo,
+                issue["number"],
+                issue.get("node_id") or "",
+                issue["title"],
+                issue.get("body") or "",
+                json.dumps(sorted(label["name"] for label in issue["labels"])),
+                issue["state"],
+                "pull_request" in issue,
+                issue["updated_at"],
+            )
+            for issue in issues
+        ]
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO syncs VALUES (?, ?, ?, ?, ?)",
+                (account, repo, sync.since, sync.url, sync.etag),
+            )
+
+    def list_open(self, account: str, repo: str, obj: Optional[str]) -> List[i.Issue]:
+        """List open issues, pull requests or both of repo, newest first.
+
+        Args:
+            account: fingerprint of host and token.
+            repo: repository name.
+            obj: "issue", "pull request" or None for both.
+
+        Returns:
+            List[i.Issue]: open objects as of last sync.
+        """
+        # pull_request column values matching obj
+        kinds = {"issue": (False,), "pull request": (True,)}.get(
+            obj or "", (False, True)
+        )
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT number, title, body, labels, node_id, state FROM issues "
+                "WHERE account = ? AND repo = ? AND state = 'open' "
+                "AND pull_request IN (?, ?) ORDER BY number DESC",
+                (account, repo, kinds[0], kinds[-1]),
+            )
+            return [
+                i.Issue(number, title, body, set(json.loads(labels)), node_id, state)
+                for number, title, body, labels, node_id, state in rows
+            ]
+
+    def clear(self) -> None:
+        """Remove database files."""
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
@@ -0,0 +1,81 @@
+"""Local cache module."""
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+
+def fingerprint(*parts: str) -> str:
+    """Return a short digest to use secrets as cache keys without storing them."""
+    digest = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+def write_atomic(path: str, text: str) -> None:
+    """Write file using a temporary file and rename.
+
+    Readers either see the previous content or the new one, never a truncated
+    file.
+
+    Args:
+        path: destination file path.
+        text: file content.
+    """
+    folder = os.path.dirname(path)
+    pathlib.Path(folder).mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as tmp_file:
+            tmp_file.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class LocalCache:
+    """JSON file with keyed entries that expire after a TTL."""
+
+    def __init__(self, cache_folder: str, cache_filename: str, ttl: float) -> None:
+        """Constructor."""
+        self.cache_path = os.path.join(cache_folder, cache_filename)
+        self.ttl = ttl
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path) as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get entry for key, even if expired."""
+        entry = self._load().get(key)
+        return entry if isinstance(entry, dict) else None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check if entry was saved less than TTL seconds ago."""
+        return bool(time.time() - entry.get("saved_at", 0) < self.ttl)
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Save entry for key."""
+        data = self._load()
+        data[key] = dict(entry, saved_at=time.time())
+        write_atomic(self.cache_path, json.dumps(data))
+
+    def delete(self, key: str) -> None:
+        """Remove entry for key, if any."""
+        data = self._load()
+        if data.pop(key, None) is not None:
+            write_atomic(self.cache_path, json.dumps(data))
+
+    def clear(self) -> None:
+        """Remove cache file."""
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
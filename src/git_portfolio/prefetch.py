@@ -0,0 +1,69 @@
+"""Prefetch module."""
+import threading
+from concurrent import futures
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+
+
+class Prefetcher:
+    """Run speculative reads in background, eg. while the user answers prompts.
+
+    Each key is fetched once, later requests share its future. Threads are
+    daemons, so a process never waits for prefetches it no longer needs.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.futures: Dict[Hashable, "futures.Future[Any]"] = {}
+        self.lock = threading.Lock()
+
+    def submit(
+        self, key: Hashable, fn: Callable[..., Any], *args: Any
+    ) -> "futures.Future[Any]":
+        """Start fetching key with `fn(*args)`, unless it is already fetched."""
+        with self.lock:
+            if key in self.futures:
+                return self.futures[key]
+            future: "futures.Future[Any]" = futures.Future()
+            self.futures[key] = future
+        thread = threading.Thread(
+            target=self._run, args=(future, fn, args), name="gitp-prefetch", daemon=True
+        )
+        thread.start()
+        return future
+
+    @staticmethod
+    def _run(future: "futures.Future[Any]", fn: Callable[..., Any], args: Any) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def get(self, key: Hashable) -> Any:
+        """Wait for result of key.
+
+        Returns:
+            Any: result, None if key was not prefetched, was cancelled or
+                failed. Callers then fetch it themselves.
+        """
+        with self.lock:
+            future = self.futures.get(key)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def cancel(self) -> None:
+        """Drop all prefetches, results of those still running are ignored."""
+        with self.lock:
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
@@ -0,0 +1,334 @@
+"""Profiling module."""
+import collections
+import contextlib
+import re
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+ENV_VAR = "GITP_PROFILE"
+# rows of each ranking in summary
+TOP = 10
+# path segments replaced by placeholders, so calls group by endpoint
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"/git/refs?/heads/.+$"), "/git/ref/heads/{branch}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{number}"),
+]
+
+_profiler: Optional["Profiler"] = None
+_context = threading.local()
+
+
+@dataclass
+class HttpCall:
+    """HTTP request sent to GitHub."""
+
+    method: str
+    endpoint: str
+    status: int
+    size: int
+    start: float
+    duration: float
+    # answered from cache, eg. 304 Not Modified
+    cached: bool
+    repo: str
+    thread: int
+    resource: str = ""
+    # rate limit budget left after the request, -1 if not reported
+    remaining: int = -1
+
+
+@dataclass
+class GitCall:
+    """Git subprocess."""
+
+    repo: str
+    argv: List[str]
+    returncode: int
+    start: float
+    duration: float
+    thread: int
+
+
+@dataclass
+class RepoSpan:
+    """Work done on one repository of a batch."""
+
+    repo: str
+    action: str
+    start: float
+    duration: float
+    thread: int
+
+
+@dataclass
+class Span:
+    """Other timed work, eg. a command, a use case or a rate limit wait."""
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+def endpoint(url: str) -> str:
+    """Return endpoint template of url, eg. /repos/{owner}/{repo}/issues."""
+    path = urllib.parse.urlsplit(url).path
+    # GitHub Enterprise prefix
+    if path.startswith("/api/v3/"):
+        path = path[len("/api/v3") :]
+    elif path.startswith("/api/"):
+        path = path[len("/api") :]
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class Profiler:
+    """Record HTTP requests, git subprocesses and repos of one command.
+
+    Calls are recorded from many threads, each attributed to the repo its
+    thread is working on, if any. Names of recording threads are kept for
+    traces.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """Constructor."""
+        self.clock = clock
+        self.started = clock()
+        self.lock = threading.Lock()
+        self.http_calls: List[HttpCall] = []
+        self.git_calls: List[GitCall] = []
+        self.repo_spans: List[RepoSpan] = []
+        self.spans: List[Span] = []
+        self.threads: Dict[int, str] = {}
+
+    def add(self, record: Any) -> None:
+        """Add a HttpCall, GitCall, RepoSpan or Span of the current thread."""
+        thread = threading.current_thread()
+        with self.lock:
+            self.threads[record.thread] = thread.name
+            if isinstance(record, HttpCall):
+                self.http_calls.append(record)
+            elif isinstance(record, GitCall):
+                self.git_calls.append(record)
+            elif isinstance(record, RepoSpan):
+                self.repo_spans.append(record)
+            else:
+                self.spans.append(record)
+
+    def summary(self) -> str:
+        """Return report of calls recorded so far."""
+        with self.lock:
+            http_calls = list(self.http_calls)
+            git_calls = list(self.git_calls)
+            repo_spans = list(self.repo_spans)
+        elapsed = self.clock() - self.started
+        lines = [
+            f"Profile: {len(http_calls)} HTTP requests, {len(git_calls)} git "
+            f"commands in {elapsed:.2f}s."
+        ]
+        if http_calls:
+            lines.append("HTTP requests by endpoint:")
+            lines.extend(_endpoint_lines(http_calls))
+        by_repo = _calls_by_repo(http_calls, git_calls)
+        if by_repo:
+            calls = sum(counts[0] + counts[1] for counts in by_repo.values())
+            lines.append(
+                f"Calls per repo: {calls / len(by_repo):.1f} on average "
+                f"over {len(by_repo)} repos, most:"
+            )
+            ranked = sorted(by_repo.items(), key=lambda item: (-sum(item[1]), item[0]))
+            lines.extend(
+                f"  {repo}: {http} HTTP, {git} git"
+                for repo, (http, git) in ranked[:TOP]
+            )
+        if repo_spans:
+            lines.append("Slowest repos:")
+            slowest = sorted(repo_spans, key=lambda span: -span.duration)[:TOP]
+            lines.extend(
+                f"  {span.repo}: {span.duration:.2f}s ({span.action})"
+                for span in slowest
+            )
+        consumed = _budget_consumed(http_calls)
+        if consumed:
+            lines.append(
+                "Rate limit budget consumed: "
+                + ", ".join(f"{name} {used}" for name, used in sorted(consumed.items()))
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _endpoint_lines(http_calls: List[HttpCall]) -> Iterator[str]:
+    """Yield calls, time, size and cache hits by endpoint, slowest first."""
+    groups: Dict[Tuple[str, str], List[HttpCall]] = collections.defaultdict(list)
+    for call in http_calls:
+        groups[(call.method, call.endpoint)].append(call)
+    for (method, path), calls in sorted(
+        groups.items(), key=lambda item: -sum(call.duration for call in item[1])
+    ):
+        duration = sum(call.duration for call in calls)
+        size = sum(call.size for call in calls)
+        cached = sum(call.cached for call in calls)
+        statuses = collections.Counter(call.status for call in calls)
+        status_text = ", ".join(
+            f"{status} x{count}" for status, count in sorted(statuses.items())
+        )
+        yield (
+            f"  {method} {path}: {len(calls)} calls, {duration:.2f}s, "
+            f"{size / 1024:.1f} KiB, {cached} cached ({status_text})"
+        )
+
+
+def _calls_by_repo(
+    http_calls: List[HttpCall], git_calls: List[GitCall]
+) -> Dict[str, Tuple[int, int]]:
+    """Return HTTP and git calls by repo, batches of many repos left out."""
+    http = collections.Counter(call.repo for call in http_calls if call.repo)
+    git = collections.Counter(call.repo for call in git_calls if call.repo)
+    return {repo: (http[repo], git[repo]) for repo in set(http) | set(git)}
+
+
+def _budget_consumed(http_calls: List[HttpCall]) -> Dict[str, int]:
+    """Return budget used by resource, from remaining budget of responses.
+
+    The cost of the first request is unknown, it is counted as one.
+    """
+    remaining: Dict[str, List[int]] = collections.defaultdict(list)
+    for call in sorted(http_calls, key=lambda call: call.start + call.duration):
+        if call.remaining >= 0:
+            remaining[call.resource].append(call.remaining)
+    return {
+        resource: max(values[0] - values[-1], 0) + 1
+        for resource, values in remaining.items()
+    }
+
+
+def start() -> Profiler:
+    """Start recording calls of all threads in a new profiler."""
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def stop() -> Optional[Profiler]:
+    """Stop recording calls, return the profiler if one was started."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def current_repo() -> str:
+    """Return repo the current thread works on, empty if none."""
+    repo: str = getattr(_context, "repo", "")
+    return repo
+
+
+@contextlib.contextmanager
+def repo_scope(repo: str) -> Iterator[None]:
+    """Attribute calls of the current thread to repo while in scope."""
+    previous = current_repo()
+    _context.repo = repo
+    try:
+        yield
+    finally:
+        _context.repo = previous
+
+
+def record_repo(repo: str, action: str, start: float, duration: float) -> None:
+    """Record work on repo started at `start`, by time.monotonic."""
+    profiler = _profiler
+    if profiler is not None:
+        profiler.add(RepoSpan(repo, action, start, duration, threading.get_ident()))
+
+
+def record_span(
+    name: str, category: str, start: float, duration: float, **args: Any
+) -> None:
+    """Record work started at `start`, by time.monotonic."""
+    profiler = _profiler
+    if profiler is not None:
+        profiler.add(Span(name, category, start, duration, threading.get_ident(), args))
+
+
+@contextlib.contextmanager
+def span(name: str, category: str, **args: Any) -> Iterator[None]:
+    """Record work done in scope."""
+    start_time = time.monotonic()
+    try:
+        yield
+    finally:
+        record_span(name, category, start_time, time.monotonic() - start_time, **args)
+
+
+def record_git(repo: str, argv: List[str], returncode: int, duration: float) -> None:
+    """Record git subprocess that just ended."""
+    profiler = _profiler
+    if profiler is not None:
+        profiler.add(
+            GitCall(
+                repo,
+                argv,
+                returncode,
+                time.monotonic() - duration,
+                duration,
+                threading.get_ident(),
+            )
+        )
+
+
+def install(session: Any) -> None:
+    """Record requests of session while a profiler is started."""
+    send = session.request
+
+    def request(method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        profiler = _profiler
+        if profiler is None:
+            return send(method, url, *args, **kwargs)
+        start_time = time.monotonic()
+        response = send(method, url, *args, **kwargs)
+        duration = time.monotonic() - start_time
+        headers = response.headers
+        try:
+            remaining = int(headers.get("X-RateLimit-Remaining", -1))
+        except ValueError:
+            remaining = -1
+        profiler.add(
+            HttpCall(
+                method.upper(),
+                endpoint(url),
+                response.status_code,
+                len(response.content or b""),
+                start_time,
+                duration,
+                response.status_code == 304,
+                current_repo(),
+                threading.get_ident(),
+                headers.get("X-RateLimit-Resource", _resource(url)),
+                remaining,
+            )
+        )
+        return response
+
+    session.request = request
+
+
+def _resource(url: str) -> str:
+    # same as rl.resource_for, without importing github3 with it
+    if url.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in url:
+        return "search"
+    return "core"
@@ -0,0 +1,243 @@
+"""Rate limit module."""
+import functools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+import github3
+
+import git_portfolio.profiling as prof
+
+# https://docs.github.com/en/rest/overview/rate-limits-for-the-rest-api
+# secondary limits allow 900 points per minute, a read costs one point
+READ_RATE = 15.0
+READ_BURST = 15
+# and no more than 80 content-generating requests per minute
+WRITE_RATE = 80 / 60
+WRITE_BURST = 5
+# without Retry-After, secondary limits ask to wait at least one minute
+SECONDARY_LIMIT_WAIT = 60.0
+# longer waits fail the request instead of blocking the command
+MAX_WAIT = 5 * 60.0
+MAX_WAITS = 3
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+# shorter waits are left out of traces
+MIN_RECORDED_WAIT = 0.001
+
+
+@dataclass
+class Budget:
+    """Requests left on a rate limit resource."""
+
+    limit: int
+    remaining: int
+    # epoch seconds of the next window
+    reset: float
+
+
+class TokenBucket:
+    """Allow `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Constructor."""
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting for it if needed.
+
+        Tokens are reserved under the lock and waited for outside it, so
+        concurrent callers queue in order without blocking each other.
+        """
+        with self.lock:
+            now = self.clock()
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+
+
+def is_read(method: str, kwargs: Dict[str, Any]) -> bool:
+    """Check if request only reads, GraphQL queries included."""
+    if method.upper() in READ_METHODS:
+        return True
+    body = kwargs.get("json")
+    if isinstance(body, dict) and isinstance(body.get("query"), str):
+        return not body["query"].lstrip().startswith("mutation")
+    return False
+
+
+def resource_for(url: str) -> str:
+    """Return rate limit resource name of url."""
+    if url.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in url:
+        return "search"
+    return "core"
+
+
+class RateLimitScheduler:
+    """Pace requests of a session and wait when rate limited.
+
+    Reads and writes have their own token bucket, writes being paced more
+    conservatively. Budgets are tracked from `X-RateLimit-*` headers of every
+    response. When the budget of a resource is exhausted, requests wait for
+    its reset, and rate limited responses are retried after `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Constructor."""
+        self.clock = clock
+        self.sleep = sleep
+        self.wall_clock = wall_clock
+        self.reads = TokenBucket(READ_RATE, READ_BURST, clock, sleep)
+        self.writes = TokenBucket(WRITE_RATE, WRITE_BURST, clock, sleep)
+        self.budgets: Dict[str, Budget] = {}
+        self.lock = threading.Lock()
+        # requests sent by each thread, eg. for one repository of a batch
+        self.sent = threading.local()
+
+    def install(self, session: github3.session.GitHubSession) -> None:
+        """Route all requests of session through the scheduler."""
+        session.request = functools.partial(self.request, session.request)
+
+    def budget(self) -> Dict[str, Budget]:
+        """Return a copy of last known budget by resource."""
+        with self.lock:
+            return {
+                resource: Budget(budget.limit, budget.remaining, budget.reset)
+                for resource, budget in self.budgets.items()
+            }
+
+    def set_budgets(self, resources: Dict[str, Dict[str, Any]]) -> None:
+        """Set budgets from resources of the rate limit endpoint.
+
+        Args:
+            resources: limit, remaining and reset by resource name.
+        """
+        with self.lock:
+            for name, resource in resources.items():
+                self.budgets[name] = Budget(
+                    int(resource["limit"]),
+                    int(resource["remaining"]),
+                    float(resource["reset"]),
+                )
+
+    def sent_by_thread(self) -> int:
+        """Return number of requests sent by the current thread."""
+        count: int = getattr(self.sent, "count", 0)
+        return count
+
+    def request(
+        self,
+        send: Callable[..., Any],
+        method: str,
+        url: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Send request when allowed, retrying when rate limited.
+
+        Args:
+            send: original request function.
+            method: HTTP method.
+            url: request url.
+            *args: positional arguments of `send`.
+            **kwargs: keyword arguments of `send`.
+
+        Returns:
+            Any: last response.
+        """
+        resource = resource_for(url)
+        bucket = self.reads if is_read(method, kwargs) else self.writes
+        waits = 0
+        while True:
+            queued = self.clock()
+            self._wait_for_reset(resource)
+            bucket.acquire()
+            self._record_wait(resource, queued)
+            response = send(method, url, *args, **kwargs)
+            self.sent.count = self.sent_by_thread() + 1
+            self._update(resource, response)
+            wait = self._retry_wait(response)
+            if wait is None or wait > MAX_WAIT or waits >= MAX_WAITS:
+                return response
+            waits += 1
+            queued = self.clock()
+            self.sleep(wait)
+            self._record_wait(resource, queued, status=response.status_code)
+
+    def _record_wait(self, resource: str, start: float, **args: Any) -> None:
+        """Record wait for traces, if long enough to matter."""
+        waited = self.clock() - start
+        if waited >= MIN_RECORDED_WAIT:
+            prof.record_span(
+                "rate limit wait",
+                "rate_limit",
+                start,
+                waited,
+                resource=resource,
+                **args,
+            )
+
+    def _wait_for_reset(self, resource: str) -> None:
+        with self.lock:
+            budget = self.budgets.get(resource)
+            wait = 0.0
+            if budget is not None and budget.remaining <= 0:
+                wait = budget.reset - self.wall_clock()
+        if 0 < wait <= MAX_WAIT:
+            self.sleep(wait)
+
+    def _update(self, resource: str, response: Any) -> None:
+        headers = response.headers
+        try:
+            budget = Budget(
+                int(headers["X-RateLimit-Limit"]),
+                int(headers["X-RateLimit-Remaining"]),
+                float(headers["X-RateLimit-Reset"]),
+            )
+        except (KeyError, ValueError):
+            return
+        with self.lock:
+            self.budgets[headers.get("X-RateLimit-Resource", resource)] = budget
+
+    def _retry_wait(self, response: Any) -> Optional[float]:
+        """Return seconds to wait before retrying, None if not rate limited."""
+        if response.status_code not in (403, 429):
+            return None
+        headers = response.headers
+        if "Retry-After" in headers:
+            try:
+                return max(float(headers["Retry-After"]), 0.0)
+            except ValueError:
+                return SECONDARY_LIMIT_WAIT
+        if headers.get("X-RateLimit-Remaining") == "0":
+            reset = float(headers.get("X-RateLimit-Reset", 0))
+            return max(reset - self.wall_clock(), 0.0)
+        if "secondary rate limit" in response.text.lower():
+            return SECONDARY_LIMIT_WAIT
+        return None
@@ -2,12 +2,18 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Union
 
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.request_objects.issue_list as il
 
+# receives result of each repository in order, once it and earlier ones are done
+OutputHandler = Callable[[rr.RepoResult], None]
+
 
 class ResponseTypes:
     """Response types class."""
@@ -21,10 +27,23 @@ class ResponseTypes:
 class ResponseFailure:
     """Response failure class."""
 
-    def __init__(self, type_: str, message: Union[str, Exception, None]) -> None:
-        """Constructor."""
+    def __init__(
+        self,
+        type_: str,
+        message: Union[str, Exception, None],
+        results: Optional[List[rr.RepoResult]] = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            type_: response type.
+            message: error message or exception.
+            results: records by repository of batch commands where some repos
+                failed, not kept when they were streamed.
+        """
         self.type = type_
         self.message = self._format_message(message)
+        self.results = results
 
     def _format_message(self, msg: Union[str, Exception, None]) -> Optional[str]:
         """Format message when it is an exception.
@@ -56,10 +75,19 @@ class ResponseFailure:
 class ResponseSuccess:
     """Response success class."""
 
-    def __init__(self, value: Any = None) -> None:
-        """Constructor."""
+    def __init__(
+        self, value: Any = None, results: Optional[List[rr.RepoResult]] = None
+    ) -> None:
+        """Constructor.
+
+        Args:
+            value: text output or returned object.
+            results: records by repository of batch commands, not kept when
+                they were streamed.
+        """
         self.type = ResponseTypes.SUCCESS
         self.value = value
+        self.results = results
 
     def __bool__(self) -> bool:
         """Bool return for success."""
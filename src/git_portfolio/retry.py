@@ -0,0 +1,118 @@
+"""Retry module."""
+import functools
+import random
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+import github3
+import requests
+import urllib3
+
+import git_portfolio.defaults as dfl
+import git_portfolio.rate_limit as rl
+
+BASE_DELAY = 0.5
+MAX_DELAY = 8.0
+RETRY_STATUSES = (500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE")
+
+
+def is_not_sent(error: requests.exceptions.RequestException) -> bool:
+    """Check if request failed before a connection to the server was made.
+
+    Connections timing out or refused, eg. while GitHub restarts, never
+    carried the request.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # requests wraps urllib3 errors, with the cause of the last try as reason
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def is_idempotent(method: str, kwargs: Dict[str, Any]) -> bool:
+    """Check if sending request twice has the same effect as once.
+
+    GitHub PATCH requests set fields, so they are safe to repeat. POST
+    requests create content, except GraphQL queries.
+    """
+    return method.upper() in IDEMPOTENT_METHODS or rl.is_read(method, kwargs)
+
+
+class RetryPolicy:
+    """Retry requests of a session on transient failures.
+
+    Connection errors and 5xx gateway responses are retried with exponential
+    backoff and full jitter. Requests that are not idempotent are only
+    retried when the connection could not be established, as GitHub may
+    have processed them otherwise.
+    """
+
+    def __init__(
+        self,
+        retries: int = dfl.DEFAULT_RETRIES,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        """Constructor."""
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.jitter = jitter
+
+    def install(self, session: github3.session.GitHubSession) -> None:
+        """Route all requests of session through the policy."""
+        session.request = functools.partial(self.request, session.request)
+
+    def delay(self, retry: int) -> float:
+        """Return seconds to wait before retry number `retry`, from 0."""
+        return self.jitter() * min(self.max_delay, self.base_delay * 2.0**retry)
+
+    def request(
+        self,
+        send: Callable[..., Any],
+        method: str,
+        url: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Send request, retrying transient failures when safe.
+
+        Args:
+            send: original request function.
+            method: HTTP method.
+            url: request url.
+            *args: positional arguments of `send`.
+            **kwargs: keyword arguments of `send`.
+
+        Raises:
+            RequestException: last connection error.
+
+        Returns:
+            Any: last response.
+        """
+        idempotent = is_idempotent(method, kwargs)
+        retry = 0
+        while True:
+            last_try = retry >= self.retries
+            try:
+                response = send(method, url, *args, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as error:
+                # a request that never reached the server is safe to send again
+                if last_try or not (idempotent or is_not_sent(error)):
+                    raise
+            else:
+                if last_try or not idempotent:
+                    return response
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+            self.sleep(self.delay(retry))
+            retry += 1
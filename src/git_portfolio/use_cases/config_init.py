@@ -2,6 +2,7 @@
 from typing import Union
 
 import git_portfolio.config_manager as cm
+import git_portfolio.defaults as dfl
 import git_portfolio.domain.gh_connection_settings as gcs
 import git_portfolio.github_service as ghs
 import git_portfolio.prompt as p
@@ -21,9 +22,16 @@ class ConfigInitUseCase:
     ) -> Union[res.ResponseFailure, res.ResponseSuccess]:
         """Initialize app configuration."""
         try:
-            new_github_service = ghs.GithubService(request)
-        except AttributeError as ae:
-            return res.ResponseFailure(res.ResponseTypes.PARAMETERS_ERROR, f"{ae}")
+            new_github_service = ghs.GithubService(
+                request,
+                self.config_manager.get_cache(
+                    dfl.CATALOG_CACHE_FILENAME, dfl.CATALOG_TTL
+                ),
+            )
+        except gcs.AuthError as auth_error:
+            return res.ResponseFailure(
+                res.ResponseTypes.PARAMETERS_ERROR, f"{auth_error}"
+            )
         except ConnectionError:
             return res.ResponseFailure(
                 res.ResponseTypes.SYSTEM_ERROR,
@@ -1,39 +1,133 @@
 """Base Github use case."""
+from concurrent import futures
 from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import TypeVar
 from typing import Union
 
 import git_portfolio.config_manager as cm
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.github_service as ghs
+import git_portfolio.profiling as prof
 import git_portfolio.responses as res
+import git_portfolio.use_cases.git as git
+
+# network bound work, so it may be well above CPU count
+DEFAULT_JOBS = 8
+
+T = TypeVar("T")
+
+
+def result_detail(github_repo: str, output: str) -> str:
+    """Return output of one repo without repo name prefixes."""
+    prefix = f"{github_repo}: "
+    return "\n".join(
+        line[len(prefix) :] if line.startswith(prefix) else line
+        for line in output.splitlines()
+    )
 
 
 class GhUseCase:
     """Github use case."""
 
+    # name of action in results
+    action = ""
+
     def __init__(
-        self, config_manager: cm.ConfigManager, github_service: ghs.GithubService
+        self,
+        config_manager: cm.ConfigManager,
+        github_service: ghs.GithubService,
+        jobs: Optional[int] = None,
+        on_output: Optional[res.OutputHandler] = None,
     ) -> None:
         """Initializer."""
         self.config_manager = config_manager
         self.github_service = github_service
+        self.jobs = jobs if jobs else DEFAULT_JOBS
+        self.on_output = on_output
         self.error = False
+        self.errors: List[str] = []
+        self.results: List[rr.RepoResult] = []
 
     def call_github_service(
         self, method: str, output: str, *args: Any, **kwargs: Any
-    ) -> str:
+    ) -> rr.Output:
         """Handle error from github_service."""
         try:
             method_to_call = getattr(self.github_service, method)
-            output += method_to_call(*args, **kwargs)
+            with prof.span(method, "service", repo=prof.current_repo()):
+                result = method_to_call(*args, **kwargs)
+            return rr.Output(result.status, output + result.text)
         except AttributeError as ae:
             self.error = True
-            output += str(ae)
-        return output
+            self.errors.append(str(ae))
+            return rr.Output(rr.ERROR, output + str(ae))
+        except NameError as ne:
+            # repo not found, others of the batch are still changed
+            self.error = True
+            self.errors.append(f"{ne}\n")
+            return rr.Output(rr.ERROR, f"{output}{ne}\n")
+
+    def map_repos(self, task: Callable[[str], T]) -> List[T]:
+        """Run task for each selected repo concurrently.
+
+        Args:
+            task: function receiving a repo name.
+
+        Returns:
+            List[T]: results in the configured repo order.
+        """
+        repos = self.config_manager.config.github_selected_repos
+        with futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            return list(executor.map(task, repos))
+
+    def map_selected_repos(self, task: Callable[[str], rr.Output]) -> str:
+        """Run task for each selected repo concurrently.
+
+        Results by repo are kept in `results`, unless given to `on_output` as
+        soon as each repo was done.
+
+        Args:
+            task: function receiving a repo name and returning its output.
+
+        Returns:
+            str: outputs concatenated in the configured repo order, empty when
+                they were given to `on_output`.
+        """
+
+        def record(github_repo: str) -> rr.RepoResult:
+            output = task(github_repo)
+            return rr.RepoResult(
+                github_repo,
+                self.action,
+                output.status,
+                result_detail(github_repo, output.text),
+                output=output.text,
+            )
+
+        repos = self.config_manager.config.github_selected_repos
+        with prof.span(self.action, "use_case", repos=len(repos)):
+            results = git.map_results(
+                record,
+                repos,
+                self.jobs,
+                self.on_output,
+                self.github_service.requests_sent,
+            )
+        self.results.extend(results)
+        return git.join_outputs(results)
 
     def generate_response(
         self, output: str
     ) -> Union[res.ResponseFailure, res.ResponseSuccess]:
         """Create appropriate response object."""
         if self.error:
-            return res.ResponseFailure(res.ResponseTypes.PARAMETERS_ERROR, output)
-        return res.ResponseSuccess(output)
+            # streamed outputs were shown already, only errors are repeated
+            message = "".join(self.errors) if self.on_output else output
+            # records of all repos, failed ones included, when there are any
+            return res.ResponseFailure(
+                res.ResponseTypes.PARAMETERS_ERROR, message, self.results or None
+            )
+        return res.ResponseSuccess(output, self.results)
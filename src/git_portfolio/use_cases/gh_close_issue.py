@@ -1,6 +1,10 @@
 """Close issue on Github use case."""
+from typing import Dict
+from typing import List
 from typing import Union
 
+import git_portfolio.domain.issue as i
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.request_objects.issue_list as il
 import git_portfolio.responses as res
 import git_portfolio.use_cases.gh as gh
@@ -10,32 +14,56 @@ import git_portfolio.use_cases.gh_list_issue as li
 class GhCloseIssueUseCase(gh.GhUseCase):
     """Github close issue use case."""
 
+    action = "close_issue"
+
     def execute(
         self,
         request_object: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
         github_repo: str = "",
     ) -> Union[res.ResponseFailure, res.ResponseSuccess]:
         """Close issues."""
-        output = ""
-        if github_repo:
-            response = li.GhListIssueUseCase(
+        searched: Dict[str, List[i.Issue]] = {}
+        if not github_repo:
+            searched = li.GhListIssueUseCase(
+                self.config_manager, self.github_service
+            ).execute_for_repos(
+                request_object, self.config_manager.config.github_selected_repos
+            )
+
+        def list_issues(
+            github_repo: str,
+        ) -> Union[res.ResponseFailure, res.ResponseSuccess]:
+            if github_repo in searched:
+                return res.ResponseSuccess(searched[github_repo])
+            return li.GhListIssueUseCase(
                 self.config_manager, self.github_service
             ).execute(request_object, github_repo)
-            if isinstance(response, res.ResponseSuccess):
-                output = self.call_github_service(
-                    "close_issues_from_repo", output, github_repo, response.value
-                )
-            else:
-                output = f"{github_repo}: no issues closed.\n"
+
+        def close_issues(
+            github_repo: str, response: Union[res.ResponseFailure, res.ResponseSuccess]
+        ) -> rr.Output:
+            if not isinstance(response, res.ResponseSuccess):
+                return rr.Output(rr.ERROR, f"{github_repo}: no issues closed.\n")
+            if github_repo in batched:
+                return batched[github_repo]
+            return self.call_github_service(
+                "close_issues_from_repo", "", github_repo, response.value
+            )
+
+        batched: Dict[str, rr.Output] = {}
+        if github_repo:
+            output = close_issues(github_repo, list_issues(github_repo)).text
         else:
-            for github_repo in self.config_manager.config.github_selected_repos:
-                response = li.GhListIssueUseCase(
-                    self.config_manager, self.github_service
-                ).execute(request_object, github_repo)
-                if isinstance(response, res.ResponseSuccess):
-                    output = self.call_github_service(
-                        "close_issues_from_repo", output, github_repo, response.value
-                    )
-                else:
-                    output += f"{github_repo}: no issues closed.\n"
-        return res.ResponseSuccess(output)
+            repos = self.config_manager.config.github_selected_repos
+            listed = dict(zip(repos, self.map_repos(list_issues)))
+            batched = self.github_service.close_issues_from_repos(
+                {
+                    repo: response.value
+                    for repo, response in listed.items()
+                    if isinstance(response, res.ResponseSuccess)
+                }
+            )
+            output = self.map_selected_repos(
+                lambda github_repo: close_issues(github_repo, listed[github_repo])
+            )
+        return res.ResponseSuccess(output, self.results)
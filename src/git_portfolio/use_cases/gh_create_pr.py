@@ -1,7 +1,11 @@
 """Create pull request on Github use case."""
+from typing import Dict
+from typing import List
 from typing import Union
 
+import git_portfolio.domain.issue as i
 import git_portfolio.domain.pull_request as pr
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.request_objects.issue_list as il
 import git_portfolio.responses as res
 import git_portfolio.use_cases.gh as gh
@@ -11,6 +15,8 @@ import git_portfolio.use_cases.gh_list_issue as li
 class GhCreatePrUseCase(gh.GhUseCase):
     """Github merge pull request use case."""
 
+    action = "create_pr"
+
     def execute(
         self,
         pr: pr.PullRequest,
@@ -18,35 +24,32 @@ class GhCreatePrUseCase(gh.GhUseCase):
         github_repo: str = "",
     ) -> Union[res.ResponseFailure, res.ResponseSuccess]:
         """Create pull requests."""
-        output = ""
-        if github_repo:
-            if pr.link_issues:
-                response = li.GhListIssueUseCase(
-                    self.config_manager, self.github_service
-                ).execute(request_object, github_repo)
-                if isinstance(response, res.ResponseSuccess):
-                    custom_pr = self.github_service.link_issues(pr, response.value)
-                else:
-                    custom_pr = pr
-            output = self.call_github_service(
-                "create_pull_request_from_repo", output, github_repo, pr
+        searched: Dict[str, List[i.Issue]] = {}
+        if pr.link_issues and not github_repo:
+            searched = li.GhListIssueUseCase(
+                self.config_manager, self.github_service
+            ).execute_for_repos(
+                request_object, self.config_manager.config.github_selected_repos
             )
-        else:
+
+        def create_pr(github_repo: str) -> rr.Output:
+            custom_pr = pr
             if pr.link_issues:
-                for github_repo in self.config_manager.config.github_selected_repos:
+                response: Union[res.ResponseFailure, res.ResponseSuccess]
+                if github_repo in searched:
+                    response = res.ResponseSuccess(searched[github_repo])
+                else:
                     response = li.GhListIssueUseCase(
                         self.config_manager, self.github_service
                     ).execute(request_object, github_repo)
-                    if isinstance(response, res.ResponseSuccess):
-                        custom_pr = self.github_service.link_issues(pr, response.value)
-                    else:
-                        custom_pr = pr
-                    output = self.call_github_service(
-                        "create_pull_request_from_repo", output, github_repo, custom_pr
-                    )
-            else:
-                for github_repo in self.config_manager.config.github_selected_repos:
-                    output = self.call_github_service(
-                        "create_pull_request_from_repo", output, github_repo, pr
-                    )
+                if isinstance(response, res.ResponseSuccess):
+                    custom_pr = self.github_service.link_issues(pr, response.value)
+            return self.call_github_service(
+                "create_pull_request_from_repo", "", github_repo, custom_pr
+            )
+
+        if github_repo:
+            output = create_pr(github_repo).text
+        else:
+            output = self.map_selected_repos(create_pr)
         return self.generate_response(output)
@@ -1,6 +1,7 @@
 """Delete branch on Github use case."""
 from typing import Union
 
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.responses as res
 import git_portfolio.use_cases.gh as gh
 
@@ -8,18 +9,20 @@ import git_portfolio.use_cases.gh as gh
 class GhDeleteBranchUseCase(gh.GhUseCase):
     """Github delete branch use case."""
 
+    action = "delete_branch"
+
     def execute(
         self, branch: str, github_repo: str = ""
     ) -> Union[res.ResponseFailure, res.ResponseSuccess]:
         """Delete branches."""
-        output = ""
-        if github_repo:
-            output = self.call_github_service(
-                "delete_branch_from_repo", output, github_repo, branch
+
+        def delete_branch(github_repo: str) -> rr.Output:
+            return self.call_github_service(
+                "delete_branch_from_repo", "", github_repo, branch
             )
+
+        if github_repo:
+            output = delete_branch(github_repo).text
         else:
-            for github_repo in self.config_manager.config.github_selected_repos:
-                output = self.call_github_service(
-                    "delete_branch_from_repo", output, github_repo, branch
-                )
+            output = self.map_selected_repos(delete_branch)
         return self.generate_response(output)
@@ -1,6 +1,10 @@
 """List issue on Github use case."""
+from typing import Dict
+from typing import List
 from typing import Union
 
+import git_portfolio.domain.gh_connection_settings as cs
+import git_portfolio.domain.issue as i
 import git_portfolio.request_objects.issue_list as il
 import git_portfolio.responses as res
 import git_portfolio.use_cases.gh as gh
@@ -20,5 +24,24 @@ class GhListIssueUseCase(gh.GhUseCase):
         try:
             issues = self.github_service.list_issues_from_repo(github_repo, request)
             return res.ResponseSuccess(issues)
+        except cs.AuthError:
+            # token revoked, no repo can be listed
+            raise
         except Exception as exc:
             return res.ResponseFailure(res.ResponseTypes.SYSTEM_ERROR, exc)
+
+    def execute_for_repos(
+        self,
+        request: Union[il.IssueListValidRequest, il.IssueListInvalidRequest],
+        github_repos: List[str],
+    ) -> Dict[str, List[i.Issue]]:
+        """Return matching issues of the repos a bulk read could cover.
+
+        Repos not in the result should be listed with `execute`.
+        """
+        try:
+            return self.github_service.list_issues_from_repos(github_repos, request)
+        except cs.AuthError:
+            raise
+        except Exception:
+            return {}
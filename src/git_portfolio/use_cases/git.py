@@ -1,20 +1,81 @@
 """Local git use case."""
+import functools
 import os
 import pathlib
 import subprocess  # noqa: S404
+import time
+from concurrent import futures
+from typing import Callable
 from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
+import git_portfolio.domain.repo_result as rr
+import git_portfolio.profiling as prof
 import git_portfolio.responses as res
 
 
+def map_results(
+    task: Callable[[str], rr.RepoResult],
+    repos: List[str],
+    jobs: Optional[int],
+    on_output: Optional[res.OutputHandler] = None,
+    requests_sent: Optional[Callable[[], int]] = None,
+) -> List[rr.RepoResult]:
+    """Run task for each repo concurrently, timing it.
+
+    Args:
+        task: function receiving a repo name and returning its result.
+        repos: repo names.
+        jobs: maximum number of repos processed at the same time.
+        on_output: receives each result in repo order, as soon as its repo and
+            all earlier ones are done, so they do not wait for the slowest
+            repo.
+        requests_sent: returns API requests sent by the current thread, to
+            count those sent by each task.
+
+    Returns:
+        List[rr.RepoResult]: results in repo order, empty if given to
+            on_output.
+    """
+
+    def run(repo: str) -> rr.RepoResult:
+        sent = requests_sent() if requests_sent else 0
+        start = time.monotonic()
+        with prof.repo_scope(repo):
+            result = task(repo)
+        result.duration = time.monotonic() - start
+        prof.record_repo(repo, result.action, start, result.duration)
+        if requests_sent:
+            result.api_calls = requests_sent() - sent
+        return result
+
+    with futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        if on_output is None:
+            return list(executor.map(run, repos))
+        for result in executor.map(run, repos):
+            on_output(result)
+    return []
+
+
+def join_outputs(results: List[rr.RepoResult]) -> str:
+    """Return text outputs of results."""
+    return "".join(result.output for result in results)
+
+
 class GitUseCase:
     """Execution of git use case."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        on_output: Optional[res.OutputHandler] = None,
+    ) -> None:
         """Constructor."""
         self.err_output = self.check_command_installed("git")
+        self.jobs = jobs if jobs else os.cpu_count()
+        self.on_output = on_output
 
     @staticmethod
     def check_command_installed(command: str) -> str:
@@ -53,29 +114,54 @@ class GitUseCase:
         """
         if self.err_output:
             return res.ResponseFailure(res.ResponseTypes.SYSTEM_ERROR, self.err_output)
-        output = ""
         cwd = pathlib.Path().absolute()
-        for repo_name in git_selected_repos:
-            folder_name = repo_name.split("/")[1]
-            output += f"{folder_name}: "
-            try:
-                popen = subprocess.Popen(  # noqa: S603, S607
-                    ["git", command, *args],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    cwd=os.path.join(cwd, folder_name),
-                )
-                stdout, error = popen.communicate()
-                if popen.returncode == 0:
-                    # case for command with no output on success such as `git add .`
-                    if not stdout:
-                        output += f"{command} successful.\n"
-                    else:
-                        stdout_str = stdout.decode("utf-8")
-                        output += f"{stdout_str}\n"
+        with prof.span(command, "use_case", repos=len(git_selected_repos)):
+            results = map_results(
+                functools.partial(
+                    self._execute_on_repo, cwd, command=command, args=args
+                ),
+                git_selected_repos,
+                self.jobs,
+                self.on_output,
+            )
+        return res.ResponseSuccess(join_outputs(results), results)
+
+    @staticmethod
+    def _execute_on_repo(
+        cwd: pathlib.Path, repo_name: str, command: str, args: Tuple[str]
+    ) -> rr.RepoResult:
+        """Run `git` command on one repo folder and return its result."""
+        folder_name = repo_name.split("/")[1]
+        status = rr.ERROR
+        argv = ["git", command, *args]
+        try:
+            start = time.perf_counter()
+            popen = subprocess.Popen(  # noqa: S603, S607
+                argv,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=os.path.join(cwd, folder_name),
+            )
+            stdout, error = popen.communicate()
+            prof.record_git(
+                repo_name, argv, popen.returncode, time.perf_counter() - start
+            )
+            if popen.returncode == 0:
+                status = rr.SUCCESS
+                # case for command with no output on success such as `git add .`
+                if not stdout:
+                    detail = f"{command} successful.\n"
                 else:
-                    error_str = error.decode("utf-8")
-                    output += f"{error_str}"
-            except FileNotFoundError as fnf_error:
-                output += f"{fnf_error.strerror}: {fnf_error.filename}\n"
-        return res.ResponseSuccess(output)
+                    stdout_str = stdout.decode("utf-8")
+                    detail = f"{stdout_str}\n"
+            else:
+                detail = error.decode("utf-8")
+        except FileNotFoundError as fnf_error:
+            detail = f"{fnf_error.strerror}: {fnf_error.filename}\n"
+        return rr.RepoResult(
+            repo_name,
+            command,
+            status,
+            detail.strip(),
+            output=f"{folder_name}: {detail}",
+        )
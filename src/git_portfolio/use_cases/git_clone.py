@@ -1,10 +1,17 @@
 """Git clone use case."""
+import functools
+import os
 import pathlib
 import subprocess  # noqa: S404
+import time
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.github_service as ghs
+import git_portfolio.profiling as prof
 import git_portfolio.responses as res
 import git_portfolio.use_cases.git as git
 
@@ -12,42 +19,66 @@ import git_portfolio.use_cases.git as git
 class GitCloneUseCase:
     """Execution of git clone use case."""
 
-    def __init__(self, github_service: ghs.GithubService) -> None:
+    def __init__(
+        self,
+        github_service: ghs.GithubService,
+        jobs: Optional[int] = None,
+        on_output: Optional[res.OutputHandler] = None,
+    ) -> None:
         """Constructor."""
         self.github_service = github_service
         self.err_output = git.GitUseCase.check_command_installed("git")
+        self.jobs = jobs if jobs else os.cpu_count()
+        self.on_output = on_output
 
     def execute(
-        self, git_selected_repos: List[str]
+        self, git_selected_repos: List[str], args: Tuple[str, ...] = ()
     ) -> Union[res.ResponseFailure, res.ResponseSuccess]:
         """Batch `git clone` command.
 
         Args:
             git_selected_repos: list of configured repo names.
+            args: extra clone arguments eg. --depth=1, --filter=blob:none.
 
         Returns:
-            str: output.
-            str: error output.
+            Union[res.ResponseFailure, res.ResponseSuccess]: final result.
         """
         if self.err_output:
             return res.ResponseFailure(res.ResponseTypes.SYSTEM_ERROR, self.err_output)
-        output = ""
         cwd = pathlib.Path().absolute()
-        for repo_name in git_selected_repos:
-            folder_name = repo_name.split("/")[1]
-            clone_path = self.github_service.get_repo_url(repo_name)
-            output += f"{folder_name}: "
-            popen = subprocess.Popen(  # noqa: S603, S607
-                ["git", "clone", clone_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=cwd,
-            )
-            _, error = popen.communicate()
-            # check for errors
-            if popen.returncode == 0:
-                output += "clone successful.\n"
-            else:
-                error_str = error.decode("utf-8")
-                output += f"{error_str}"
-        return res.ResponseSuccess(output)
+        self.github_service.prefetch_repo_urls(git_selected_repos)
+        results = git.map_results(
+            functools.partial(self._clone_repo, cwd, args=args),
+            git_selected_repos,
+            self.jobs,
+            self.on_output,
+            self.github_service.requests_sent,
+        )
+        return res.ResponseSuccess(git.join_outputs(results), results)
+
+    def _clone_repo(
+        self, cwd: pathlib.Path, repo_name: str, args: Tuple[str, ...]
+    ) -> rr.RepoResult:
+        """Clone one repo and return its result."""
+        folder_name = repo_name.split("/")[1]
+        clone_path = self.github_service.get_repo_url(repo_name)
+        argv = ["git", "clone", *args, clone_path]
+        start = time.perf_counter()
+        popen = subprocess.Popen(  # noqa: S603, S607
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+        )
+        _, error = popen.communicate()
+        elapsed = time.perf_counter() - start
+        prof.record_git(repo_name, argv, popen.returncode, elapsed)
+        # check for errors
+        if popen.returncode == 0:
+            status = rr.SUCCESS
+            detail = f"clone successful ({elapsed:.2f}s).\n"
+        else:
+            status = rr.ERROR
+            detail = error.decode("utf-8")
+        output = f"{folder_name}: {detail}"
+        return rr.RepoResult(repo_name, "clone", status, detail.strip(), output=output)
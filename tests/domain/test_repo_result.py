@@ -0,0 +1,18 @@
+"""Test cases for the repository result model."""
+import git_portfolio.domain.repo_result as rr
+
+
+def test_repo_result_to_dict() -> None:
+    """It returns record without text output."""
+    result = rr.RepoResult(
+        "org/repo", "pull", rr.SUCCESS, "Already up to date.", 1.5, 0, "repo: ..."
+    )
+
+    assert result.to_dict() == {
+        "repo": "org/repo",
+        "action": "pull",
+        "status": "success",
+        "detail": "Already up to date.",
+        "duration": 1.5,
+        "api_calls": 0,
+    }
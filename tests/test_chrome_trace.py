@@ -0,0 +1,96 @@
+"""Test cases for the chrome trace module."""
+import json
+import os
+
+from _pytest.tmpdir import Path
+
+import git_portfolio.chrome_trace as ct
+import git_portfolio.profiling as prof
+
+
+def _profiler() -> prof.Profiler:
+    profiler = prof.Profiler(clock=lambda: 10.0)
+    profiler.add(prof.Span("gitp pull", "command", 10.0, 2.0, 1, {}))
+    profiler.add(prof.RepoSpan("org/repo", "pull", 10.5, 1.0, 2))
+    profiler.add(
+        prof.HttpCall("GET", "/user", 200, 10, 10.25, 0.5, False, "org/repo", 2)
+    )
+    profiler.add(prof.GitCall("org/repo", ["git", "pull", "-r"], 1, 11.0, 0.25, 2))
+    profiler.threads = {1: "MainThread", 2: "worker"}
+    return profiler
+
+
+def test_trace_events() -> None:
+    """It returns thread names then complete events relative to start."""
+    pid = os.getpid()
+
+    assert ct.trace_events(_profiler()) == [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": 1,
+            "args": {"name": "MainThread"},
+        },
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": 2,
+            "args": {"name": "worker"},
+        },
+        {
+            "name": "gitp pull",
+            "cat": "command",
+            "ph": "X",
+            "ts": 0,
+            "dur": 2000000,
+            "pid": pid,
+            "tid": 1,
+            "args": {},
+        },
+        {
+            "name": "org/repo",
+            "cat": "repo",
+            "ph": "X",
+            "ts": 500000,
+            "dur": 1000000,
+            "pid": pid,
+            "tid": 2,
+            "args": {"action": "pull"},
+        },
+        {
+            "name": "GET /user",
+            "cat": "http",
+            "ph": "X",
+            "ts": 250000,
+            "dur": 500000,
+            "pid": pid,
+            "tid": 2,
+            "args": {"repo": "org/repo", "status": 200, "bytes": 10, "cached": False},
+        },
+        {
+            "name": "git pull",
+            "cat": "git",
+            "ph": "X",
+            "ts": 1000000,
+            "dur": 250000,
+            "pid": pid,
+            "tid": 2,
+            "args": {
+                "repo": "org/repo",
+                "argv": ["git", "pull", "-r"],
+                "returncode": 1,
+            },
+        },
+    ]
+
+
+def test_write(tmp_path: Path) -> None:
+    """It writes trace file."""
+    path = tmp_path / "trace.json"
+    ct.write(_profiler(), str(path))
+
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    assert len(trace["traceEvents"]) == 6
@@ -1,91 +1,200 @@
 """Test cases for the config manager module."""
+import os
+
 import pytest
+import yaml
 from _pytest.tmpdir import Path
 from pytest_mock import MockerFixture
 
 from git_portfolio import config_manager as cm
 
 
-@pytest.fixture
-def mock_os_join_path(mocker: MockerFixture) -> MockerFixture:
-    """Fixture for mocking os.path.join."""
-    return mocker.patch("os.path.join")
+CONTENT = (
+    "github_access_token: aaaaabbbbbccccc12345\n"
+    "github_hostname: ''\n"
+    "github_selected_repos:\n"
+    " - staticdev/test\n"
+)
 
 
 @pytest.fixture
-def mock_yaml_dump(mocker: MockerFixture) -> MockerFixture:
-    """Fixture for mocking yaml.dump."""
-    return mocker.patch("yaml.dump")
+def config_folder(mocker: MockerFixture, tmp_path: Path) -> Path:
+    """Fixture for using a temporary home folder."""
+    mocker.patch("os.path.expanduser", return_value=str(tmp_path))
+    folder = tmp_path / ".gitp"
+    folder.mkdir()
+    return folder
 
 
-def test_init_invalid_config(tmp_path: Path, mock_os_join_path: MockerFixture) -> None:
+def test_init_invalid_config(config_folder: Path) -> None:
     """It trucantes the file."""
-    filename = "config1.yaml"
-    d = tmp_path
-    p = d / filename
+    p = config_folder / "config.yaml"
     p.write_text("in:valid")
-    mock_os_join_path.side_effect = [str(d), str(p)]
-    cm.ConfigManager()
-    # os_truncate.assert_called_once_with(0)
+    manager = cm.ConfigManager()
+
+    assert manager.config.github_access_token == ""
+    assert p.read_text() == ""
 
 
-def test_save_invalid_yaml(tmp_path: Path, mock_os_join_path: MockerFixture) -> None:
+def test_save_invalid_yaml(config_folder: Path) -> None:
     """It trucantes the file."""
-    filename = "config.yaml"
     content = (
         "github_access_token: aaaaabbbbbccccc12345"
         "github_hostname: ''"
         "github_selected_repos:"
         " - staticdev/test"
     )
-    d = tmp_path
-    p = d / filename
+    p = config_folder / "config.yaml"
     p.write_text(content)
-    mock_os_join_path.side_effect = [str(d), str(p)]
-    cm.ConfigManager()
-    # os_truncate.assert_called_once_with(0)
+    manager = cm.ConfigManager()
+
+    assert manager.config.github_access_token == ""
+    assert p.read_text() == ""
+
+
+def test_init_scanner_error(config_folder: Path) -> None:
+    """It trucantes the file."""
+    p = config_folder / "config.yaml"
+    p.write_text("key: 'unclosed")
+    manager = cm.ConfigManager()
+
+    assert manager.config.github_access_token == ""
+    assert p.read_text() == ""
 
 
-def test_save_config_no_file(tmp_path: Path, mock_os_join_path: MockerFixture) -> None:
+def test_save_config_no_file(config_folder: Path) -> None:
     """It raises AttributeError."""
-    d = tmp_path
-    mock_os_join_path.side_effect = [str(d), str(d / "config.yaml")]
     manager = cm.ConfigManager()
     with pytest.raises(AttributeError):
         manager.save_config()
 
 
-def test_save_config_empty_file(
-    tmp_path: Path, mock_os_join_path: MockerFixture
-) -> None:
+def test_save_config_empty_file(config_folder: Path) -> None:
     """It raises AttributeError."""
     filename = "config2.yaml"
-    d = tmp_path
-    p = d / filename
+    p = config_folder / filename
     p.write_text("")
-    mock_os_join_path.side_effect = [str(d), str(p)]
     manager = cm.ConfigManager(filename)
     with pytest.raises(AttributeError):
         manager.save_config()
 
 
-def test_save_config_success(
-    tmp_path: Path,
-    mock_yaml_dump: MockerFixture,
-    mock_os_join_path: MockerFixture,
-) -> None:
+def test_save_config_success(config_folder: Path) -> None:
     """It dumps yaml config file."""
-    filename = "config.yaml"
-    content = (
-        "github_access_token: aaaaabbbbbccccc12345\n"
-        "github_hostname: ''\n"
-        "github_selected_repos:\n"
-        " - staticdev/test\n"
-    )
-    d = tmp_path
-    p = d / filename
-    p.write_text(content)
-    mock_os_join_path.side_effect = [str(d), str(p)]
+    p = config_folder / "config.yaml"
+    p.write_text(CONTENT)
+    manager = cm.ConfigManager()
+    manager.config.github_selected_repos.append("staticdev/other")
+    manager.save_config()
+
+    assert yaml.safe_load(p.read_text())["github_selected_repos"] == [
+        "staticdev/test",
+        "staticdev/other",
+    ]
+    assert sorted(os.listdir(config_folder)) == ["config.json", "config.yaml"]
+
+
+def test_save_config_updates_snapshot(
+    mocker: MockerFixture, config_folder: Path
+) -> None:
+    """It loads saved config without parsing YAML."""
+    (config_folder / "config.yaml").write_text(CONTENT)
     manager = cm.ConfigManager()
+    manager.config.github_hostname = "myhost.com"
     manager.save_config()
-    mock_yaml_dump.assert_called_once()
+    load = mocker.spy(yaml, "load")
+
+    assert cm.ConfigManager().config.github_hostname == "myhost.com"
+    load.assert_not_called()
+
+
+def test_config_loaded_once(config_folder: Path) -> None:
+    """It loads config file on first use only."""
+    p = config_folder / "config.yaml"
+    manager = cm.ConfigManager()
+    p.write_text(CONTENT)
+
+    assert manager.config.github_selected_repos == ["staticdev/test"]
+    p.unlink()
+    assert manager.config.github_access_token == "aaaaabbbbbccccc12345"
+
+
+def test_config_loading_message(
+    capsys: pytest.CaptureFixture[str], config_folder: Path
+) -> None:
+    """It reports loading on stderr, leaving stdout to command output."""
+    (config_folder / "config.yaml").write_text(CONTENT)
+    cm.ConfigManager().config
+
+    captured = capsys.readouterr()
+    assert (captured.out, captured.err) == ("", "Loading previous config...\n\n")
+
+
+def test_config_snapshot_used(mocker: MockerFixture, config_folder: Path) -> None:
+    """It parses YAML file only once while it is not modified."""
+    (config_folder / "config.yaml").write_text(CONTENT)
+    load = mocker.spy(yaml, "load")
+    cm.ConfigManager().config
+    manager = cm.ConfigManager()
+
+    assert manager.config.github_selected_repos == ["staticdev/test"]
+    load.assert_called_once()
+
+
+def test_config_snapshot_outdated(config_folder: Path) -> None:
+    """It parses YAML file again when it was modified."""
+    p = config_folder / "config.yaml"
+    p.write_text(CONTENT)
+    cm.ConfigManager().config
+    p.write_text(CONTENT.replace("staticdev/test", "staticdev/other-test"))
+
+    assert cm.ConfigManager().config.github_selected_repos == ["staticdev/other-test"]
+
+
+@pytest.mark.parametrize("snapshot", ["not json", "[]", '{"key": null}'])
+def test_config_snapshot_invalid(config_folder: Path, snapshot: str) -> None:
+    """It parses YAML file."""
+    (config_folder / "config.yaml").write_text(CONTENT)
+    (config_folder / "config.json").write_text(snapshot)
+
+    assert cm.ConfigManager().config.github_access_token == "aaaaabbbbbccccc12345"
+
+
+def test_config_snapshot_other_fields(
+    mocker: MockerFixture, config_folder: Path
+) -> None:
+    """It parses YAML file when snapshot does not match config fields."""
+    p = config_folder / "config.yaml"
+    p.write_text(CONTENT)
+    cm.ConfigManager().config
+    snapshot = (config_folder / "config.json").read_text()
+    (config_folder / "config.json").write_text(
+        snapshot.replace("github_hostname", "old_field")
+    )
+    load = mocker.spy(yaml, "load")
+
+    assert cm.ConfigManager().config.github_hostname == ""
+    load.assert_called_once()
+
+
+def test_config_snapshot_not_saved(config_folder: Path) -> None:
+    """It loads config when snapshot cannot be written."""
+    (config_folder / "config.yaml").write_text(CONTENT)
+    (config_folder / "config.json").mkdir()
+
+    assert cm.ConfigManager().config.github_access_token == "aaaaabbbbbccccc12345"
+
+
+def test_get_cache(config_folder: Path) -> None:
+    """It returns cache in config folder."""
+    cache = cm.ConfigManager().get_cache("cache.json", 60)
+
+    assert cache.cache_path == str(config_folder / "cache.json")
+    assert cache.ttl == 60
+
+
+def test_get_issue_mirror(config_folder: Path) -> None:
+    """It returns issue mirror in config folder."""
+    mirror = cm.ConfigManager().get_issue_mirror("issues.sqlite3")
+
+    assert mirror.path == str(config_folder / "issues.sqlite3")
@@ -0,0 +1,171 @@
+"""Test cases for the daemon module."""
+import os
+import sys
+import threading
+import time
+from multiprocessing import connection
+from typing import Iterator
+from typing import List
+
+import pytest
+from _pytest.tmpdir import Path
+from pytest_mock import MockerFixture
+
+import git_portfolio.daemon as dm
+
+
+def handler(args: List[str], cwd: str) -> dm.Result:
+    """Echo arguments."""
+    if args == ["fail"]:
+        raise ValueError("handler error")
+    return 0, f"{' '.join(args)} in {cwd}\n", ""
+
+
+def wait_running(folder: str, timeout: float = 10.0) -> None:
+    """Wait for daemon of folder to answer, failing after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not dm.is_running(folder):
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def config_folder(tmp_path: Path) -> Iterator[str]:
+    """Fixture for a daemon serving in background."""
+    folder = str(tmp_path)
+    server = dm.Daemon(folder, handler)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    wait_running(folder)
+    yield folder
+    if dm.stop(folder):
+        thread.join()
+
+
+def test_forward(config_folder: str) -> None:
+    """It returns result of daemon handler."""
+    result = dm.forward(config_folder, ["status", "-s"], "/repos")
+
+    assert result == (0, "status -s in /repos\n", "")
+
+
+def test_forward_handler_error(config_folder: str) -> None:
+    """It returns traceback of handler error."""
+    result = dm.forward(config_folder, ["fail"], "/repos")
+
+    assert result is not None
+    assert result[0] == 1
+    assert "ValueError: handler error" in result[2]
+
+
+def test_forward_no_daemon(tmp_path: Path) -> None:
+    """It returns None."""
+    assert dm.forward(str(tmp_path), ["status"], "/repos") is None
+
+
+def test_forward_stale_socket(tmp_path: Path) -> None:
+    """It returns None."""
+    (tmp_path / dm.SOCKET_FILENAME).write_text("")
+    (tmp_path / dm.AUTHKEY_FILENAME).write_bytes(b"key")
+
+    assert dm.forward(str(tmp_path), ["status"], "/repos") is None
+
+
+def test_forward_wrong_key(config_folder: str) -> None:
+    """It returns None and daemon keeps serving."""
+    key_path = os.path.join(config_folder, dm.AUTHKEY_FILENAME)
+    with open(key_path, "rb") as key_file:
+        authkey = key_file.read()
+    with open(key_path, "wb") as key_file:
+        key_file.write(b"wrong key")
+
+    assert dm.forward(config_folder, ["status"], "/repos") is None
+    with open(key_path, "wb") as key_file:
+        key_file.write(authkey)
+    assert dm.is_running(config_folder)
+
+
+def test_forward_daemon_stopped(tmp_path: Path) -> None:
+    """It returns an error without running command in process."""
+    authkey = b"key"
+    (tmp_path / dm.AUTHKEY_FILENAME).write_bytes(authkey)
+    address, family = dm._address(str(tmp_path))
+    listener = connection.Listener(address, family=family, authkey=authkey)
+    thread = threading.Thread(target=lambda: listener.accept().close())
+    thread.start()
+    result = dm.forward(str(tmp_path), ["status"], "/repos")
+    thread.join()
+    listener.close()
+
+    assert result == (1, "", "Error: gitp daemon stopped before answering.\n")
+
+
+def test_serve_invalid_request(config_folder: str) -> None:
+    """It ignores request and keeps serving."""
+    address, family = dm._address(config_folder)
+    with open(os.path.join(config_folder, dm.AUTHKEY_FILENAME), "rb") as key_file:
+        authkey = key_file.read()
+    with connection.Client(address, family=family, authkey=authkey) as conn:
+        conn.send_bytes(b"not json")
+
+    assert dm.is_running(config_folder)
+
+
+def test_serve_client_gone(mocker: MockerFixture, config_folder: str) -> None:
+    """It keeps serving."""
+    conn = mocker.Mock()
+    conn.recv_bytes.return_value = b'{"action": "ping"}'
+    conn.send_bytes.side_effect = BrokenPipeError
+    server = dm.Daemon(config_folder, handler)
+
+    assert server._serve_client(conn) is True
+    assert dm.is_running(config_folder)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="named pipes leave no file")
+def test_serve_replaces_stale_socket(tmp_path: Path) -> None:
+    """It removes socket left by a daemon and cleans up when stopped."""
+    (tmp_path / dm.SOCKET_FILENAME).write_text("")
+    server = dm.Daemon(str(tmp_path), handler)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    wait_running(str(tmp_path))
+
+    assert dm.stop(str(tmp_path))
+    thread.join()
+    assert os.listdir(tmp_path) == []
+
+
+def test_is_serving(tmp_path: Path) -> None:
+    """It is true only while serving."""
+    serving = []
+
+    def serving_handler(args: List[str], cwd: str) -> dm.Result:
+        serving.append(dm.is_serving())
+        return 0, "", ""
+
+    server = dm.Daemon(str(tmp_path), serving_handler)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    wait_running(str(tmp_path))
+    dm.forward(str(tmp_path), ["status"], "/repos")
+    dm.stop(str(tmp_path))
+    thread.join()
+
+    assert serving == [True]
+    assert not dm.is_serving()
+
+
+def test_stop_no_daemon(tmp_path: Path) -> None:
+    """It returns False."""
+    assert not dm.stop(str(tmp_path))
+
+
+def test_address_windows(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It uses a named pipe by config folder."""
+    monkeypatch.setattr(sys, "platform", "win32")
+    address, family = dm._address("C:\\Users\\me\\.gitp")
+
+    assert address.startswith("\\\\.\\pipe\\gitp-")
+    assert family == "AF_PIPE"
+    assert dm._address("C:\\Users\\other\\.gitp")[0] != address
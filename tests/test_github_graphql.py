@@ -0,0 +1,395 @@
+"""Test cases for the Github GraphQL module."""
+from typing import Any
+from typing import Dict
+from typing import List
+
+import github3
+import pytest
+from pytest_mock import MockerFixture
+
+import git_portfolio.github_graphql as ghg
+
+
+REPO = "org/reponame"
+REPO2 = "org/reponame2"
+
+
+def _issue_node(
+    number: int, title: str, labels: List[str], state: str = "OPEN"
+) -> Dict[str, Any]:
+    return {
+        "id": f"I_{number}",
+        "number": number,
+        "title": title,
+        "body": f"body{number}",
+        "state": state,
+        "labels": {"nodes": [{"name": label} for label in labels]},
+    }
+
+
+def _page(nodes: List[Dict[str, Any]], cursor: str = "") -> Dict[str, Any]:
+    return {
+        "pageInfo": {"hasNextPage": bool(cursor), "endCursor": cursor or None},
+        "nodes": nodes,
+    }
+
+
+@pytest.fixture
+def mock_session(mocker: MockerFixture) -> MockerFixture:
+    """Fixture for mocking github3 session."""
+    session = mocker.Mock(base_url="https://api.github.com")
+    session.post.return_value = mocker.Mock(status_code=200)
+    return session
+
+
+def _set_data(
+    mocker: MockerFixture, session: MockerFixture, *data: Dict[str, Any]
+) -> None:
+    responses = []
+    for response_data in data:
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = {"data": response_data}
+        responses.append(response)
+    session.post.side_effect = responses
+
+
+@pytest.mark.parametrize(
+    "api_url,expected",
+    [
+        ("https://api.github.com", "https://api.github.com/graphql"),
+        ("https://myhost.com/api/v3", "https://myhost.com/api/graphql"),
+        ("https://myhost.com/api/v3/", "https://myhost.com/api/graphql"),
+    ],
+)
+def test_graphql_url(api_url: str, expected: str) -> None:
+    """It returns GraphQL endpoint."""
+    assert ghg.graphql_url(api_url) == expected
+
+
+def test_query_success(mocker: MockerFixture, mock_session: MockerFixture) -> None:
+    """It posts query and returns data."""
+    _set_data(mocker, mock_session, {"viewer": {"login": "me"}})
+    data = ghg.GithubGraphqlReader(mock_session).query("query { viewer { login } }", {})
+
+    assert data == {"viewer": {"login": "me"}}
+    mock_session.post.assert_called_once_with(
+        "https://api.github.com/graphql",
+        json={"query": "query { viewer { login } }", "variables": {}},
+    )
+
+
+def test_query_http_error(mock_session: MockerFixture) -> None:
+    """It raises GitHubError."""
+    mock_session.post.return_value.status_code = 502
+
+    with pytest.raises(github3.exceptions.GitHubError):
+        ghg.GithubGraphqlReader(mock_session).query("query { a }", {})
+
+
+def test_query_no_data(mock_session: MockerFixture) -> None:
+    """It raises GraphqlError with messages."""
+    mock_session.post.return_value.json.return_value = {
+        "errors": [{"message": "bad"}, {"message": "worse"}]
+    }
+
+    with pytest.raises(ghg.GraphqlError, match="bad; worse"):
+        ghg.GithubGraphqlReader(mock_session).query("query { a }", {})
+
+
+def test_list_issues_one_request(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It reads issues of all repos with a single aliased query."""
+    _set_data(
+        mocker,
+        mock_session,
+        {
+            "r0": {"issues": _page([_issue_node(3, "issue title", ["bug"])])},
+            "r1": {"issues": _page([_issue_node(1, "other", [])])},
+        },
+    )
+    result = ghg.GithubGraphqlReader(mock_session).list_issues(
+        [REPO, REPO2], {"obj__eq": "issue", "state__eq": "open"}
+    )
+
+    mock_session.post.assert_called_once()
+    payload = mock_session.post.call_args[1]["json"]
+    assert "r1: repository(owner: $o1, name: $n1)" in payload["query"]
+    assert "states: [OPEN]" in payload["query"]
+    assert "pullRequests" not in payload["query"]
+    assert payload["variables"] == {
+        "o0": "org",
+        "n0": "reponame",
+        "a0": None,
+        "o1": "org",
+        "n1": "reponame2",
+        "a1": None,
+    }
+    assert result[REPO][0].labels == {"bug"}
+    assert result[REPO][0].node_id == "I_3"
+    assert [issue.number for issue in result[REPO2]] == [1]
+
+
+def test_list_issues_paginates(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It asks next pages only for repos that have them."""
+    _set_data(
+        mocker,
+        mock_session,
+        {
+            "r0": {"pullRequests": _page([_issue_node(5, "a", [])], "c1")},
+            "r1": {"pullRequests": _page([_issue_node(2, "b", [])])},
+        },
+        {"r0": {"pullRequests": _page([_issue_node(4, "c", [], "MERGED")])}},
+    )
+    result = ghg.GithubGraphqlReader(mock_session).list_issues(
+        [REPO, REPO2], {"obj__eq": "pull request", "state__eq": "closed"}
+    )
+
+    second_payload = mock_session.post.call_args_list[1][1]["json"]
+    assert second_payload["variables"] == {"o0": "org", "n0": "reponame", "a0": "c1"}
+    assert "states: [CLOSED, MERGED]" in second_payload["query"]
+    assert [issue.number for issue in result[REPO]] == [5, 4]
+    assert [issue.state for issue in result[REPO]] == ["open", "closed"]
+    assert [issue.number for issue in result[REPO2]] == [2]
+
+
+def test_list_issues_merges_issues_and_prs(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It merges both connections newest first and filters title."""
+    _set_data(
+        mocker,
+        mock_session,
+        {"r0": {"issues": _page([_issue_node(1, "issue title", [])])}},
+        {
+            "r0": {
+                "pullRequests": _page(
+                    [_issue_node(2, "pr issue title", []), _issue_node(3, "x", [])]
+                )
+            }
+        },
+    )
+    result = ghg.GithubGraphqlReader(mock_session).list_issues(
+        [REPO], {"title__contains": "issue title"}
+    )
+
+    assert "states" not in mock_session.post.call_args_list[0][1]["json"]["query"]
+    assert [issue.number for issue in result[REPO]] == [2, 1]
+
+
+def test_list_issues_unsupported_state(mock_session: MockerFixture) -> None:
+    """It returns no repos without querying."""
+    result = ghg.GithubGraphqlReader(mock_session).list_issues(
+        [REPO], {"state__eq": "merged"}
+    )
+
+    assert result == {}
+    mock_session.post.assert_not_called()
+
+
+def test_list_issues_skips_missing_repos(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It leaves out repos that could not be read."""
+    _set_data(
+        mocker,
+        mock_session,
+        {"r0": None, "r1": {"issues": _page([])}},
+    )
+    result = ghg.GithubGraphqlReader(mock_session).list_issues(
+        [REPO, REPO2], {"obj__eq": "issue"}
+    )
+
+    assert result == {REPO2: []}
+
+
+def test_list_issues_chunks(mocker: MockerFixture, mock_session: MockerFixture) -> None:
+    """It splits repos in queries of limited size."""
+    mocker.patch.object(ghg, "REPOS_PER_QUERY", 1)
+    _set_data(
+        mocker,
+        mock_session,
+        {"r0": {"issues": _page([])}},
+        {"r0": {"issues": _page([])}},
+    )
+    result = ghg.GithubGraphqlReader(mock_session).list_issues(
+        [REPO, REPO2], {"obj__eq": "issue"}
+    )
+
+    assert mock_session.post.call_count == 2
+    assert result == {REPO: [], REPO2: []}
+
+
+def test_find_pull_requests(mocker: MockerFixture, mock_session: MockerFixture) -> None:
+    """It returns numbers of PRs from head owner."""
+    _set_data(
+        mocker,
+        mock_session,
+        {
+            "r0": {
+                "pullRequests": {
+                    "nodes": [
+                        {
+                            "id": "PR_7",
+                            "number": 7,
+                            "headRepositoryOwner": {"login": "Org"},
+                        },
+                        {
+                            "id": "PR_8",
+                            "number": 8,
+                            "headRepositoryOwner": {"login": "fork"},
+                        },
+                        {"id": "PR_9", "number": 9, "headRepositoryOwner": None},
+                    ]
+                }
+            },
+            "r1": {"pullRequests": {"nodes": []}},
+        },
+    )
+    result = ghg.GithubGraphqlReader(mock_session).find_pull_requests(
+        [REPO, REPO2], "main", "branch", "org"
+    )
+
+    payload = mock_session.post.call_args[1]["json"]
+    assert payload["query"].startswith("query($base: String!, $head: String!")
+    assert payload["variables"]["base"] == "main"
+    assert payload["variables"]["head"] == "branch"
+    assert result == {REPO: [(7, "PR_7")], REPO2: []}
+
+
+def test_list_open_pull_requests(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It returns open PRs with their branches and head owner."""
+    nodes = [
+        {
+            "id": "PR_7",
+            "number": 7,
+            "baseRefName": "main",
+            "headRefName": "branch",
+            "headRepositoryOwner": {"login": "org"},
+        },
+        {
+            "id": "PR_9",
+            "number": 9,
+            "baseRefName": "main",
+            "headRefName": "deleted",
+            "headRepositoryOwner": None,
+        },
+    ]
+    _set_data(mocker, mock_session, {"r0": {"pullRequests": _page(nodes)}})
+    result = ghg.GithubGraphqlReader(mock_session).list_open_pull_requests([REPO])
+
+    query = mock_session.post.call_args[1]["json"]["query"]
+    assert "states: [OPEN]" in query
+    assert "headRefName" in query
+    assert result == {
+        REPO: [(7, "PR_7", "main", "branch", "org"), (9, "PR_9", "main", "deleted", "")]
+    }
+
+
+def test_get_repo_urls(mocker: MockerFixture, mock_session: MockerFixture) -> None:
+    """It returns SSH URLs."""
+    _set_data(
+        mocker,
+        mock_session,
+        {"r0": {"sshUrl": f"git@github.com:{REPO}.git"}, "r1": None},
+    )
+    result = ghg.GithubGraphqlReader(mock_session).get_repo_urls([REPO, REPO2])
+
+    assert result == {REPO: f"git@github.com:{REPO}.git"}
+
+
+def _set_bodies(
+    mocker: MockerFixture, session: MockerFixture, *bodies: Dict[str, Any]
+) -> None:
+    responses = []
+    for body in bodies:
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = body
+        responses.append(response)
+    session.post.side_effect = responses
+
+
+def test_mutator_run_batches(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It sends aliased mutations in batches."""
+    _set_bodies(
+        mocker,
+        mock_session,
+        {"data": {"m0": {"clientMutationId": None}, "m1": {"clientMutationId": None}}},
+        {"data": {"m0": {"clientMutationId": None}}},
+    )
+    errors = ghg.GithubGraphqlMutator(mock_session, batch_size=2).run(
+        [
+            ("closeIssue", {"issueId": "I_1"}),
+            ("closeIssue", {"issueId": "I_2"}),
+            ("mergePullRequest", {"pullRequestId": "PR_3"}),
+        ]
+    )
+
+    assert errors == ["", "", ""]
+    assert mock_session.post.call_count == 2
+    payload = mock_session.post.call_args_list[0][1]["json"]
+    assert payload["query"] == (
+        "mutation($i0: CloseIssueInput!, $i1: CloseIssueInput!) { "
+        "m0: closeIssue(input: $i0) { clientMutationId } "
+        "m1: closeIssue(input: $i1) { clientMutationId } }"
+    )
+    assert payload["variables"] == {"i0": {"issueId": "I_1"}, "i1": {"issueId": "I_2"}}
+    last_payload = mock_session.post.call_args_list[1][1]["json"]
+    assert "$i0: MergePullRequestInput!" in last_payload["query"]
+
+
+def test_mutator_run_item_errors(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It reports errors of each failed alias."""
+    _set_bodies(
+        mocker,
+        mock_session,
+        {
+            "data": {"m0": None, "m1": {"clientMutationId": None}, "m2": None},
+            "errors": [{"message": "not mergeable", "path": ["m0"]}],
+        },
+    )
+    errors = ghg.GithubGraphqlMutator(mock_session).run(
+        [("mergePullRequest", {"pullRequestId": f"PR_{n}"}) for n in range(3)]
+    )
+
+    assert errors == ["not mergeable", "", "no result"]
+
+
+def test_mutator_run_document_errors(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It fails every item with errors without path."""
+    _set_bodies(
+        mocker,
+        mock_session,
+        {"errors": [{"message": "bad"}, {"message": "worse"}]},
+    )
+    errors = ghg.GithubGraphqlMutator(mock_session).run(
+        [("closeIssue", {"issueId": "I_1"}), ("closeIssue", {"issueId": "I_2"})]
+    )
+
+    assert errors == ["bad; worse", "bad; worse"]
+
+
+def test_mutator_run_http_error(
+    mocker: MockerFixture, mock_session: MockerFixture
+) -> None:
+    """It fails every item of the failed batch only."""
+    failed = mocker.Mock(status_code=502)
+    failed.json.return_value = {"message": "Bad gateway"}
+    succeeded = mocker.Mock(status_code=200)
+    succeeded.json.return_value = {"data": {"m0": {"clientMutationId": None}}}
+    mock_session.post.side_effect = [failed, succeeded]
+    errors = ghg.GithubGraphqlMutator(mock_session, batch_size=1).run(
+        [("closeIssue", {"issueId": "I_1"}), ("closeIssue", {"issueId": "I_2"})]
+    )
+
+    assert errors == ["Bad gateway", ""]
@@ -1,23 +1,34 @@
 """Test cases for the Github service module."""
 import unittest
+from typing import Any
+from typing import Dict
 from typing import List
 
 import github3
 import pytest
+import requests
+from _pytest.tmpdir import Path
 from pytest_mock import MockerFixture
 
+import git_portfolio.defaults as dfl
 import git_portfolio.domain.gh_connection_settings as cs
 import git_portfolio.domain.issue as i
 import git_portfolio.domain.pull_request as pr
 import git_portfolio.domain.pull_request_merge as mpr
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.github_service as gc
+import git_portfolio.issue_mirror as im
+import git_portfolio.local_cache as lc
+import git_portfolio.rate_limit as rl
 import git_portfolio.request_objects.issue_list as il
 
 
 REPO = "org/reponame"
 REPO2 = "org/reponame2"
+API_URL = "https://api.github.com"
 INVALID_REQUEST_ISSUES = il.IssueListInvalidRequest()
 NO_FILTER_REQUEST_ISSUES = il.IssueListValidRequest()
+PULL_NODE = {"id": "PR_7", "number": 7, "headRepositoryOwner": {"login": "org name"}}
 
 
 @pytest.fixture
@@ -103,10 +114,19 @@ def mock_github3_login(mocker: MockerFixture) -> MockerFixture:
     mock_repo2 = mocker.Mock(full_name=REPO2)
 
     mock = mocker.patch("github3.login", autospec=True)
-    mock.return_value.repositories.return_value = [
-        mock_repo2,
-        mock_repo,
+    mock.return_value.session = mocker.Mock(base_url=API_URL)
+    mock.return_value.session.build_url.return_value = f"{API_URL}/user/repos"
+    mock.return_value.session.get.return_value = mocker.Mock(
+        status_code=200, headers={"ETag": "etag1"}, links={}
+    )
+    mock.return_value.session.get.return_value.json.return_value = [
+        {"full_name": REPO2},
+        {"full_name": REPO},
     ]
+    mock.return_value.repository.side_effect = lambda owner, name: {
+        REPO: mock_repo,
+        REPO2: mock_repo2,
+    }.get(f"{owner}/{name}")
     return mock
 
 
@@ -124,6 +144,103 @@ def test_init_github_com(
     gc.GithubService(domain_gh_conn_settings[0])
 
 
+def test_get_connection_reused(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It does not login again."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+
+    assert service._get_connection() is service.connection
+    mock_github3_login.assert_called_once()
+
+
+def test_init_rate_limit(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It schedules requests and reports budget seen."""
+    session = mock_github3_login.return_value.session
+    send = session.request
+    send.return_value = mocker.Mock(
+        status_code=200,
+        headers={
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": "2000",
+        },
+    )
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    session.request("GET", f"{API_URL}/user")
+
+    send.assert_called_once_with("GET", f"{API_URL}/user")
+    assert service.get_rate_limit_budget() == {"core": rl.Budget(5000, 4999, 2000)}
+
+
+def test_fetch_rate_limit_budget(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It reports budgets of rate limit endpoint."""
+    session = mock_github3_login.return_value.session
+    session.get.return_value = mocker.Mock(status_code=200)
+    session.get.return_value.json.return_value = {
+        "resources": {
+            "core": {"limit": 5000, "remaining": 4990, "reset": 2000},
+            "search": {"limit": 30, "remaining": 30, "reset": 1000},
+        }
+    }
+    service = gc.GithubService(domain_gh_conn_settings[0])
+
+    assert service.fetch_rate_limit_budget() == {
+        "core": rl.Budget(5000, 4990, 2000),
+        "search": rl.Budget(30, 30, 1000),
+    }
+    session.build_url.assert_called_with("rate_limit")
+
+
+@pytest.mark.parametrize("error", [None, requests.ConnectionError])
+def test_fetch_rate_limit_budget_error(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    error: Any,
+) -> None:
+    """It reports budgets seen when endpoint fails."""
+    session = mock_github3_login.return_value.session
+    session.get.return_value = mocker.Mock(status_code=404)
+    session.get.side_effect = error
+    service = gc.GithubService(domain_gh_conn_settings[0])
+
+    assert service.fetch_rate_limit_budget() == {}
+
+
+def test_init_pool(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It mounts an adapter with pool size."""
+    gc.GithubService(domain_gh_conn_settings[0], pool_size=32)
+
+    session = mock_github3_login.return_value.session
+    adapter = session.mount.call_args[0][1]
+    assert adapter._pool_maxsize == 32
+    assert session.mount.call_args_list[0][0] == ("https://", adapter)
+
+
+def test_init_graphql_backend(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It creates GraphQL reader."""
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+
+    assert service.graphql is not None
+    assert service.graphql.url == f"{API_URL}/graphql"
+
+
 def test_init_github_entreprise(
     domain_gh_conn_settings: List[cs.GhConnectionSettings],
     mock_github3_enterprise_login: MockerFixture,
@@ -131,6 +248,25 @@ def test_init_github_entreprise(
     """It succeeds."""
     gc.GithubService(domain_gh_conn_settings[1])
 
+    mock_github3_enterprise_login.assert_called_once_with(
+        url="https://myhost.com", token="mytoken"
+    )
+
+
+def test_init_github_entreprise_scheme(
+    mock_github3_enterprise_login: MockerFixture,
+) -> None:
+    """It keeps scheme of hostname."""
+    settings = cs.GhConnectionSettings("mytoken", "http://localhost:8080")
+    service = gc.GithubService(settings)
+    repo = mock_github3_enterprise_login.return_value.repository.return_value
+    repo.full_name = REPO
+
+    mock_github3_enterprise_login.assert_called_once_with(
+        url="http://localhost:8080", token="mytoken"
+    )
+    assert service.get_repo_url(REPO) == f"git@localhost:8080:{REPO}.git"
+
 
 def test_init_invalid_token(
     mocker: MockerFixture,
@@ -141,7 +277,7 @@ def test_init_invalid_token(
     mock_github3_login.return_value.me.side_effect = (
         github3.exceptions.AuthenticationFailed(mocker.Mock())
     )
-    with pytest.raises(AttributeError) as excinfo:
+    with pytest.raises(cs.AuthError) as excinfo:
         gc.GithubService(domain_gh_conn_settings[0])
 
     assert "Invalid token." == str(excinfo.value)
@@ -156,7 +292,7 @@ def test_init_invalid_token_scope(
     mock_github3_login.return_value.me.side_effect = (
         github3.exceptions.IncompleteResponse(mocker.Mock(), mocker.Mock())
     )
-    with pytest.raises(AttributeError) as excinfo:
+    with pytest.raises(cs.AuthError) as excinfo:
         gc.GithubService(domain_gh_conn_settings[0])
 
     assert "Invalid response. Your token might not be properly scoped." == str(
@@ -191,14 +327,168 @@ def test_get_config(
 def test_get_repo_no_repo(
     mocker: MockerFixture, domain_gh_conn_settings: List[cs.GhConnectionSettings]
 ) -> None:
-    """It returns None."""
+    """It raises NameError."""
     mock = mocker.patch("github3.login", autospec=True)
-    mock.return_value.repositories.return_value = []
+    mock.return_value.repository.side_effect = github3.exceptions.NotFoundError(
+        mocker.Mock(status_code=404)
+    )
 
     with pytest.raises(NameError):
         gc.GithubService(domain_gh_conn_settings[0])._get_repo(REPO)
 
 
+def test_get_repo_fetches_once(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It fetches the repo directly only once without listing all repos."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    repo = service._get_repo(REPO)
+
+    assert service._get_repo(REPO) is repo
+    mock_github3_login.return_value.repository.assert_called_once_with(
+        "org", "reponame"
+    )
+    mock_github3_login.return_value.session.get.assert_not_called()
+
+
+def test_get_repo_names_listed_once(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It lists repos only once."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.get_repo_names()
+    service.get_repo_names()
+
+    mock_github3_login.return_value.session.get.assert_called_once_with(
+        f"{API_URL}/user/repos?per_page=100", headers={}
+    )
+
+
+def test_start_prefetch_catalog(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It lists repos in background only once."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.start_prefetch_catalog()
+    service.prefetcher.get("catalog")
+    service.get_repo_names()
+    service.start_prefetch_catalog()
+
+    mock_github3_login.return_value.session.get.assert_called_once_with(
+        f"{API_URL}/user/repos?per_page=100", headers={}
+    )
+
+
+def test_requests_sent(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It returns requests counted by the rate limit scheduler."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.rate_limit.sent.count = 3
+
+    assert service.requests_sent() == 3
+
+
+def test_get_repo_names_paginated(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It follows next page links."""
+    page1 = mocker.Mock(
+        status_code=200,
+        headers={"ETag": "etag1"},
+        links={"next": {"url": f"{API_URL}/user/repos?page=2"}},
+    )
+    page1.json.return_value = [{"full_name": REPO}]
+    page2 = mocker.Mock(status_code=200, headers={"ETag": "etag2"}, links={})
+    page2.json.return_value = [{"full_name": REPO2}]
+    mock_github3_login.return_value.session.get.side_effect = [page1, page2]
+
+    result = gc.GithubService(domain_gh_conn_settings[0]).get_repo_names()
+
+    assert result == [REPO, REPO2]
+
+
+def test_get_repo_names_error(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It raises Github errors."""
+    mock_github3_login.return_value.session.get.return_value = mocker.Mock(
+        status_code=500
+    )
+
+    with pytest.raises(github3.exceptions.ServerError):
+        gc.GithubService(domain_gh_conn_settings[0]).get_repo_names()
+
+
+def test_get_repo_names_fresh_cache(
+    tmp_path: Path,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It uses cached names without requests."""
+    cache = lc.LocalCache(str(tmp_path), "catalog.json", 60)
+    gc.GithubService(domain_gh_conn_settings[0], cache).get_repo_names()
+    result = gc.GithubService(domain_gh_conn_settings[0], cache).get_repo_names()
+
+    assert result == [REPO2, REPO]
+    mock_github3_login.return_value.session.get.assert_called_once()
+
+
+def test_get_repo_names_expired_cache(
+    mocker: MockerFixture,
+    tmp_path: Path,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It revalidates cached pages with conditional requests."""
+    cache = lc.LocalCache(str(tmp_path), "catalog.json", 0)
+    gc.GithubService(domain_gh_conn_settings[0], cache).get_repo_names()
+    session = mock_github3_login.return_value.session
+    session.get.return_value = mocker.Mock(status_code=304)
+    result = gc.GithubService(domain_gh_conn_settings[0], cache).get_repo_names()
+
+    assert result == [REPO2, REPO]
+    session.get.assert_called_with(
+        f"{API_URL}/user/repos?per_page=100", headers={"If-None-Match": "etag1"}
+    )
+
+
+def test_refresh_catalog(
+    tmp_path: Path,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It revalidates fresh cache and returns repo count."""
+    cache = lc.LocalCache(str(tmp_path), "catalog.json", 60)
+    gc.GithubService(domain_gh_conn_settings[0], cache).get_repo_names()
+    service = gc.GithubService(domain_gh_conn_settings[0], cache)
+    result = service.refresh_catalog()
+
+    assert result == 2
+    assert service.catalog_names == set(service.get_repo_names())
+    assert mock_github3_login.return_value.session.get.call_count == 2
+
+
+def test_get_repo_not_in_catalog(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It raises NameError."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.get_repo_names()
+
+    with pytest.raises(NameError):
+        service._get_repo("org/other")
+
+
 def test_get_repo_url_success(
     mocker: MockerFixture,
     domain_gh_conn_settings: List[cs.GhConnectionSettings],
@@ -211,12 +501,59 @@ def test_get_repo_url_success(
     assert result == expected
 
 
+def test_prefetch_repo_urls_rest(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It does nothing."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.prefetch_repo_urls([REPO])
+
+    assert service.repo_urls == {}
+    mock_github3_login.return_value.session.post.assert_not_called()
+
+
+def test_prefetch_repo_urls_graphql(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It reads URLs of all repos in one request."""
+    mock_graphql_data(
+        mock_github3_login,
+        {"r0": {"sshUrl": "git@github.com:org/reponame.git"}, "r1": None},
+    )
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.prefetch_repo_urls([REPO, REPO2])
+    mock_github3_login.return_value.repository.reset_mock()
+
+    assert service.get_repo_url(REPO) == f"git@github.com:{REPO}.git"
+    mock_github3_login.return_value.repository.assert_not_called()
+    assert service.get_repo_url(REPO2) == f"git@github.com:{REPO2}.git"
+    mock_github3_login.return_value.session.post.assert_called_once()
+
+
+def test_prefetch_repo_urls_graphql_error(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It leaves URLs to be read one by one."""
+    response = mock_github3_login.return_value.session.post.return_value
+    response.status_code = 200
+    response.json.return_value = {"errors": [{"message": "bad"}]}
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.prefetch_repo_urls([REPO])
+
+    assert service.repo_urls == {}
+
+
 def test_get_repo_url_no_repo(
     mocker: MockerFixture, domain_gh_conn_settings: List[cs.GhConnectionSettings]
 ) -> None:
-    """It returns None."""
+    """It raises NameError."""
     mock = mocker.patch("github3.login", autospec=True)
-    mock.return_value.repositories.return_value = []
+    mock.return_value.repository.side_effect = github3.exceptions.NotFoundError(
+        mocker.Mock(status_code=404)
+    )
 
     with pytest.raises(NameError):
         gc.GithubService(domain_gh_conn_settings[0]).get_repo_url(REPO)
@@ -245,6 +582,100 @@ def test_get_username(
     assert result == expected
 
 
+@pytest.fixture
+def identity_cache(tmp_path: Path) -> lc.LocalCache:
+    """Identity cache fixture."""
+    return lc.LocalCache(str(tmp_path), dfl.IDENTITY_CACHE_FILENAME, dfl.IDENTITY_TTL)
+
+
+def test_identity_cached(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    identity_cache: lc.LocalCache,
+) -> None:
+    """It tests connection once and then reuses cached identity."""
+    mock_github3_login.return_value.me.return_value.login = "staticdev"
+    gc.GithubService(domain_gh_conn_settings[0], identity_cache=identity_cache)
+    service = gc.GithubService(
+        domain_gh_conn_settings[0], identity_cache=identity_cache
+    )
+
+    mock_github3_login.return_value.me.assert_called_once()
+    assert service.get_username() == "staticdev"
+    key = lc.fingerprint("", "mytoken")
+    entry = identity_cache.get(key)
+    assert entry is not None
+    assert entry["hostname"] == ""
+
+
+def test_identity_expired(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    """It tests connection again."""
+    mock_github3_login.return_value.me.return_value.login = "staticdev"
+    cache = lc.LocalCache(str(tmp_path), dfl.IDENTITY_CACHE_FILENAME, 0)
+    gc.GithubService(domain_gh_conn_settings[0], identity_cache=cache)
+    gc.GithubService(domain_gh_conn_settings[0], identity_cache=cache)
+
+    assert mock_github3_login.return_value.me.call_count == 2
+
+
+def test_identity_records_scopes(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    identity_cache: lc.LocalCache,
+) -> None:
+    """It keeps scopes of token from responses."""
+    session = mock_github3_login.return_value.session
+    session.request.return_value = mocker.Mock(
+        status_code=200, headers={"X-OAuth-Scopes": "repo, user"}
+    )
+
+    def me() -> Any:
+        session.request("GET", f"{API_URL}/user")
+        return mocker.Mock(login="staticdev")
+
+    mock_github3_login.return_value.me.side_effect = me
+    gc.GithubService(domain_gh_conn_settings[0], identity_cache=identity_cache)
+    service = gc.GithubService(
+        domain_gh_conn_settings[0], identity_cache=identity_cache
+    )
+
+    assert service.token_scopes == "repo, user"
+
+
+def test_identity_auth_error_tests_connection(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    identity_cache: lc.LocalCache,
+) -> None:
+    """It drops cached identity and tests connection on first auth error."""
+    mock_github3_login.return_value.me.return_value.login = "staticdev"
+    session = mock_github3_login.return_value.session
+    session.request.return_value = mocker.Mock(status_code=401, headers={})
+    gc.GithubService(domain_gh_conn_settings[0], identity_cache=identity_cache)
+    service = gc.GithubService(
+        domain_gh_conn_settings[0], identity_cache=identity_cache
+    )
+    mock_github3_login.return_value.me.side_effect = (
+        github3.exceptions.AuthenticationFailed(mocker.Mock())
+    )
+
+    with pytest.raises(cs.AuthError, match="Invalid token."):
+        session.request("GET", f"{API_URL}/repos/org/reponame")
+    assert identity_cache.get(lc.fingerprint("", "mytoken")) is None
+
+    # later requests fail alike, without testing connection again
+    with pytest.raises(cs.AuthError, match="Invalid token."):
+        session.request("GET", f"{API_URL}/repos/org/reponame")
+    assert mock_github3_login.return_value.me.call_count == 2
+    assert service.identity_verified is True
+
+
 def test_create_issue_from_repo_success(
     domain_gh_conn_settings: List[cs.GhConnectionSettings],
     mock_github3_login: MockerFixture,
@@ -255,7 +686,7 @@ def test_create_issue_from_repo_success(
         REPO, domain_issues[0]
     )
 
-    assert response == f"{REPO}: create issue successful.\n"
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: create issue successful.\n")
 
 
 def test_create_issue_from_repo_fork(
@@ -269,13 +700,15 @@ def test_create_issue_from_repo_fork(
     exception_mock.json.return_value.get.return_value = (
         "Issues are disabled for this repo"
     )
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_issue.side_effect = github3.exceptions.ClientError(exception_mock)
     response = gc.GithubService(domain_gh_conn_settings[0]).create_issue_from_repo(
         REPO, domain_issues[0]
     )
 
-    assert response == f"{REPO}: Issues are disabled for this repo. It may be a fork.\n"
+    assert response == rr.Output(
+        rr.SKIPPED, f"{REPO}: Issues are disabled for this repo. It may be a fork.\n"
+    )
 
 
 def test_create_issue_from_repo_other_client_error(
@@ -287,13 +720,13 @@ def test_create_issue_from_repo_other_client_error(
     """It gives the message error returned from the API."""
     exception_mock = mocker.Mock()
     exception_mock.json.return_value.get.return_value = "returned message"
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_issue.side_effect = github3.exceptions.ClientError(exception_mock)
     response = gc.GithubService(domain_gh_conn_settings[0]).create_issue_from_repo(
         REPO, domain_issues[0]
     )
 
-    assert response == f"{REPO}: returned message.\n"
+    assert response == rr.Output(rr.ERROR, f"{REPO}: returned message.\n")
 
 
 def test_create_issue_from_repo_other_error(
@@ -305,7 +738,7 @@ def test_create_issue_from_repo_other_error(
     """It gives the message error returned from the API."""
     exception_mock = mocker.Mock()
     exception_mock.json.return_value.get.return_value = "returned message"
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_issue.side_effect = github3.exceptions.ForbiddenError(exception_mock)
 
     with pytest.raises(AttributeError, match="org/reponame: returned message"):
@@ -329,13 +762,13 @@ def test_list_issues_from_repo_title_filter(
     label3.name = "testing"
 
     issue1 = mocker.Mock(title="issue title", number=3)
-    issue1.labels.return_value = []
+    issue1.original_labels = []
     issue2 = mocker.Mock(title="doesnt match title", number=4)
-    issue2.labels.return_value = [label1]
+    issue2.original_labels = [label1]
     issue3 = mocker.Mock(title="pr match issue title", number=5)
-    issue3.labels.return_value = [label2, label3]
+    issue3.original_labels = [label2, label3]
 
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.issues.return_value = [
         issue1,
         issue2,
@@ -355,6 +788,8 @@ def test_list_issues_from_repo_title_filter(
     assert response[0].title == domain_issues[3].title
     assert response[1].number == domain_issues[4].number
     assert response[1].title == domain_issues[4].title
+    assert response[1].labels == domain_issues[4].labels
+    issue3.labels.assert_not_called()
 
 
 @pytest.mark.parametrize("value", ["issue", "pull request"])
@@ -372,13 +807,13 @@ def test_list_issues_from_repo_obj_filter(
     label2.name = "testing"
 
     issue1 = mocker.Mock(title="issue title", number=3, pull_request_urls=None)
-    issue1.labels.return_value = []
+    issue1.original_labels = []
     issue2 = mocker.Mock(
         title="pr match issue title", number=5, pull_request_urls="something"
     )
-    issue2.labels.return_value = [label1, label2]
+    issue2.original_labels = [label1, label2]
 
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.issues.return_value = [
         issue1,
         issue2,
@@ -420,12 +855,12 @@ def test_list_issues_from_repo_no_filter_request(
     domain_issues: List[i.Issue],
     mock_github3_login: MockerFixture,
 ) -> None:
-    """It returns empty result."""
+    """It returns domain issues."""
     issue1 = mocker.Mock(title="issue title", number=3)
-    issue1.labels.return_value = []
+    issue1.original_labels = []
     issue2 = mocker.Mock(title="doesnt match title", number=4)
-    issue2.labels.return_value = []
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    issue2.original_labels = []
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.issues.return_value = [
         issue1,
         issue2,
@@ -436,24 +871,588 @@ def test_list_issues_from_repo_no_filter_request(
     )
 
     assert len(response) == 2
+    assert all(isinstance(issue, i.Issue) for issue in response)
     assert response[0].number == domain_issues[3].number
     assert response[1].number == domain_issues[2].number
     assert response[0].title == domain_issues[3].title
     assert response[1].title == domain_issues[2].title
 
 
+@pytest.fixture
+def mock_search_issues(
+    mocker: MockerFixture, mock_github3_login: MockerFixture
+) -> MockerFixture:
+    """Fixture for mocking search results of two repos."""
+    issue1 = mocker.Mock(
+        title="issue title",
+        number=3,
+        html_url=f"https://github.com/{REPO}/issues/3",
+        original_labels=[],
+    )
+    issue2 = mocker.Mock(
+        title="my issue title",
+        number=0,
+        html_url=f"https://github.com/{REPO2.upper()}/issues/0",
+        original_labels=[],
+    )
+    issue3 = mocker.Mock(
+        title="issue words title",
+        number=4,
+        html_url=f"https://github.com/{REPO2}/issues/4",
+        original_labels=[],
+    )
+    results = mocker.MagicMock(total_count=3)
+    results.last_response.json.return_value = {"incomplete_results": False}
+    results.__iter__.return_value = [
+        mocker.Mock(issue=issue1),
+        mocker.Mock(issue=issue2),
+        mocker.Mock(issue=issue3),
+    ]
+    mock = mock_github3_login.return_value.search_issues
+    mock.return_value = results
+    return mock
+
+
+def mock_graphql_data(mock_github3_login: MockerFixture, data: Dict[str, Any]) -> None:
+    """Set data returned by GraphQL queries."""
+    response = mock_github3_login.return_value.session.post.return_value
+    response.status_code = 200
+    response.json.return_value = {"data": data}
+
+
+def test_list_issues_from_repos_rest(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It uses search API."""
+    request = il.IssueListValidRequest(filters={"state__eq": "open"})
+    response = gc.GithubService(domain_gh_conn_settings[0]).list_issues_from_repos(
+        [REPO, REPO2], request
+    )
+
+    mock_search_issues.assert_called_once()
+    assert list(response) == [REPO, REPO2]
+
+
+def test_list_issues_from_repos_graphql(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It reads all repos in one request instead of one listing per repo."""
+    repos = [f"org/repo{n}" for n in range(20)]
+    node = {
+        "id": "I_1",
+        "number": 1,
+        "title": "issue title",
+        "body": "",
+        "state": "OPEN",
+        "labels": {"nodes": []},
+    }
+    page = {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [node]}
+    mock_graphql_data(
+        mock_github3_login, {f"r{n}": {"issues": page} for n in range(len(repos))}
+    )
+    request = il.IssueListValidRequest(
+        filters={"obj__eq": "issue", "state__eq": "open"}
+    )
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    response = service.list_issues_from_repos(repos, request)
+
+    assert sorted(response) == sorted(repos)
+    assert mock_github3_login.return_value.session.post.call_count == 1
+    mock_github3_login.return_value.repository.assert_not_called()
+    mock_search_issues.assert_not_called()
+
+
+def test_list_issues_from_repos_prefetched(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It filters open issues listed in background."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.start_prefetch_open_issues([REPO, REPO2], "issue")
+    request = il.IssueListValidRequest(
+        filters={"obj__eq": "issue", "state__eq": "open", "title__contains": "my"}
+    )
+    response = service.list_issues_from_repos([REPO2], request)
+
+    assert [issue.title for issue in response[REPO2]] == ["my issue title"]
+    assert list(response) == [REPO2]
+    mock_search_issues.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"obj__eq": "issue", "state__eq": "closed"},
+        {"obj__eq": "issue", "state__eq": "open", "labels__contains": "bug"},
+        {"obj__eq": "pull request", "state__eq": "open"},
+    ],
+)
+def test_list_issues_from_repos_not_prefetched(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+    filters: Dict[str, str],
+) -> None:
+    """It lists issues matching other requests again."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.start_prefetch_open_issues([REPO, REPO2], "issue")
+    service.prefetcher.get(("issues", "issue"))
+    list_issues = mocker.spy(service, "_list_issues_from_repos")
+    request = il.IssueListValidRequest(filters=filters)
+    service.list_issues_from_repos([REPO, REPO2], request)
+
+    list_issues.assert_called_once_with([REPO, REPO2], request)
+
+
+def test_list_issues_from_repos_invalid_request_not_prefetched(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It returns empty result."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.start_prefetch_open_issues([REPO], "issue")
+    response = service.list_issues_from_repos([REPO], il.IssueListInvalidRequest())
+
+    assert response == {}
+
+
+def test_list_issues_from_repos_prefetch_error(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It lists issues again."""
+    mock_search_issues.side_effect = [
+        github3.exceptions.GitHubError(mocker.Mock()),
+        mock_search_issues.return_value,
+    ]
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.start_prefetch_open_issues([REPO, REPO2], "issue")
+    request = il.IssueListValidRequest(
+        filters={"obj__eq": "issue", "state__eq": "open"}
+    )
+    response = service.list_issues_from_repos([REPO, REPO2], request)
+
+    assert list(response) == [REPO, REPO2]
+    assert mock_search_issues.call_count == 2
+
+
+def test_cancel_prefetch(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It lists issues again after cancelling."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.start_prefetch_open_issues([REPO, REPO2], "issue")
+    service.prefetcher.get(("issues", "issue"))
+    service.cancel_prefetch()
+    request = il.IssueListValidRequest(
+        filters={"obj__eq": "issue", "state__eq": "open"}
+    )
+    service.list_issues_from_repos([REPO, REPO2], request)
+
+    assert mock_search_issues.call_count == 2
+
+
+def test_list_issues_from_repos_graphql_no_filter(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It reads issues and pull requests."""
+    page = {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []}
+    mock_graphql_data(
+        mock_github3_login, {"r0": {"issues": page, "pullRequests": page}}
+    )
+    response = gc.GithubService(
+        domain_gh_conn_settings[0], read_backend="graphql"
+    ).list_issues_from_repos([REPO], NO_FILTER_REQUEST_ISSUES)
+
+    assert response == {REPO: []}
+    assert mock_github3_login.return_value.session.post.call_count == 2
+
+
+def test_list_issues_from_repos_graphql_invalid_request(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It returns no repos."""
+    response = gc.GithubService(
+        domain_gh_conn_settings[0], read_backend="graphql"
+    ).list_issues_from_repos([REPO], INVALID_REQUEST_ISSUES)
+
+    assert response == {}
+    mock_github3_login.return_value.session.post.assert_not_called()
+
+
+def test_list_issues_from_repos_graphql_error(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It returns no repos."""
+    mock_github3_login.return_value.session.post.return_value.status_code = 502
+    response = gc.GithubService(
+        domain_gh_conn_settings[0], read_backend="graphql"
+    ).list_issues_from_repos([REPO], NO_FILTER_REQUEST_ISSUES)
+
+    assert response == {}
+
+
+ISSUES_URL = f"{API_URL}/repos/{REPO}/issues"
+FIRST_SYNC_URL = f"{ISSUES_URL}?state=open&sort=updated&direction=asc&per_page=100"
+SINCE = "2021-01-02T00%3A00%3A00Z"
+DELTA_SYNC_URL = (
+    f"{ISSUES_URL}?state=all&sort=updated&direction=asc&per_page=100&since={SINCE}"
+)
+
+
+def issue_json(
+    number: int, state: str = "open", pull_request: bool = False
+) -> Dict[str, Any]:
+    """Return issue as listed by REST API."""
+    issue = {
+        "number": number,
+        "node_id": f"I_{number}",
+        "title": f"issue title {number}",
+        "body": "",
+        "labels": [],
+        "state": state,
+        "updated_at": f"2021-01-0{number}T00:00:00Z",
+    }
+    if pull_request:
+        issue["pull_request"] = {"url": f"{ISSUES_URL}/{number}"}
+    return issue
+
+
+def issues_page(
+    mocker: MockerFixture, issues: List[Dict[str, Any]], next_url: str = ""
+) -> Any:
+    """Return response with page of issues."""
+    response = mocker.Mock(
+        status_code=200,
+        headers={"ETag": f"etag{len(issues)}"},
+        links={"next": {"url": next_url}} if next_url else {},
+    )
+    response.json.return_value = issues
+    return response
+
+
+@pytest.fixture
+def issue_mirror(tmp_path: Path, mock_github3_login: MockerFixture) -> im.IssueMirror:
+    """Fixture for an empty issue mirror, issues of REPO listed by session."""
+    session = mock_github3_login.return_value.session
+    session.build_url.return_value = ISSUES_URL
+    return im.IssueMirror(str(tmp_path), "issues.sqlite3")
+
+
+def test_sync_issue_mirror(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    issue_mirror: im.IssueMirror,
+) -> None:
+    """It lists open issues, then changes since, then revalidates listing."""
+    session = mock_github3_login.return_value.session
+    session.get.side_effect = [
+        issues_page(mocker, [issue_json(1)], f"{FIRST_SYNC_URL}&page=2"),
+        issues_page(mocker, [issue_json(2, pull_request=True)]),
+        issues_page(mocker, [issue_json(1, state="closed"), issue_json(2)]),
+        mocker.Mock(status_code=304),
+    ]
+    service = gc.GithubService(domain_gh_conn_settings[0], issue_mirror=issue_mirror)
+    account = service._identity_key()
+
+    assert service.sync_issue_mirror([REPO]) == [REPO]
+    assert issue_mirror.get_sync(account, REPO) == im.SyncState(
+        "2021-01-02T00:00:00Z", FIRST_SYNC_URL, "etag1"
+    )
+    assert [issue.number for issue in issue_mirror.list_open(account, REPO, None)] == [
+        2,
+        1,
+    ]
+    assert service.sync_issue_mirror([REPO]) == [REPO]
+    assert service.sync_issue_mirror([REPO]) == [REPO]
+    assert [issue.number for issue in issue_mirror.list_open(account, REPO, None)] == [
+        2
+    ]
+    assert session.get.call_args_list == [
+        mocker.call(FIRST_SYNC_URL, headers={}),
+        mocker.call(f"{FIRST_SYNC_URL}&page=2", headers={}),
+        mocker.call(DELTA_SYNC_URL, headers={}),
+        mocker.call(DELTA_SYNC_URL, headers={"If-None-Match": "etag2"}),
+    ]
+
+
+def test_sync_issue_mirror_error(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    issue_mirror: im.IssueMirror,
+) -> None:
+    """It leaves out repos failing, keeping pages saved before the error."""
+    mock_github3_login.return_value.session.get.side_effect = [
+        issues_page(mocker, [issue_json(1)], f"{FIRST_SYNC_URL}&page=2"),
+        mocker.Mock(status_code=502),
+    ]
+    service = gc.GithubService(domain_gh_conn_settings[0], issue_mirror=issue_mirror)
+
+    assert service.sync_issue_mirror([REPO]) == []
+    assert issue_mirror.get_sync(service._identity_key(), REPO).since == (
+        "2021-01-01T00:00:00Z"
+    )
+
+
+def test_sync_issue_mirror_disabled(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It syncs no repos."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+
+    assert service.sync_issue_mirror([REPO]) == []
+
+
+def test_list_issues_from_repos_mirror(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    mock_search_issues: MockerFixture,
+    issue_mirror: im.IssueMirror,
+) -> None:
+    """It filters open objects of mirror after syncing it."""
+    mock_github3_login.return_value.session.get.return_value = issues_page(
+        mocker, [issue_json(1), issue_json(2), issue_json(3, pull_request=True)]
+    )
+    request = il.IssueListValidRequest(
+        filters={"obj__eq": "issue", "state__eq": "open", "title__contains": "2"}
+    )
+    response = gc.GithubService(
+        domain_gh_conn_settings[0], issue_mirror=issue_mirror
+    ).list_issues_from_repos([REPO], request)
+
+    assert response == {REPO: [i.Issue(2, "issue title 2", "", set(), "I_2", "open")]}
+    mock_search_issues.assert_not_called()
+
+
+def test_list_issues_from_repo_mirror(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    issue_mirror: im.IssueMirror,
+) -> None:
+    """It lists open objects of mirror after syncing it."""
+    mock_github3_login.return_value.session.get.return_value = issues_page(
+        mocker, [issue_json(1), issue_json(2, pull_request=True)]
+    )
+    request = il.IssueListValidRequest(filters={"state__eq": "open"})
+    response = gc.GithubService(
+        domain_gh_conn_settings[0], issue_mirror=issue_mirror
+    ).list_issues_from_repo(REPO, request)
+
+    assert [issue.number for issue in response] == [2, 1]
+    mock_github3_login.return_value.repository.assert_not_called()
+
+
+def test_list_issues_from_repo_mirror_not_synced(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    issue_mirror: im.IssueMirror,
+) -> None:
+    """It lists issues of repo instead."""
+    mock_github3_login.return_value.session.get.return_value = mocker.Mock(
+        status_code=404
+    )
+    repo = mock_github3_login.return_value.repository("org", "reponame")
+    repo.issues.return_value = []
+    request = il.IssueListValidRequest(filters={"state__eq": "open"})
+    response = gc.GithubService(
+        domain_gh_conn_settings[0], issue_mirror=issue_mirror
+    ).list_issues_from_repo(REPO, request)
+
+    assert response == []
+
+
+def test_search_issues_from_repos(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It searches all repos at once and groups issues by repo."""
+    request = il.IssueListValidRequest(
+        filters={
+            "obj__eq": "issue",
+            "state__eq": "open",
+            "title__contains": "issue title",
+        }
+    )
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO, REPO2], request)
+
+    mock_search_issues.assert_called_once_with(
+        f"is:issue is:open repo:{REPO} repo:{REPO2}",
+        per_page=100,
+    )
+    assert [issue.number for issue in response[REPO]] == [3]
+    assert [issue.number for issue in response[REPO2]] == [0]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"state__eq": "merged"},
+    ],
+)
+def test_search_issues_from_repos_not_expressible(
+    filters: Dict[str, str],
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It returns no repos without searching."""
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO], il.IssueListValidRequest(filters=filters))
+
+    assert response == {}
+    mock_search_issues.assert_not_called()
+
+
+def test_search_issues_from_repos_invalid_request(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It returns no repos."""
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO], INVALID_REQUEST_ISSUES)
+
+    assert response == {}
+
+
+def test_search_issues_from_repos_chunks(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It splits repos to respect query length and skips too long names."""
+    repos = [f"org/{'x' * 60}{n}" for n in range(5)] + [f"org/{'y' * 300}"]
+    request = il.IssueListValidRequest(
+        filters={"obj__eq": "pull request", "state__eq": "all"}
+    )
+    gc.GithubService(domain_gh_conn_settings[0]).search_issues_from_repos(
+        repos, request
+    )
+
+    queries = [call[0][0] for call in mock_search_issues.call_args_list]
+    assert len(queries) == 2
+    assert all(query.startswith("is:pr repo:") for query in queries)
+    assert all(len(query) <= gc.SEARCH_QUERY_MAX_LENGTH for query in queries)
+
+
+def test_search_issues_from_repos_incomplete(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It does not return repos of truncated searches."""
+    mock_search_issues.return_value.total_count = 1500
+    request = il.IssueListValidRequest(filters={"state__eq": "open"})
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO, REPO2], request)
+
+    assert response == {}
+
+
+def test_search_issues_from_repos_title_substring(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It matches title substrings like list API, not only whole words."""
+    request = il.IssueListValidRequest(filters={"title__contains": "sue"})
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO, REPO2], request)
+
+    assert [issue.number for issue in response[REPO]] == [3]
+    assert [issue.number for issue in response[REPO2]] == [0, 4]
+
+
+@pytest.mark.parametrize("results", [[], [0]])
+def test_search_issues_from_repos_incomplete_results(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+    results: List[int],
+) -> None:
+    """It does not return repos of searches that timed out."""
+    search = mock_search_issues.return_value
+    search.__iter__.return_value = [mocker.Mock() for _ in results]
+    search.total_count = len(results)
+    search.last_response.json.return_value = {"incomplete_results": True}
+    request = il.IssueListValidRequest(filters={"state__eq": "open"})
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO, REPO2], request)
+
+    assert response == {}
+
+
+def test_search_issues_from_repos_no_request(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It returns empty repos when no page was requested."""
+    search = mock_search_issues.return_value
+    search.__iter__.return_value = []
+    search.total_count = 0
+    search.last_response = None
+    request = il.IssueListValidRequest(filters={"state__eq": "open"})
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO], request)
+
+    assert response == {REPO: []}
+
+
+def test_search_issues_from_repos_error(
+    mocker: MockerFixture,
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_search_issues: MockerFixture,
+) -> None:
+    """It does not return repos of failed searches."""
+    mock_search_issues.return_value.__iter__.side_effect = (
+        github3.exceptions.UnprocessableEntity(mocker.Mock())
+    )
+    request = il.IssueListValidRequest(filters={"state__eq": "open"})
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).search_issues_from_repos([REPO, REPO2], request)
+
+    assert response == {}
+
+
 def test_close_issues_from_repo_success(
     domain_gh_conn_settings: List[cs.GhConnectionSettings],
     domain_issues: List[i.Issue],
     mock_github3_login: MockerFixture,
 ) -> None:
-    """It succeeds."""
-    mock_github3_login.return_value.issue().is_closed.return_value = False
+    """It closes each issue with one request on repo owner."""
+    session = mock_github3_login.return_value.session
+    session.patch.return_value.status_code = 200
     response = gc.GithubService(domain_gh_conn_settings[0]).close_issues_from_repo(
         REPO, domain_issues
     )
 
-    assert response == f"{REPO}: close issues successful.\n"
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: close issues successful.\n")
+    assert session.patch.call_count == len(domain_issues)
+    session.build_url.assert_called_with("repos", "org", "reponame", "issues", "5")
+    session.patch.assert_called_with(
+        session.build_url.return_value, json={"state": "closed"}
+    )
+    mock_github3_login.return_value.issue.assert_not_called()
 
 
 def test_close_issues_from_repo_no_issue(
@@ -462,26 +1461,42 @@ def test_close_issues_from_repo_no_issue(
     mock_github3_login: MockerFixture,
 ) -> None:
     """It returns a not issue message."""
-    mock_github3_login.return_value.issue().is_closed.return_value = False
     response = gc.GithubService(domain_gh_conn_settings[0]).close_issues_from_repo(
         REPO, []
     )
 
-    assert response == f"{REPO}: no issues match.\n"
+    assert response == rr.Output(rr.SKIPPED, f"{REPO}: no issues match.\n")
+    mock_github3_login.return_value.session.patch.assert_not_called()
 
 
 def test_close_issues_from_repo_already_closed(
     domain_gh_conn_settings: List[cs.GhConnectionSettings],
-    domain_issues: List[i.Issue],
     mock_github3_login: MockerFixture,
 ) -> None:
-    """It succeeds."""
-    mock_github3_login.return_value.issue().is_closed.return_value = True
+    """It succeeds without closing them again."""
+    issues = [i.Issue(1, "title", "body", set(), state="closed")]
     response = gc.GithubService(domain_gh_conn_settings[0]).close_issues_from_repo(
-        REPO, domain_issues
+        REPO, issues
     )
 
-    assert response == f"{REPO}: close issues successful.\n"
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: close issues successful.\n")
+    mock_github3_login.return_value.session.patch.assert_not_called()
+
+
+def test_close_issues_from_repo_error(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    domain_issues: List[i.Issue],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It raises AttributeError."""
+    response = mock_github3_login.return_value.session.patch.return_value
+    response.status_code = 403
+    response.json.return_value = {"message": "Must have admin rights"}
+
+    with pytest.raises(AttributeError, match="Must have admin rights"):
+        gc.GithubService(domain_gh_conn_settings[0]).close_issues_from_repo(
+            REPO, domain_issues
+        )
 
 
 def test_create_pull_request_from_repo_success(
@@ -494,7 +1509,7 @@ def test_create_pull_request_from_repo_success(
         domain_gh_conn_settings[0]
     ).create_pull_request_from_repo(REPO, domain_prs[0])
 
-    assert response == f"{REPO}: create PR successful.\n"
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: create PR successful.\n")
 
 
 def test_create_pull_request_from_repo_with_labels(
@@ -507,7 +1522,7 @@ def test_create_pull_request_from_repo_with_labels(
         domain_gh_conn_settings[0]
     ).create_pull_request_from_repo(REPO, domain_prs[1])
 
-    assert response == f"{REPO}: create PR successful.\n"
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: create PR successful.\n")
 
 
 # Details on mocking exception constructor at
@@ -530,13 +1545,15 @@ def test_create_pull_request_from_repo_invalid_branch(
         github3.exceptions.UnprocessableEntity, "__init__", _initiate_mocked_exception
     )
 
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_pull.side_effect = github3.exceptions.UnprocessableEntity
     response = gc.GithubService(
         domain_gh_conn_settings[0]
     ).create_pull_request_from_repo(REPO, domain_prs[1])
 
-    assert response == f"{REPO}: Validation Failed. Invalid field head.\n"
+    assert response == rr.Output(
+        rr.ERROR, f"{REPO}: Validation Failed. Invalid field head.\n"
+    )
 
 
 @pytest.mark.e2e
@@ -553,7 +1570,7 @@ def test_create_pull_request_from_repo_invalid_branch_unpatched_exception(
         "errors": [{"field": "head"}],
     }
 
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_pull.side_effect = github3.exceptions.UnprocessableEntity(
         mocked_response
     )
@@ -561,7 +1578,9 @@ def test_create_pull_request_from_repo_invalid_branch_unpatched_exception(
         domain_gh_conn_settings[0]
     ).create_pull_request_from_repo(REPO, domain_prs[1])
 
-    assert response == f"{REPO}: Validation Failed. Invalid field head.\n"
+    assert response == rr.Output(
+        rr.ERROR, f"{REPO}: Validation Failed. Invalid field head.\n"
+    )
 
 
 # Details on mocking exception constructor at
@@ -584,14 +1603,15 @@ def test_create_pull_request_from_repo_no_commits(
         github3.exceptions.UnprocessableEntity, "__init__", _initiate_mocked_exception
     )
 
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_pull.side_effect = github3.exceptions.UnprocessableEntity
     response = gc.GithubService(
         domain_gh_conn_settings[0]
     ).create_pull_request_from_repo(REPO, domain_prs[1])
 
-    assert response == (
-        f"{REPO}: Validation Failed. No commits between master and " "new-branch.\n"
+    assert response == rr.Output(
+        rr.ERROR,
+        f"{REPO}: Validation Failed. No commits between master and " "new-branch.\n",
     )
 
 
@@ -609,7 +1629,7 @@ def test_create_pull_request_from_repo_no_commits_unpatched_exception(
         "errors": [{"message": "No commits between master and new-branch"}],
     }
 
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_pull.side_effect = github3.exceptions.UnprocessableEntity(
         mocked_response
     )
@@ -617,8 +1637,9 @@ def test_create_pull_request_from_repo_no_commits_unpatched_exception(
         domain_gh_conn_settings[0]
     ).create_pull_request_from_repo(REPO, domain_prs[1])
 
-    assert response == (
-        f"{REPO}: Validation Failed. No commits between master and " "new-branch.\n"
+    assert response == rr.Output(
+        rr.ERROR,
+        f"{REPO}: Validation Failed. No commits between master and " "new-branch.\n",
     )
 
 
@@ -631,7 +1652,7 @@ def test_create_pull_request_from_repo_other_error(
     """It gives the message error returned from the API."""
     exception_mock = mocker.Mock()
     exception_mock.json.return_value.get.return_value = "returned message"
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.create_pull.side_effect = github3.exceptions.ForbiddenError(exception_mock)
 
     with pytest.raises(AttributeError, match="org/reponame: returned message"):
@@ -681,7 +1702,7 @@ def test_delete_branch_from_repo_success(
         REPO, domain_branch
     )
 
-    assert response == f"{REPO}: delete branch successful.\n"
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: delete branch successful.\n")
 
 
 def test_delete_branch_from_repo_branch_not_found(
@@ -701,14 +1722,14 @@ def test_delete_branch_from_repo_branch_not_found(
         github3.exceptions.NotFoundError, "__init__", _initiate_mocked_exception
     )
 
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.ref.side_effect = github3.exceptions.NotFoundError
 
     response = gc.GithubService(domain_gh_conn_settings[0]).delete_branch_from_repo(
         REPO, domain_branch
     )
 
-    assert response == f"{REPO}: Not found.\n"
+    assert response == rr.Output(rr.ERROR, f"{REPO}: Not found.\n")
 
 
 def test_delete_branch_from_repo_other_error(
@@ -720,7 +1741,7 @@ def test_delete_branch_from_repo_other_error(
     """It gives the message error returned from the API."""
     exception_mock = mocker.Mock()
     exception_mock.json.return_value.get.return_value = "returned message"
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.ref.side_effect = github3.exceptions.ForbiddenError(exception_mock)
 
     with pytest.raises(AttributeError, match="org/reponame: returned message"):
@@ -736,13 +1757,13 @@ def test_merge_pull_request_from_repo_success(
     domain_mpr: mpr.PullRequestMerge,
 ) -> None:
     """It succeeds."""
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.pull_requests.return_value = [mocker.Mock()]
     response = gc.GithubService(
         domain_gh_conn_settings[0]
     ).merge_pull_request_from_repo(REPO, domain_mpr)
 
-    assert response == f"{REPO}: merge PR successful.\n"
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: merge PR successful.\n")
 
 
 def test_merge_pull_request_from_repo_error_merging() -> None:
@@ -756,13 +1777,15 @@ def test_merge_pull_request_from_repo_not_found(
     domain_mpr: mpr.PullRequestMerge,
 ) -> None:
     """It gives error message."""
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.pull_requests.return_value = []
     response = gc.GithubService(
         domain_gh_conn_settings[0]
     ).merge_pull_request_from_repo(REPO, domain_mpr)
 
-    assert response == f"{REPO}: no open PR found for branch:main.\n"
+    assert response == rr.Output(
+        rr.SKIPPED, f"{REPO}: no open PR found for branch:main.\n"
+    )
 
 
 def test_merge_pull_request_from_repo_ambiguous(
@@ -772,10 +1795,239 @@ def test_merge_pull_request_from_repo_ambiguous(
     domain_mpr: mpr.PullRequestMerge,
 ) -> None:
     """It gives error message."""
-    repo = mock_github3_login.return_value.repositories.return_value[1]
+    repo = mock_github3_login.return_value.repository("org", "reponame")
     repo.pull_requests.return_value = [mocker.Mock(), mocker.Mock()]
     response = gc.GithubService(
         domain_gh_conn_settings[0]
     ).merge_pull_request_from_repo(REPO, domain_mpr)
 
-    assert response == f"{REPO}: unexpected number of PRs for branch:main.\n"
+    assert response == rr.Output(
+        rr.ERROR, f"{REPO}: unexpected number of PRs for branch:main.\n"
+    )
+
+
+def test_prefetch_pull_requests_rest(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It does nothing."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.prefetch_pull_requests([REPO], domain_mpr)
+
+    assert service.pull_numbers == {}
+
+
+def test_merge_pull_request_from_repo_prefetched(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It merges by number without listing PRs."""
+    pulls = {"nodes": [PULL_NODE]}
+    mock_graphql_data(mock_github3_login, {"r0": {"pullRequests": pulls}})
+    session = mock_github3_login.return_value.session
+    session.put.return_value.status_code = 200
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.prefetch_pull_requests([REPO], domain_mpr)
+    mock_github3_login.return_value.repository.reset_mock()
+    response = service.merge_pull_request_from_repo(REPO, domain_mpr)
+
+    assert response == rr.Output(rr.SUCCESS, f"{REPO}: merge PR successful.\n")
+    session.build_url.assert_called_with(
+        "repos", "org", "reponame", "pulls", "7", "merge"
+    )
+    session.put.assert_called_once_with(session.build_url.return_value, json={})
+    mock_github3_login.return_value.repository.assert_not_called()
+
+
+def test_merge_pull_request_from_repo_prefetched_error(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It raises GitHubError."""
+    pulls = {"nodes": [PULL_NODE]}
+    mock_graphql_data(mock_github3_login, {"r0": {"pullRequests": pulls}})
+    mock_github3_login.return_value.session.put.return_value.status_code = 405
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.prefetch_pull_requests([REPO], domain_mpr)
+
+    with pytest.raises(github3.exceptions.GitHubError):
+        service.merge_pull_request_from_repo(REPO, domain_mpr)
+
+
+def test_merge_pull_request_from_repo_prefetched_not_found(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It gives error message."""
+    mock_graphql_data(mock_github3_login, {"r0": {"pullRequests": {"nodes": []}}})
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.prefetch_pull_requests([REPO], domain_mpr)
+    response = service.merge_pull_request_from_repo(REPO, domain_mpr)
+
+    assert response == rr.Output(
+        rr.SKIPPED, f"{REPO}: no open PR found for branch:main.\n"
+    )
+
+
+def test_prefetch_pull_requests_graphql_error(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It leaves PRs to be looked up one by one."""
+    mock_github3_login.return_value.session.post.return_value.status_code = 502
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.prefetch_pull_requests([REPO], domain_mpr)
+
+    assert service.pull_numbers == {}
+
+
+def test_start_prefetch_pull_requests_rest(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It does not list PRs one repo at a time."""
+    service = gc.GithubService(domain_gh_conn_settings[0])
+    service.start_prefetch_pull_requests([REPO])
+
+    assert service.prefetcher.get("pulls") is None
+
+
+def test_prefetch_pull_requests_prefetched(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It finds PRs in listing and queries only repos not listed."""
+    node = {
+        "id": "PR_7",
+        "number": 7,
+        "baseRefName": "branch",
+        "headRefName": "main",
+        "headRepositoryOwner": {"login": "Org Name"},
+    }
+    other = dict(node, id="PR_8", number=8, headRefName="other")
+    pulls = {"pageInfo": {"hasNextPage": False}, "nodes": [node, other]}
+    mock_graphql_data(mock_github3_login, {"r0": {"pullRequests": pulls}})
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.start_prefetch_pull_requests([REPO])
+    service.prefetcher.get("pulls")
+    mock_graphql_data(
+        mock_github3_login, {"r0": {"pullRequests": {"nodes": [PULL_NODE]}}}
+    )
+    service.prefetch_pull_requests([REPO, REPO2], domain_mpr)
+
+    assert service.pull_numbers == {
+        (REPO, "branch", "org name:main"): [(7, "PR_7")],
+        (REPO2, "branch", "org name:main"): [(7, "PR_7")],
+    }
+    payload = mock_github3_login.return_value.session.post.call_args[1]["json"]
+    assert REPO2.split("/")[1] in str(payload["variables"])
+    assert mock_github3_login.return_value.session.post.call_count == 2
+
+
+def test_prefetch_pull_requests_all_prefetched(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It does not query PRs."""
+    pulls = {"pageInfo": {"hasNextPage": False}, "nodes": []}
+    mock_graphql_data(mock_github3_login, {"r0": {"pullRequests": pulls}})
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.start_prefetch_pull_requests([REPO])
+    service.prefetcher.get("pulls")
+    service.prefetch_pull_requests([REPO], domain_mpr)
+
+    assert service.pull_numbers == {(REPO, "branch", "org name:main"): []}
+    assert mock_github3_login.return_value.session.post.call_count == 1
+
+
+def test_close_issues_from_repos_rest(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    domain_issues: List[i.Issue],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It leaves issues to be closed one by one."""
+    response = gc.GithubService(domain_gh_conn_settings[0]).close_issues_from_repos(
+        {REPO: domain_issues}
+    )
+
+    assert response == {}
+
+
+def test_close_issues_from_repos_graphql(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+) -> None:
+    """It closes issues read with GraphQL in one request."""
+    mock_graphql_data(mock_github3_login, {"m0": {}, "m1": None, "m2": {}})
+    response = mock_github3_login.return_value.session.post.return_value
+    response.json.return_value["errors"] = [{"message": "Forbidden", "path": ["m1"]}]
+    issues_by_repo = {
+        REPO: [i.Issue(1, "a", "", set(), "I_1"), i.Issue(2, "b", "", set(), "I_2")],
+        REPO2: [i.Issue(3, "c", "", set(), "I_3")],
+        "org/listed": [i.Issue(4, "d", "", set())],
+        "org/closed": [i.Issue(5, "e", "", set(), "I_5", "closed")],
+        "org/empty": [],
+    }
+    result = gc.GithubService(
+        domain_gh_conn_settings[0], read_backend="graphql", mutation_batch_size=10
+    ).close_issues_from_repos(issues_by_repo)
+
+    assert result == {
+        REPO: rr.Output(rr.ERROR, f"{REPO}: close issue #2 failed. Forbidden\n"),
+        REPO2: rr.Output(rr.SUCCESS, f"{REPO2}: close issues successful.\n"),
+        "org/closed": rr.Output(rr.SUCCESS, "org/closed: close issues successful.\n"),
+    }
+    mock_github3_login.return_value.session.post.assert_called_once()
+
+
+def test_merge_pull_requests_from_repos_rest(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It leaves PRs to be merged one by one."""
+    response = gc.GithubService(
+        domain_gh_conn_settings[0]
+    ).merge_pull_requests_from_repos([REPO], domain_mpr)
+
+    assert response == {}
+
+
+def test_merge_pull_requests_from_repos_graphql(
+    domain_gh_conn_settings: List[cs.GhConnectionSettings],
+    mock_github3_login: MockerFixture,
+    domain_mpr: mpr.PullRequestMerge,
+) -> None:
+    """It merges prefetched PRs in one request."""
+    mock_graphql_data(
+        mock_github3_login,
+        {
+            "r0": {"pullRequests": {"nodes": [PULL_NODE]}},
+            "r1": {"pullRequests": {"nodes": [PULL_NODE]}},
+            "r2": {"pullRequests": {"nodes": []}},
+        },
+    )
+    repos = [REPO, REPO2, "org/nopr", "org/notprefetched"]
+    service = gc.GithubService(domain_gh_conn_settings[0], read_backend="graphql")
+    service.prefetch_pull_requests(repos[:3], domain_mpr)
+    mock_graphql_data(mock_github3_login, {"m0": {}, "m1": None})
+    response = mock_github3_login.return_value.session.post.return_value
+    response.json.return_value["errors"] = [
+        {"message": "Pull Request is not mergeable", "path": ["m1"]}
+    ]
+    result = service.merge_pull_requests_from_repos(repos, domain_mpr)
+
+    assert result == {
+        REPO: rr.Output(rr.SUCCESS, f"{REPO}: merge PR successful.\n"),
+        REPO2: rr.Output(
+            rr.ERROR, f"{REPO2}: merge PR #7 failed. Pull Request is not mergeable\n"
+        ),
+    }
+    assert mock_github3_login.return_value.session.post.call_count == 2
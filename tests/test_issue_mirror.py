@@ -0,0 +1,73 @@
+"""Test cases for the issue mirror module."""
+import os
+from typing import Any
+from typing import Dict
+
+import pytest
+from _pytest.tmpdir import Path
+
+import git_portfolio.domain.issue as i
+import git_portfolio.issue_mirror as im
+
+ACCOUNT = "account"
+REPO = "org/repo"
+
+
+def _issue_json(number: int, state: str = "open", **extra: Any) -> Dict[str, Any]:
+    return dict(
+        number=number,
+        node_id=f"I_{number}",
+        title=f"issue {number}",
+        body=None,
+        labels=[{"name": "b"}, {"name": "a"}],
+        state=state,
+        updated_at=f"2021-01-0{number}T00:00:00Z",
+        **extra,
+    )
+
+
+@pytest.fixture
+def mirror(tmp_path: Path) -> im.IssueMirror:
+    """Fixture for a mirror in a folder not created yet."""
+    return im.IssueMirror(str(tmp_path / "gitp"), "issues.sqlite3")
+
+
+def test_get_sync_never_synced(mirror: im.IssueMirror) -> None:
+    """It returns empty progress."""
+    assert mirror.get_sync(ACCOUNT, REPO) == im.SyncState()
+
+
+def test_save_page(mirror: im.IssueMirror) -> None:
+    """It saves issues and progress, updating issues saved before."""
+    sync = im.SyncState("2021-01-02T00:00:00Z", "url", '"etag"')
+    mirror.save_page(ACCOUNT, REPO, [_issue_json(1), _issue_json(2)], sync)
+    mirror.save_page(ACCOUNT, REPO, [_issue_json(1, state="closed")], sync)
+
+    assert mirror.get_sync(ACCOUNT, REPO) == sync
+    assert mirror.list_open(ACCOUNT, REPO, None) == [
+        i.Issue(2, "issue 2", "", {"a", "b"}, "I_2", "open")
+    ]
+
+
+@pytest.mark.parametrize(
+    "obj,numbers", [("issue", [1]), ("pull request", [2]), (None, [2, 1])]
+)
+def test_list_open(mirror: im.IssueMirror, obj: str, numbers: Any) -> None:
+    """It lists open objects of type, newest first."""
+    issues = [_issue_json(1), _issue_json(2, pull_request={"url": "url"})]
+    mirror.save_page(ACCOUNT, REPO, issues, im.SyncState())
+    mirror.save_page(ACCOUNT, "org/other", [_issue_json(3)], im.SyncState())
+    mirror.save_page("other", REPO, [_issue_json(4)], im.SyncState())
+
+    listed = mirror.list_open(ACCOUNT, REPO, obj)
+
+    assert [issue.number for issue in listed] == numbers
+
+
+def test_clear(mirror: im.IssueMirror) -> None:
+    """It removes database files."""
+    mirror.save_page(ACCOUNT, REPO, [_issue_json(1)], im.SyncState())
+    mirror.clear()
+
+    assert not os.path.exists(mirror.path)
+    assert mirror.list_open(ACCOUNT, REPO, None) == []
@@ -0,0 +1,92 @@
+"""Test cases for the local cache module."""
+import pytest
+from _pytest.tmpdir import Path
+from pytest_mock import MockerFixture
+
+import git_portfolio.local_cache as lc
+
+
+def test_fingerprint() -> None:
+    """It does not contain the secret."""
+    result = lc.fingerprint("myhost.com", "mytoken")
+
+    assert len(result) == 16
+    assert "mytoken" not in result
+    assert result != lc.fingerprint("myhost.com", "othertoken")
+
+
+def test_write_atomic(tmp_path: Path) -> None:
+    """It creates folder and writes file."""
+    path = tmp_path / "folder" / "file.json"
+    lc.write_atomic(str(path), "content")
+
+    assert path.read_text() == "content"
+
+
+def test_write_atomic_error(mocker: MockerFixture, tmp_path: Path) -> None:
+    """It keeps previous content and removes temporary file."""
+    path = tmp_path / "file.json"
+    path.write_text("old")
+    mocker.patch("os.replace", side_effect=OSError)
+
+    with pytest.raises(OSError):
+        lc.write_atomic(str(path), "new")
+
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["file.json"]
+
+
+def test_get_no_file(tmp_path: Path) -> None:
+    """It returns None."""
+    assert lc.LocalCache(str(tmp_path), "cache.json", 60).get("key") is None
+
+
+def test_get_invalid_file(tmp_path: Path) -> None:
+    """It ignores invalid content."""
+    (tmp_path / "cache.json").write_text("[1, 2")
+
+    assert lc.LocalCache(str(tmp_path), "cache.json", 60).get("key") is None
+
+
+def test_set_and_get(tmp_path: Path) -> None:
+    """It returns fresh saved entry."""
+    cache = lc.LocalCache(str(tmp_path), "cache.json", 60)
+    cache.set("key", {"value": 1})
+    entry = cache.get("key")
+
+    assert entry is not None
+    assert entry["value"] == 1
+    assert cache.is_fresh(entry) is True
+
+
+def test_is_fresh_expired(tmp_path: Path) -> None:
+    """It returns False after TTL."""
+    cache = lc.LocalCache(str(tmp_path), "cache.json", 0)
+    cache.set("key", {"value": 1})
+    entry = cache.get("key")
+
+    assert entry is not None
+    assert cache.is_fresh(entry) is False
+
+
+def test_delete(tmp_path: Path) -> None:
+    """It removes only the entry of key."""
+    cache = lc.LocalCache(str(tmp_path), "cache.json", 60)
+    cache.set("key", {"value": 1})
+    cache.set("other", {"value": 2})
+    cache.delete("key")
+    cache.delete("missing")
+
+    assert cache.get("key") is None
+    assert cache.get("other") is not None
+
+
+def test_clear(tmp_path: Path) -> None:
+    """It removes the cache file."""
+    cache = lc.LocalCache(str(tmp_path), "cache.json", 60)
+    cache.set("key", {"value": 1})
+    cache.clear()
+    cache.clear()
+
+    assert cache.get("key") is None
+    assert not (tmp_path / "cache.json").exists()
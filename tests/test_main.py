@@ -1,15 +1,45 @@
 """Test cases for the __main__ module."""
+import json
+import os
+import time
+from typing import Any
+
 import pytest
+from _pytest.tmpdir import Path
 from click.testing import CliRunner
 from pytest_mock import MockerFixture
 
 import git_portfolio.__main__
+import git_portfolio.defaults as dfl
 import git_portfolio.domain.config as c
+import git_portfolio.domain.gh_connection_settings as cs
+import git_portfolio.domain.repo_result as rr
+import git_portfolio.profiling as prof
+import git_portfolio.rate_limit as rl
 import git_portfolio.responses as res
 
 
 REPO = "org/reponame"
 REPO2 = "org/reponame2"
+RESULT = rr.RepoResult(
+    REPO,
+    "pull",
+    rr.SUCCESS,
+    "Already up to date.",
+    output="reponame: Already up to date.\n",
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_github_services(mocker: MockerFixture) -> None:
+    """Fixture for creating GitHub services again in each test."""
+    mocker.patch.dict(git_portfolio.__main__.GITHUB_SERVICES, clear=True)
+
+
+@pytest.fixture(autouse=True)
+def mock_daemon_forward(mocker: MockerFixture) -> MockerFixture:
+    """Fixture for running commands in process, as without daemon."""
+    return mocker.patch("git_portfolio.daemon.forward", return_value=None)
 
 
 @pytest.fixture
@@ -327,6 +357,103 @@ def test_status_success(
     mock_git_use_case.return_value.execute.assert_called_once_with([REPO], "status", ())
 
 
+def test_clone_forwarded_to_daemon(
+    mock_daemon_forward: MockerFixture,
+    mock_git_clone_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It outputs result of daemon."""
+    mock_daemon_forward.return_value = (4, "daemon output\n", "")
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["-j", "2", "clone"], prog_name="gitp"
+    )
+
+    mock_daemon_forward.assert_called_once_with(
+        mock_config_manager.config_folder, ["-j", "2", "clone"], os.getcwd()
+    )
+    mock_git_clone_use_case.assert_not_called()
+    assert result.output == "daemon output\n"
+    assert result.exit_code == 4
+
+
+def test_status_not_forwarded(
+    mock_daemon_forward: MockerFixture,
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It runs local git command in process, with environment of caller."""
+    runner.invoke(git_portfolio.__main__.main, ["status"], prog_name="gitp")
+
+    mock_daemon_forward.assert_not_called()
+    mock_git_use_case.return_value.execute.assert_called_once_with([REPO], "status", ())
+
+
+def test_rate_limit_in_daemon(
+    mocker: MockerFixture,
+    mock_daemon_forward: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It runs command in process."""
+    mocker.patch("git_portfolio.daemon.is_serving", return_value=True)
+    mock_github_service.return_value.fetch_rate_limit_budget.return_value = {}
+    runner.invoke(git_portfolio.__main__.main, ["rate-limit"], prog_name="gitp")
+
+    mock_daemon_forward.assert_not_called()
+    mock_github_service.return_value.fetch_rate_limit_budget.assert_called_once()
+
+
+def test_run_command(
+    mocker: MockerFixture,
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    """It runs command in cwd with config loaded again."""
+    mocker.patch("git_portfolio.daemon.is_serving", return_value=True)
+    config_manager = mocker.patch(
+        "git_portfolio.config_manager.ConfigManager", autospec=True
+    ).return_value
+    config_manager.config_is_empty.return_value = False
+    config_manager.config.github_selected_repos = [REPO2]
+    cwds = []
+
+    def execute(*args: Any) -> res.ResponseSuccess:
+        cwds.append(os.getcwd())
+        return res.ResponseSuccess("status output")
+
+    mock_git_use_case.return_value.execute.side_effect = execute
+    cwd = os.getcwd()
+    result = git_portfolio.__main__._run_command(["status"], str(tmp_path))
+
+    assert result == (0, "status output\n", "")
+    assert cwds == [str(tmp_path)]
+    assert os.getcwd() == cwd
+    mock_git_use_case.return_value.execute.assert_called_once_with(
+        [REPO2], "status", ()
+    )
+
+
+def test_run_command_error(
+    mocker: MockerFixture, mock_config_manager: MockerFixture, tmp_path: Path
+) -> None:
+    """It returns exit code and error of command."""
+    mocker.patch("git_portfolio.daemon.is_serving", return_value=True)
+    config_manager = mocker.patch(
+        "git_portfolio.config_manager.ConfigManager", autospec=True
+    ).return_value
+    config_manager.config_is_empty.return_value = True
+    exit_code, stdout, _ = git_portfolio.__main__._run_command(
+        ["status"], str(tmp_path)
+    )
+
+    assert exit_code == 3
+    assert stdout.startswith("Error: no config found")
+
+
 def test_config_init_success(
     mock_prompt_inquirer_prompter: MockerFixture,
     mock_config_manager: MockerFixture,
@@ -400,10 +527,12 @@ def test_config_repos_success(
 
     mock_config_repos_use_case(config_manager).execute.assert_called_once()
     assert result.output == "success message\n"
+    mock_github_service.return_value.start_prefetch_catalog.assert_called_once()
 
 
 def test_config_repos_do_not_change(
     mock_prompt_inquirer_prompter: MockerFixture,
+    mock_github_service: MockerFixture,
     mock_config_manager: MockerFixture,
     runner: CliRunner,
 ) -> None:
@@ -426,7 +555,7 @@ def test_config_repos_wrong_token(
     """It executes _get_github_service with token error."""
     mock_config_manager.config_is_empty.return_value = False
     mock_prompt_inquirer_prompter.new_repos.return_value = True
-    mock_github_service.side_effect = AttributeError
+    mock_github_service.side_effect = cs.AuthError
     result = runner.invoke(
         git_portfolio.__main__.configure, ["repos"], prog_name="gitp"
     )
@@ -471,7 +600,47 @@ def test_clone_success(
     github_service = mock_github_service.return_value
     runner.invoke(git_portfolio.__main__.main, ["clone"], prog_name="gitp")
 
-    mock_git_clone_use_case(github_service).execute.assert_called_once_with([REPO])
+    mock_git_clone_use_case(github_service).execute.assert_called_once_with(
+        [REPO], ()
+    )
+
+
+def test_clone_token_revoked(
+    mock_git_clone_use_case: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It outputs token error when token was revoked after caching identity."""
+    mock_git_clone_use_case.return_value.execute.side_effect = cs.AuthError(
+        "Invalid token."
+    )
+    result = runner.invoke(git_portfolio.__main__.main, ["clone"], prog_name="gitp")
+
+    assert result.output == (
+        "Error(s) found during execution:\nWrong GitHub permissions. Please check "
+        "your token.\n"
+    )
+    assert result.exit_code == 4
+
+
+def test_clone_with_options(
+    mock_git_clone_use_case: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It calls git clone with depth, filter and single branch arguments."""
+    github_service = mock_github_service.return_value
+    runner.invoke(
+        git_portfolio.__main__.main,
+        ["clone", "--depth", "1", "--filter", "blob:none", "--single-branch"],
+        prog_name="gitp",
+    )
+
+    mock_git_clone_use_case(github_service).execute.assert_called_once_with(
+        [REPO], ("--depth=1", "--filter=blob:none", "--single-branch")
+    )
 
 
 def test_create_issues(
@@ -506,6 +675,8 @@ def test_close_issues(
     mock_gh_close_issue_use_case(
         config_manager, github_service
     ).execute.assert_called_once()
+    github_service.start_prefetch_open_issues.assert_called_once_with([REPO], "issue")
+    github_service.cancel_prefetch.assert_called_once()
 
 
 def test_create_prs(
@@ -523,6 +694,7 @@ def test_create_prs(
     mock_gh_create_pr_use_case(
         config_manager, github_service
     ).execute.assert_called_once()
+    github_service.start_prefetch_open_issues.assert_called_once_with([REPO], "issue")
 
 
 def test_close_prs(
@@ -540,6 +712,9 @@ def test_close_prs(
     mock_gh_close_issue_use_case(
         config_manager, github_service
     ).execute.assert_called_once()
+    github_service.start_prefetch_open_issues.assert_called_once_with(
+        [REPO], "pull request"
+    )
 
 
 def test_merge_prs(
@@ -559,6 +734,7 @@ def test_merge_prs(
     mock_gh_merge_pr_use_case(
         config_manager, github_service
     ).execute.assert_called_once()
+    github_service.start_prefetch_pull_requests.assert_called_once_with([REPO])
 
 
 def test_delete_branches(
@@ -576,3 +752,543 @@ def test_delete_branches(
     mock_gh_delete_branch_use_case(
         config_manager, github_service
     ).execute.assert_called_once()
+
+
+def test_delete_branches_with_jobs(
+    mock_gh_delete_branch_use_case: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_prompt_inquirer_prompter: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It passes --jobs to the use case."""
+    runner.invoke(
+        git_portfolio.__main__.main,
+        ["--jobs", "4", "delete", "branches"],
+        prog_name="gitp",
+    )
+
+    mock_gh_delete_branch_use_case.assert_called_once_with(
+        mock_config_manager,
+        mock_github_service.return_value,
+        jobs=4,
+        on_output=git_portfolio.__main__._echo_output,
+    )
+
+
+def test_merge_prs_with_graphql_api(
+    mock_gh_merge_pr_use_case: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_prompt_inquirer_prompter: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It creates GitHub service with GraphQL read backend."""
+    runner.invoke(
+        git_portfolio.__main__.main,
+        ["--api", "graphql", "--batch-size", "20", "merge", "prs"],
+        prog_name="gitp",
+    )
+
+    assert mock_github_service.call_args[1] == {
+        "read_backend": "graphql",
+        "mutation_batch_size": 20,
+        "retries": dfl.DEFAULT_RETRIES,
+        "pool_size": 10,
+        "identity_cache": mock_config_manager.get_cache.return_value,
+        "issue_mirror": None,
+    }
+
+
+def test_close_issues_with_mirror(
+    mock_github_service: MockerFixture,
+    mock_gh_close_issue_use_case: MockerFixture,
+    mock_prompt_inquirer_prompter: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It creates GitHub service with issue mirror."""
+    runner.invoke(
+        git_portfolio.__main__.main,
+        ["--mirror", "close", "issues"],
+        prog_name="gitp",
+    )
+
+    assert mock_github_service.call_args[1]["issue_mirror"] == (
+        mock_config_manager.get_issue_mirror.return_value
+    )
+
+
+def test_delete_branches_with_retries(
+    mock_github_service: MockerFixture,
+    mock_gh_delete_branch_use_case: MockerFixture,
+    mock_prompt_inquirer_prompter: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It creates GitHub service with given retries."""
+    runner.invoke(
+        git_portfolio.__main__.main,
+        ["--retries", "0", "delete", "branches"],
+        prog_name="gitp",
+    )
+
+    assert mock_github_service.call_args[1]["retries"] == 0
+
+
+def test_github_service_reused(
+    mock_github_service: MockerFixture,
+    mock_gh_delete_branch_use_case: MockerFixture,
+    mock_prompt_inquirer_prompter: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It creates GitHub service once per settings, with pool fitting jobs."""
+    for _ in range(2):
+        runner.invoke(
+            git_portfolio.__main__.main,
+            ["--jobs", "32", "delete", "branches"],
+            prog_name="gitp",
+        )
+
+    mock_github_service.assert_called_once()
+    assert mock_github_service.call_args[1]["pool_size"] == 32
+
+
+def test_pull_with_jobs(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It creates git use case with --jobs."""
+    runner.invoke(git_portfolio.__main__.main, ["-j", "2", "pull"], prog_name="gitp")
+
+    mock_git_use_case.assert_called_once_with(
+        jobs=2, on_output=git_portfolio.__main__._echo_output
+    )
+    mock_git_use_case.return_value.execute.assert_called_once_with([REPO], "pull", ())
+
+
+def test_pull_streams_outputs(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It shows output of each repo as soon as it is done."""
+
+    def execute(*args: Any) -> res.ResponseSuccess:
+        on_output = mock_git_use_case.call_args[1]["on_output"]
+        on_output(RESULT)
+        return res.ResponseSuccess("", [])
+
+    mock_git_use_case.return_value.execute.side_effect = execute
+    result = runner.invoke(git_portfolio.__main__.main, ["pull"], prog_name="gitp")
+
+    assert result.output == "reponame: Already up to date.\n\n"
+
+
+def test_pull_profile(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It shows profile summary after command."""
+
+    def execute(*args: Any) -> res.ResponseSuccess:
+        prof.record_git(REPO, ["git", "pull"], 0, 0.1)
+        return res.ResponseSuccess("", [])
+
+    mock_git_use_case.return_value.execute.side_effect = execute
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["--profile", "pull"], prog_name="gitp"
+    )
+
+    assert "Profile: 0 HTTP requests, 1 git commands" in result.output
+    assert f"  {REPO}: 0 HTTP, 1 git\n" in result.output
+
+
+def test_pull_profile_env(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It profiles command when GITP_PROFILE is set."""
+    mock_git_use_case.return_value.execute.return_value = res.ResponseSuccess("")
+    result = runner.invoke(
+        git_portfolio.__main__.main,
+        ["pull"],
+        prog_name="gitp",
+        env={"GITP_PROFILE": "1"},
+    )
+
+    assert "Profile: 0 HTTP requests, 0 git commands" in result.output
+
+
+def test_pull_trace(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+    tmp_path: Path,
+) -> None:
+    """It writes trace of command without profile summary."""
+    mock_git_use_case.return_value.execute.return_value = res.ResponseSuccess("")
+    trace_path = tmp_path / "trace.json"
+    result = runner.invoke(
+        git_portfolio.__main__.main,
+        ["--trace", str(trace_path), "pull"],
+        prog_name="gitp",
+    )
+    with open(trace_path) as trace_file:
+        trace = json.load(trace_file)
+
+    assert "Profile" not in result.output
+    assert {
+        (event["name"], event["cat"])
+        for event in trace["traceEvents"]
+        if event["ph"] == "X"
+    } == {("gitp pull", "command")}
+
+
+def test_pull_not_profiled(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It records nothing."""
+    mock_git_use_case.return_value.execute.return_value = res.ResponseSuccess("")
+    result = runner.invoke(git_portfolio.__main__.main, ["pull"], prog_name="gitp")
+
+    assert "Profile" not in result.output
+    assert prof.stop() is None
+
+
+def test_finish_profile_stopped(capsys: pytest.CaptureFixture[str]) -> None:
+    """It shows nothing, eg. when a shell command stopped profiling."""
+    git_portfolio.__main__._finish_profile(True, None)
+
+    assert capsys.readouterr().err == ""
+
+
+def test_pull_output_ndjson(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It streams a JSON record per repo."""
+
+    def execute(*args: Any) -> res.ResponseSuccess:
+        mock_git_use_case.call_args[1]["on_output"](RESULT)
+        return res.ResponseSuccess("", [])
+
+    mock_git_use_case.return_value.execute.side_effect = execute
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["--output", "ndjson", "pull"], prog_name="gitp"
+    )
+
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        RESULT.to_dict()
+    ]
+
+
+def test_pull_output_json(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It prints all records at the end."""
+    mock_git_use_case.return_value.execute.return_value = res.ResponseSuccess(
+        RESULT.output, [RESULT]
+    )
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["--output", "json", "pull"], prog_name="gitp"
+    )
+
+    assert mock_git_use_case.call_args[1]["on_output"] is None
+    assert json.loads(result.output) == [RESULT.to_dict()]
+
+
+def test_pull_output_json_failure(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It prints error as JSON."""
+    mock_git_use_case.return_value.execute.return_value = res.ResponseFailure(
+        res.ResponseTypes.SYSTEM_ERROR, "git not installed"
+    )
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["--output", "ndjson", "pull"], prog_name="gitp"
+    )
+
+    assert json.loads(result.output) == {
+        "type": "SystemError",
+        "message": "git not installed",
+    }
+    assert result.exit_code == 4
+
+
+def test_pull_output_json_failure_results(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It prints records of all repos when some failed."""
+    mock_git_use_case.return_value.execute.return_value = res.ResponseFailure(
+        res.ResponseTypes.PARAMETERS_ERROR, "some error", [RESULT]
+    )
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["--output", "json", "pull"], prog_name="gitp"
+    )
+
+    assert json.loads(result.output) == [RESULT.to_dict()]
+    assert result.exit_code == 4
+
+
+def test_config_repos_output_json(
+    mock_prompt_inquirer_prompter: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    mock_config_repos_use_case: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It prints message of commands without results by repo as JSON."""
+    mock_config_repos_use_case.return_value.execute.return_value = (
+        res.ResponseSuccess("success message")
+    )
+    result = runner.invoke(
+        git_portfolio.__main__.main,
+        ["--output", "json", "config", "repos"],
+        prog_name="gitp",
+    )
+
+    assert json.loads(result.output) == {
+        "type": "Success",
+        "message": "success message",
+    }
+
+
+def test_cache_refresh(
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It revalidates repository catalog."""
+    mock_github_service.return_value.refresh_catalog.return_value = 2
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["cache", "refresh"], prog_name="gitp"
+    )
+
+    assert result.output == "gitp cache refreshed with 2 repositories.\n"
+
+
+def test_cache_clear(mock_config_manager: MockerFixture, runner: CliRunner) -> None:
+    """It clears repository catalog cache."""
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["cache", "clear"], prog_name="gitp"
+    )
+
+    assert mock_config_manager.get_cache.return_value.clear.call_count == 2
+    mock_config_manager.get_cache.assert_any_call(
+        dfl.IDENTITY_CACHE_FILENAME, dfl.IDENTITY_TTL
+    )
+    mock_config_manager.get_issue_mirror.assert_called_once_with(
+        dfl.ISSUE_MIRROR_FILENAME
+    )
+    mock_config_manager.get_issue_mirror.return_value.clear.assert_called_once()
+    assert result.output == "gitp cache cleared.\n"
+
+
+def test_cache_clear_services(
+    mock_config_manager: MockerFixture, runner: CliRunner
+) -> None:
+    """It drops services kept by a daemon."""
+    git_portfolio.__main__.GITHUB_SERVICES[("", "", "rest", 50, 3, 10)] = None  # type: ignore
+    runner.invoke(git_portfolio.__main__.main, ["cache", "clear"], prog_name="gitp")
+
+    assert git_portfolio.__main__.GITHUB_SERVICES == {}
+
+
+def test_daemon_start(
+    mocker: MockerFixture, mock_config_manager: MockerFixture, runner: CliRunner
+) -> None:
+    """It serves commands."""
+    mocker.patch("git_portfolio.daemon.is_running", return_value=False)
+    daemon = mocker.patch("git_portfolio.daemon.Daemon", autospec=True)
+    daemon.return_value.socket_path = "daemon.sock"
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["daemon", "start"], prog_name="gitp"
+    )
+
+    daemon.assert_called_once_with(
+        mock_config_manager.config_folder, git_portfolio.__main__._run_command
+    )
+    daemon.return_value.serve.assert_called_once()
+    assert result.output == (
+        "gitp daemon listening on daemon.sock.\ngitp daemon stopped.\n"
+    )
+
+
+def test_daemon_start_running(
+    mocker: MockerFixture, mock_config_manager: MockerFixture, runner: CliRunner
+) -> None:
+    """It fails."""
+    mocker.patch("git_portfolio.daemon.is_running", return_value=True)
+    daemon = mocker.patch("git_portfolio.daemon.Daemon", autospec=True)
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["daemon", "start"], prog_name="gitp"
+    )
+
+    daemon.assert_not_called()
+    assert result.output == "Error: gitp daemon is already running.\n"
+    assert result.exit_code == 1
+
+
+@pytest.mark.parametrize(
+    "running,output",
+    [(True, "gitp daemon stopping.\n"), (False, "gitp daemon is not running.\n")],
+)
+def test_daemon_stop(
+    mocker: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+    running: bool,
+    output: str,
+) -> None:
+    """It stops daemon if running."""
+    stop = mocker.patch("git_portfolio.daemon.stop", return_value=running)
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["daemon", "stop"], prog_name="gitp"
+    )
+
+    stop.assert_called_once_with(mock_config_manager.config_folder)
+    assert result.output == output
+
+
+def test_rate_limit(
+    mocker: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It shows requests left by resource."""
+    mocker.patch("time.localtime", return_value=time.gmtime(0))
+    mock_github_service.return_value.fetch_rate_limit_budget.return_value = {
+        "search": rl.Budget(30, 29, 0),
+        "core": rl.Budget(5000, 4990, 0),
+    }
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["rate-limit"], prog_name="gitp"
+    )
+
+    assert result.output == (
+        "core: 4990/5000 requests left, resets at 00:00:00.\n"
+        "search: 29/30 requests left, resets at 00:00:00.\n\n"
+    )
+
+
+def test_shell_reuses_service(
+    mock_daemon_forward: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It runs commands with one GitHub service."""
+    mock_github_service.return_value.fetch_rate_limit_budget.return_value = {}
+    result = runner.invoke(
+        git_portfolio.__main__.main,
+        ["shell"],
+        input="rate-limit\n\nrate-limit\nexit\nrate-limit\n",
+        prog_name="gitp",
+    )
+
+    mock_github_service.assert_called_once()
+    mock_daemon_forward.assert_not_called()
+    assert result.output.count("No GitHub rate limit reported.") == 2
+    assert result.exit_code == 0
+
+
+def test_shell_refresh(
+    mocker: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It creates service again with config loaded again."""
+    config_manager = mocker.patch(
+        "git_portfolio.config_manager.ConfigManager", autospec=True
+    ).return_value
+    config_manager.config_is_empty.return_value = False
+    config_manager.config.github_access_token = "newtoken"
+    config_manager.config.github_hostname = ""
+    mock_github_service.return_value.fetch_rate_limit_budget.return_value = {}
+    result = runner.invoke(
+        git_portfolio.__main__.main,
+        ["shell"],
+        input="rate-limit\nrefresh\nrate-limit\n",
+        prog_name="gitp",
+    )
+
+    assert mock_github_service.call_count == 2
+    assert mock_github_service.call_args[0][0].access_token == "newtoken"
+    assert "gitp shell refreshed.\n" in result.output
+
+
+def test_shell_global_options(
+    mock_git_use_case: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It runs commands with options given before shell."""
+    runner.invoke(
+        git_portfolio.__main__.main,
+        ["-j", "2", "shell"],
+        input="status .\nquit\n",
+        prog_name="gitp",
+    )
+
+    mock_git_use_case.assert_called_once_with(
+        jobs=2, on_output=git_portfolio.__main__._echo_output
+    )
+    mock_git_use_case.return_value.execute.assert_called_once_with(
+        [REPO], "status", (".",)
+    )
+
+
+def test_shell_errors(mock_config_manager: MockerFixture, runner: CliRunner) -> None:
+    """It outputs errors and keeps running."""
+    result = runner.invoke(
+        git_portfolio.__main__.main,
+        ["shell"],
+        input="commit -m 'unclosed\nshell\nunknown\nhelp\n",
+        prog_name="gitp",
+    )
+
+    assert "Error: No closing quotation." in result.output
+    assert "Error: already in gitp shell." in result.output
+    assert "No such command" in result.output
+    assert "Commands:" in result.output
+    assert result.exit_code == 0
+
+
+def test_shell_interrupt(
+    mocker: MockerFixture, mock_config_manager: MockerFixture, runner: CliRunner
+) -> None:
+    """It ignores line interrupted."""
+    mocker.patch("builtins.input", side_effect=[KeyboardInterrupt, "exit"])
+    result = runner.invoke(git_portfolio.__main__.main, ["shell"], prog_name="gitp")
+
+    assert result.exit_code == 0
+
+
+def test_rate_limit_unknown(
+    mock_github_service: MockerFixture,
+    mock_config_manager: MockerFixture,
+    runner: CliRunner,
+) -> None:
+    """It shows no rate limit."""
+    mock_github_service.return_value.fetch_rate_limit_budget.return_value = {}
+    result = runner.invoke(
+        git_portfolio.__main__.main, ["rate-limit"], prog_name="gitp"
+    )
+
+    assert result.output == "No GitHub rate limit reported.\n"
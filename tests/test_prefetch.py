@@ -0,0 +1,50 @@
+"""Test cases for the prefetch module."""
+from concurrent import futures
+
+from pytest_mock import MockerFixture
+
+import git_portfolio.prefetch as pf
+
+
+def test_submit(mocker: MockerFixture) -> None:
+    """It fetches each key once."""
+    fetch = mocker.Mock(return_value=["repo"])
+    prefetcher = pf.Prefetcher()
+    first = prefetcher.submit("catalog", fetch, "arg")
+    second = prefetcher.submit("catalog", fetch, "arg")
+
+    assert first is second
+    assert prefetcher.get("catalog") == ["repo"]
+    fetch.assert_called_once_with("arg")
+
+
+def test_get_not_prefetched() -> None:
+    """It returns None."""
+    assert pf.Prefetcher().get("catalog") is None
+
+
+def test_get_error(mocker: MockerFixture) -> None:
+    """It returns None."""
+    prefetcher = pf.Prefetcher()
+    prefetcher.submit("catalog", mocker.Mock(side_effect=ValueError))
+
+    assert prefetcher.get("catalog") is None
+
+
+def test_cancel(mocker: MockerFixture) -> None:
+    """It drops prefetched keys."""
+    prefetcher = pf.Prefetcher()
+    prefetcher.submit("catalog", mocker.Mock(return_value=["repo"]))
+    prefetcher.cancel()
+
+    assert prefetcher.get("catalog") is None
+
+
+def test_run_cancelled(mocker: MockerFixture) -> None:
+    """It does not fetch."""
+    fetch = mocker.Mock()
+    future: "futures.Future[str]" = futures.Future()
+    future.cancel()
+    pf.Prefetcher._run(future, fetch, ())
+
+    fetch.assert_not_called()
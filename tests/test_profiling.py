@@ -0,0 +1,173 @@
+"""Test cases for the profiling module."""
+from typing import Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+
+import git_portfolio.profiling as prof
+
+
+@pytest.fixture
+def profiler() -> Iterator[prof.Profiler]:
+    """Fixture for a started profiler, stopped after test."""
+    yield prof.start()
+    prof.stop()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://api.github.com/user/repos?per_page=100", "/user/repos"),
+        (
+            "https://myhost.com/api/v3/repos/org/repo/issues/12",
+            "/repos/{owner}/{repo}/issues/{number}",
+        ),
+        (
+            "https://api.github.com/repos/org/repo/git/refs/heads/feat/1",
+            "/repos/{owner}/{repo}/git/ref/heads/{branch}",
+        ),
+        ("https://myhost.com/api/graphql", "/graphql"),
+    ],
+)
+def test_endpoint(url: str, expected: str) -> None:
+    """It returns path template."""
+    assert prof.endpoint(url) == expected
+
+
+def test_install_not_started(mocker: MockerFixture) -> None:
+    """It sends request without recording it."""
+    session = mocker.Mock()
+    send = session.request
+    prof.install(session)
+
+    assert session.request("GET", "https://api.github.com/user") is send.return_value
+    assert prof.stop() is None
+
+
+def test_install_started(mocker: MockerFixture, profiler: prof.Profiler) -> None:
+    """It records request with repo of thread."""
+    session = mocker.Mock()
+    response = session.request.return_value
+    response.status_code = 304
+    response.content = b""
+    response.headers = {"X-RateLimit-Remaining": "4999"}
+    prof.install(session)
+    with prof.repo_scope("org/repo"):
+        session.request("get", "https://api.github.com/repos/org/repo")
+
+    call = profiler.http_calls[0]
+    assert (call.method, call.endpoint, call.status, call.size) == (
+        "GET",
+        "/repos/{owner}/{repo}",
+        304,
+        0,
+    )
+    assert call.cached
+    assert call.repo == "org/repo"
+    assert (call.resource, call.remaining) == ("core", 4999)
+
+
+@pytest.mark.parametrize(
+    "url,resource",
+    [
+        ("https://api.github.com/graphql", "graphql"),
+        ("https://api.github.com/search/issues", "search"),
+    ],
+)
+def test_install_resource(
+    mocker: MockerFixture, profiler: prof.Profiler, url: str, resource: str
+) -> None:
+    """It records resource of url when not reported, and no budget."""
+    session = mocker.Mock()
+    response = session.request.return_value
+    response.status_code = 200
+    response.content = b"{}"
+    response.headers = {"X-RateLimit-Remaining": "unknown"}
+    prof.install(session)
+    session.request("POST", url)
+
+    call = profiler.http_calls[0]
+    assert (call.resource, call.remaining, call.size, call.repo) == (
+        resource,
+        -1,
+        2,
+        "",
+    )
+
+
+def test_repo_scope_nested() -> None:
+    """It restores previous repo."""
+    with prof.repo_scope("org/repo"):
+        with prof.repo_scope("org/other"):
+            assert prof.current_repo() == "org/other"
+        assert prof.current_repo() == "org/repo"
+    assert prof.current_repo() == ""
+
+
+def test_record_not_started() -> None:
+    """It does nothing."""
+    prof.record_git("org/repo", ["git", "pull"], 0, 1.0)
+    prof.record_repo("org/repo", "pull", 0.0, 1.0)
+
+    assert prof.stop() is None
+
+
+def test_summary(mocker: MockerFixture) -> None:
+    """It reports calls by endpoint and repo, slowest repos and budget."""
+    profiler = prof.Profiler(clock=mocker.Mock(side_effect=[0.0, 2.0]))
+    endpoint = "/repos/{owner}/{repo}"
+    for n, repo in enumerate(["org/repo", "org/repo", "org/other"]):
+        profiler.add(
+            prof.HttpCall(
+                "GET", endpoint, 200, 1024, n, 0.5, False, repo, 1, "core", 10 - n
+            )
+        )
+    profiler.add(prof.HttpCall("POST", "/graphql", 200, 0, 0.0, 1.0, False, "", 2))
+    profiler.add(prof.GitCall("org/other", ["git", "pull"], 0, 0.0, 0.3, 1))
+    profiler.add(prof.RepoSpan("org/repo", "pull", 0.0, 1.5, 1))
+    profiler.add(prof.RepoSpan("org/other", "pull", 0.0, 0.3, 1))
+
+    assert profiler.summary() == (
+        "Profile: 4 HTTP requests, 1 git commands in 2.00s.\n"
+        "HTTP requests by endpoint:\n"
+        f"  GET {endpoint}: 3 calls, 1.50s, 3.0 KiB, 0 cached (200 x3)\n"
+        "  POST /graphql: 1 calls, 1.00s, 0.0 KiB, 0 cached (200 x1)\n"
+        "Calls per repo: 2.0 on average over 2 repos, most:\n"
+        "  org/other: 1 HTTP, 1 git\n"
+        "  org/repo: 2 HTTP, 0 git\n"
+        "Slowest repos:\n"
+        "  org/repo: 1.50s (pull)\n"
+        "  org/other: 0.30s (pull)\n"
+        "Rate limit budget consumed: core 3\n"
+    )
+
+
+def test_summary_empty(mocker: MockerFixture) -> None:
+    """It reports no calls."""
+    profiler = prof.Profiler(clock=mocker.Mock(side_effect=[0.0, 0.5]))
+
+    assert profiler.summary() == (
+        "Profile: 0 HTTP requests, 0 git commands in 0.50s.\n"
+    )
+
+
+def test_span(profiler: prof.Profiler) -> None:
+    """It records work done in scope with thread name."""
+    with prof.span("gitp pull", "command", repos=2):
+        pass
+
+    span = profiler.spans[0]
+    assert (span.name, span.category, span.args) == (
+        "gitp pull",
+        "command",
+        {"repos": 2},
+    )
+    assert profiler.threads[span.thread] == "MainThread"
+
+
+def test_span_not_started() -> None:
+    """It does nothing."""
+    with prof.span("gitp pull", "command"):
+        pass
+
+    assert prof.stop() is None
@@ -0,0 +1,256 @@
+"""Test cases for the rate limit module."""
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import pytest
+from pytest_mock import MockerFixture
+
+import git_portfolio.profiling as prof
+import git_portfolio.rate_limit as rl
+
+
+API_URL = "https://api.github.com"
+
+
+class FakeClock:
+    """Clock advanced only by sleeping."""
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        """Return current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance time."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Fake clock fixture."""
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock: FakeClock) -> rl.RateLimitScheduler:
+    """Scheduler fixture on fake clock."""
+    return rl.RateLimitScheduler(clock.time, clock.sleep, clock.time)
+
+
+def _response(
+    mocker: MockerFixture,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    text: str = "",
+) -> Any:
+    return mocker.Mock(status_code=status_code, headers=headers or {}, text=text)
+
+
+def test_token_bucket_allows_burst_then_paces(clock: FakeClock) -> None:
+    """It waits only once the burst is used."""
+    bucket = rl.TokenBucket(2.0, 3, clock.time, clock.sleep)
+    for _ in range(5):
+        bucket.acquire()
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_token_bucket_refills(clock: FakeClock) -> None:
+    """It does not wait after idle time."""
+    bucket = rl.TokenBucket(1.0, 1, clock.time, clock.sleep)
+    bucket.acquire()
+    clock.now += 1
+    bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+@pytest.mark.parametrize(
+    "method,kwargs,expected",
+    [
+        ("get", {}, True),
+        ("PATCH", {"data": "{}"}, False),
+        ("POST", {"json": {"query": "query { viewer { login } }"}}, True),
+        ("POST", {"json": {"query": " mutation($i0: X!) { }"}}, False),
+        ("POST", {"json": {"title": "issue"}}, False),
+    ],
+)
+def test_is_read(method: str, kwargs: Dict[str, Any], expected: bool) -> None:
+    """It tells reads from writes."""
+    assert rl.is_read(method, kwargs) is expected
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        (f"{API_URL}/graphql", "graphql"),
+        (f"{API_URL}/search/issues", "search"),
+        (f"{API_URL}/repos/org/reponame", "core"),
+    ],
+)
+def test_resource_for(url: str, expected: str) -> None:
+    """It returns rate limit resource."""
+    assert rl.resource_for(url) == expected
+
+
+def test_install(mocker: MockerFixture, scheduler: rl.RateLimitScheduler) -> None:
+    """It routes session requests through scheduler."""
+    session = mocker.Mock()
+    send = session.request
+    send.return_value = _response(mocker)
+    scheduler.install(session)
+    response = session.request("GET", f"{API_URL}/user", timeout=10)
+
+    assert response == send.return_value
+    send.assert_called_once_with("GET", f"{API_URL}/user", timeout=10)
+
+
+def test_request_tracks_budget(
+    mocker: MockerFixture, scheduler: rl.RateLimitScheduler
+) -> None:
+    """It keeps budget of each resource."""
+    headers = {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "4999",
+        "X-RateLimit-Reset": "2000",
+        "X-RateLimit-Resource": "core",
+    }
+    send = mocker.Mock(return_value=_response(mocker, headers=headers))
+    scheduler.request(send, "GET", f"{API_URL}/user")
+    scheduler.request(send, "GET", f"{API_URL}/ignored", headers={})
+    send.return_value = _response(mocker, headers={"X-RateLimit-Limit": "x"})
+    scheduler.request(send, "GET", f"{API_URL}/user")
+
+    assert scheduler.budget() == {"core": rl.Budget(5000, 4999, 2000.0)}
+
+
+def test_request_waits_for_reset(
+    mocker: MockerFixture, clock: FakeClock, scheduler: rl.RateLimitScheduler
+) -> None:
+    """It waits for reset once budget is exhausted."""
+    headers = {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": "1030",
+    }
+    send = mocker.Mock(return_value=_response(mocker, headers=headers))
+    scheduler.request(send, "GET", f"{API_URL}/user")
+    scheduler.request(send, "GET", f"{API_URL}/user")
+
+    assert clock.sleeps == [30.0]
+
+
+def test_request_retries_after(
+    mocker: MockerFixture, clock: FakeClock, scheduler: rl.RateLimitScheduler
+) -> None:
+    """It honors Retry-After of secondary rate limits."""
+    limited = _response(mocker, 403, {"Retry-After": "20"})
+    ok = _response(mocker)
+    send = mocker.Mock(side_effect=[limited, ok])
+    response = scheduler.request(send, "POST", f"{API_URL}/repos/o/n/issues")
+
+    assert response == ok
+    assert clock.sleeps == [20.0]
+    assert send.call_count == 2
+
+
+def test_request_records_waits(
+    mocker: MockerFixture, scheduler: rl.RateLimitScheduler
+) -> None:
+    """It records waits for rate limits, not requests sent right away."""
+    limited = _response(mocker, 403, {"Retry-After": "20"})
+    send = mocker.Mock(side_effect=[limited, _response(mocker)])
+    profiler = prof.start()
+    scheduler.request(send, "GET", f"{API_URL}/user")
+    prof.stop()
+
+    assert [(span.name, span.duration, span.args) for span in profiler.spans] == [
+        ("rate limit wait", 20.0, {"resource": "core", "status": 403})
+    ]
+
+
+def test_sent_by_thread(
+    mocker: MockerFixture, scheduler: rl.RateLimitScheduler
+) -> None:
+    """It counts requests sent by each thread, retries included."""
+    send = mocker.Mock(
+        side_effect=[_response(mocker, 429, {"Retry-After": "1"}), _response(mocker)]
+    )
+    scheduler.request(send, "GET", f"{API_URL}/user")
+    other_thread: List[int] = []
+    thread = threading.Thread(
+        target=lambda: other_thread.append(scheduler.sent_by_thread())
+    )
+    thread.start()
+    thread.join()
+
+    assert scheduler.sent_by_thread() == 2
+    assert other_thread == [0]
+
+
+@pytest.mark.parametrize(
+    "status_code,headers,text,expected",
+    [
+        (200, {}, "", None),
+        (403, {}, "Resource not accessible", None),
+        (429, {"Retry-After": "soon"}, "", rl.SECONDARY_LIMIT_WAIT),
+        (403, {}, "You have exceeded a secondary rate limit", 60.0),
+        (
+            403,
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1010"},
+            "",
+            10.0,
+        ),
+        (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}, "", 0.0),
+    ],
+)
+def test_retry_wait(
+    mocker: MockerFixture,
+    scheduler: rl.RateLimitScheduler,
+    status_code: int,
+    headers: Dict[str, str],
+    text: str,
+    expected: float,
+) -> None:
+    """It returns wait of rate limited responses."""
+    response = _response(mocker, status_code, headers, text)
+
+    assert scheduler._retry_wait(response) == expected
+
+
+def test_request_gives_up(
+    mocker: MockerFixture, clock: FakeClock, scheduler: rl.RateLimitScheduler
+) -> None:
+    """It returns rate limited response after too many or too long waits."""
+    send = mocker.Mock(return_value=_response(mocker, 429, {"Retry-After": "1"}))
+    response = scheduler.request(send, "GET", f"{API_URL}/user")
+
+    assert response.status_code == 429
+    assert send.call_count == rl.MAX_WAITS + 1
+
+    send = mocker.Mock(return_value=_response(mocker, 429, {"Retry-After": "3600"}))
+    scheduler.request(send, "GET", f"{API_URL}/user")
+
+    send.assert_called_once()
+
+
+def test_writes_paced_more_than_reads(
+    mocker: MockerFixture, clock: FakeClock, scheduler: rl.RateLimitScheduler
+) -> None:
+    """It uses a slower bucket for writes."""
+    send = mocker.Mock(return_value=_response(mocker))
+    for _ in range(rl.READ_BURST):
+        scheduler.request(send, "GET", f"{API_URL}/user")
+    assert clock.sleeps == []
+
+    for _ in range(rl.WRITE_BURST + 1):
+        scheduler.request(send, "PATCH", f"{API_URL}/repos/o/n/issues/1")
+    assert clock.sleeps == [pytest.approx(1 / rl.WRITE_RATE)]
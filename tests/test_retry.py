@@ -0,0 +1,179 @@
+"""Test cases for the retry module."""
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+import requests
+import urllib3
+from pytest_mock import MockerFixture
+
+import git_portfolio.retry as rt
+
+URL = "https://api.github.com/repos/org/reponame/issues"
+
+
+@pytest.fixture
+def sleeps() -> List[float]:
+    """Recorded sleeps fixture."""
+    return []
+
+
+@pytest.fixture
+def policy(sleeps: List[float]) -> rt.RetryPolicy:
+    """Retry policy fixture without jitter nor real sleep."""
+    return rt.RetryPolicy(retries=3, sleep=sleeps.append, jitter=lambda: 1.0)
+
+
+@pytest.mark.parametrize(
+    "method,kwargs,expected",
+    [
+        ("get", {}, True),
+        ("PATCH", {"data": '{"state": "closed"}'}, True),
+        ("DELETE", {}, True),
+        ("POST", {"data": '{"title": "issue"}'}, False),
+        ("POST", {"json": {"query": "query { viewer { login } }"}}, True),
+        ("POST", {"json": {"query": "mutation { closeIssue }"}}, False),
+    ],
+)
+def test_is_idempotent(method: str, kwargs: Dict[str, Any], expected: bool) -> None:
+    """It tells which requests are safe to repeat."""
+    assert rt.is_idempotent(method, kwargs) is expected
+
+
+def test_delay_backs_off_with_jitter() -> None:
+    """It doubles delay up to max, scaled by jitter."""
+    policy = rt.RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=lambda: 0.5)
+
+    assert [policy.delay(retry) for retry in range(4)] == [0.5, 1.0, 2.0, 2.5]
+
+
+def test_install(mocker: MockerFixture, policy: rt.RetryPolicy) -> None:
+    """It routes session requests through policy."""
+    session = mocker.Mock()
+    send = session.request
+    send.return_value.status_code = 200
+    policy.install(session)
+    response = session.request("GET", URL, timeout=10)
+
+    assert response == send.return_value
+    send.assert_called_once_with("GET", URL, timeout=10)
+
+
+def test_request_retries_gateway_errors(
+    mocker: MockerFixture, policy: rt.RetryPolicy, sleeps: List[float]
+) -> None:
+    """It retries idempotent requests on 5xx."""
+    send = mocker.Mock(
+        side_effect=[
+            mocker.Mock(status_code=502),
+            mocker.Mock(status_code=503),
+            mocker.Mock(status_code=200),
+        ]
+    )
+    response = policy.request(send, "PATCH", URL, data="{}")
+
+    assert response.status_code == 200
+    assert sleeps == [0.5, 1.0]
+
+
+def test_request_gives_up(
+    mocker: MockerFixture, policy: rt.RetryPolicy, sleeps: List[float]
+) -> None:
+    """It returns last response after all retries."""
+    send = mocker.Mock(return_value=mocker.Mock(status_code=502))
+    response = policy.request(send, "GET", URL)
+
+    assert response.status_code == 502
+    assert send.call_count == 4
+
+
+def test_request_does_not_retry_client_errors(
+    mocker: MockerFixture, policy: rt.RetryPolicy
+) -> None:
+    """It returns 4xx responses right away."""
+    send = mocker.Mock(return_value=mocker.Mock(status_code=404))
+    policy.request(send, "GET", URL)
+
+    send.assert_called_once()
+
+
+def test_request_does_not_retry_post_response(
+    mocker: MockerFixture, policy: rt.RetryPolicy
+) -> None:
+    """It does not repeat a POST the server may have processed."""
+    send = mocker.Mock(return_value=mocker.Mock(status_code=502))
+    policy.request(send, "POST", URL, data="{}")
+
+    send.assert_called_once()
+
+
+def test_request_retries_connection_errors(
+    mocker: MockerFixture, policy: rt.RetryPolicy
+) -> None:
+    """It retries idempotent requests on connection errors."""
+    ok = mocker.Mock(status_code=200)
+    send = mocker.Mock(side_effect=[requests.exceptions.ReadTimeout(), ok])
+
+    assert policy.request(send, "GET", URL) == ok
+
+
+def test_request_raises_post_connection_errors(
+    mocker: MockerFixture, policy: rt.RetryPolicy
+) -> None:
+    """It raises errors after a POST may have been sent."""
+    send = mocker.Mock(side_effect=requests.exceptions.ConnectionError())
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy.request(send, "POST", URL, data="{}")
+    send.assert_called_once()
+
+
+def test_request_retries_post_connect_timeout(
+    mocker: MockerFixture, policy: rt.RetryPolicy
+) -> None:
+    """It retries a POST that never reached the server."""
+    ok = mocker.Mock(status_code=201)
+    send = mocker.Mock(side_effect=[requests.exceptions.ConnectTimeout(), ok])
+
+    assert policy.request(send, "POST", URL, data="{}") == ok
+
+
+def test_request_retries_post_connection_refused(
+    mocker: MockerFixture, policy: rt.RetryPolicy
+) -> None:
+    """It retries a POST whose connection was refused."""
+    ok = mocker.Mock(status_code=201)
+    refused = requests.exceptions.ConnectionError(
+        urllib3.exceptions.MaxRetryError(
+            mocker.Mock(),
+            URL,
+            urllib3.exceptions.NewConnectionError(
+                mocker.Mock(), "Connection refused"
+            ),
+        )
+    )
+    send = mocker.Mock(side_effect=[refused, ok])
+
+    assert policy.request(send, "POST", URL, data="{}") == ok
+
+
+def test_request_raises_after_retries(
+    mocker: MockerFixture, policy: rt.RetryPolicy
+) -> None:
+    """It raises last connection error."""
+    send = mocker.Mock(side_effect=requests.exceptions.ConnectTimeout())
+
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        policy.request(send, "POST", URL, data="{}")
+    assert send.call_count == 4
+
+
+def test_request_without_retries(mocker: MockerFixture, sleeps: List[float]) -> None:
+    """It sends once."""
+    policy = rt.RetryPolicy(retries=0, sleep=sleeps.append)
+    send = mocker.Mock(side_effect=requests.exceptions.ReadTimeout())
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        policy.request(send, "GET", URL)
+    assert sleeps == []
@@ -0,0 +1,40 @@
+"""Test cases for the command-line startup time."""
+import subprocess  # noqa: S404
+import sys
+from typing import Dict
+
+
+# modules only needed by commands talking to GitHub, prompting or mirroring
+HEAVY_MODULES = (
+    "github3",
+    "requests",
+    "uritemplate",
+    "inquirer",
+    "blessed",
+    "yaml",
+    "sqlite3",
+)
+
+
+def _import_times(module: str) -> Dict[str, float]:
+    """Return cumulative import seconds by module name."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_startup_skips_heavy_modules() -> None:
+    """It does not import GitHub, prompt, YAML or SQLite libraries on startup."""
+    times = _import_times("git_portfolio.__main__")
+
+    assert not set(HEAVY_MODULES) & set(times)
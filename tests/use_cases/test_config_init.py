@@ -70,7 +70,7 @@ def test_execute_attribute_error(
 ) -> None:
     """It returns success."""
     config_manager = mock_config_manager.return_value
-    mock_github_service.side_effect = AttributeError("msg")
+    mock_github_service.side_effect = cs.AuthError("msg")
     response = ci.ConfigInitUseCase(config_manager).execute(domain_gh_conn_settings)
 
     assert bool(response) is False
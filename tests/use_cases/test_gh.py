@@ -1,8 +1,12 @@
 """Test Github use case error handling."""
+import threading
+
 import pytest
 from pytest_mock import MockerFixture
 
 import git_portfolio.domain.config as c
+import git_portfolio.domain.repo_result as rr
+import git_portfolio.profiling as prof
 import git_portfolio.use_cases.gh as gh
 
 
@@ -19,7 +23,9 @@ def mock_config_manager(mocker: MockerFixture) -> MockerFixture:
 @pytest.fixture
 def mock_github_service(mocker: MockerFixture) -> MockerFixture:
     """Fixture for mocking GithubService."""
-    return mocker.patch("git_portfolio.github_service.GithubService", autospec=True)
+    mock = mocker.patch("git_portfolio.github_service.GithubService", autospec=True)
+    mock.return_value.requests_sent.return_value = 0
+    return mock
 
 
 def test_call_github_service_ok(
@@ -30,13 +36,43 @@ def test_call_github_service_ok(
     """It ouputs success message."""
     config_manager = mock_config_manager.return_value
     github_service = mock_github_service.return_value
-    github_service.create_issue_from_repo.return_value = "success message\n"
+    github_service.create_issue_from_repo.return_value = rr.Output(
+        rr.SUCCESS, "success message\n"
+    )
 
     response = gh.GhUseCase(config_manager, github_service).call_github_service(
         "create_issue_from_repo", "", mocker.Mock(), mocker.Mock()
     )
 
-    assert response == "success message\n"
+    assert response == rr.Output(rr.SUCCESS, "success message\n")
+
+
+def test_call_github_service_profiled(
+    mocker: MockerFixture,
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+) -> None:
+    """It records service call with repo of thread."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.create_issue_from_repo.return_value = rr.Output(
+        rr.SUCCESS, "success message\n"
+    )
+    profiler = prof.start()
+    try:
+        with prof.repo_scope("staticdev/omg"):
+            gh.GhUseCase(config_manager, github_service).call_github_service(
+                "create_issue_from_repo", "", mocker.Mock(), mocker.Mock()
+            )
+    finally:
+        prof.stop()
+
+    span = profiler.spans[0]
+    assert (span.name, span.category, span.args) == (
+        "create_issue_from_repo",
+        "service",
+        {"repo": "staticdev/omg"},
+    )
 
 
 def test_call_github_service_error(
@@ -53,7 +89,28 @@ def test_call_github_service_error(
         "create_issue_from_repo", "", mocker.Mock(), mocker.Mock()
     )
 
-    assert response == "some error"
+    assert response == rr.Output(rr.ERROR, "some error")
+
+
+def test_call_github_service_repo_not_found(
+    mocker: MockerFixture,
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+) -> None:
+    """It outputs error of repo without raising, so other repos are changed."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.create_issue_from_repo.side_effect = NameError(
+        "Repository org/repo not found."
+    )
+    gh_use_case = gh.GhUseCase(config_manager, github_service)
+
+    response = gh_use_case.call_github_service(
+        "create_issue_from_repo", "", mocker.Mock(), mocker.Mock()
+    )
+
+    assert response == rr.Output(rr.ERROR, "Repository org/repo not found.\n")
+    assert gh_use_case.error is True
 
 
 def test_generate_response_success(
@@ -83,3 +140,150 @@ def test_generate_response_failure(
 
     assert bool(response) is False
     assert response.value["message"] == "bad output"
+
+
+def test_map_selected_repos_keeps_order(
+    mock_config_manager: MockerFixture, mock_github_service: MockerFixture
+) -> None:
+    """It returns outputs in configured order even if finished out of order."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    finished = threading.Event()
+
+    def task(github_repo: str) -> rr.Output:
+        if github_repo == "staticdev/omg":
+            finished.wait(timeout=1)
+        else:
+            finished.set()
+        return rr.Output(rr.SUCCESS, f"{github_repo}\n")
+
+    output = gh.GhUseCase(config_manager, github_service, jobs=2).map_selected_repos(
+        task
+    )
+
+    assert output == "staticdev/omg\nstaticdev/omg2\n"
+
+
+def test_map_selected_repos_error(
+    mocker: MockerFixture,
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+) -> None:
+    """It keeps error semantics of call_github_service."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.create_issue_from_repo.side_effect = [
+        rr.Output(rr.SUCCESS, "success message\n"),
+        AttributeError("some error\n"),
+    ]
+    gh_use_case = gh.GhUseCase(config_manager, github_service, jobs=1)
+
+    output = gh_use_case.map_selected_repos(
+        lambda repo: gh_use_case.call_github_service(
+            "create_issue_from_repo", "", repo, mocker.Mock()
+        )
+    )
+
+    assert output == "success message\nsome error\n"
+    assert gh_use_case.error is True
+
+
+def test_map_selected_repos_streams_errors(
+    mocker: MockerFixture,
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+) -> None:
+    """It gives outputs to handler and repeats only errors in response."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.create_issue_from_repo.side_effect = [
+        rr.Output(rr.SUCCESS, "success message\n"),
+        AttributeError("some error\n"),
+    ]
+    on_output = mocker.Mock()
+    gh_use_case = gh.GhUseCase(
+        config_manager, github_service, jobs=1, on_output=on_output
+    )
+
+    output = gh_use_case.map_selected_repos(
+        lambda repo: gh_use_case.call_github_service(
+            "create_issue_from_repo", "", repo, mocker.Mock()
+        )
+    )
+    response = gh_use_case.generate_response(output)
+
+    assert output == ""
+    assert [call[0][0].output for call in on_output.call_args_list] == [
+        "success message\n",
+        "some error\n",
+    ]
+    assert response.value["message"] == "some error\n"
+    assert response.results is None
+
+
+def test_generate_response_failure_results(
+    mocker: MockerFixture,
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+) -> None:
+    """It keeps records of all repos in response failure."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.create_issue_from_repo.side_effect = [
+        rr.Output(rr.SUCCESS, "staticdev/omg: create issue successful.\n"),
+        AttributeError("some error\n"),
+    ]
+    gh_use_case = gh.GhUseCase(config_manager, github_service, jobs=1)
+
+    response = gh_use_case.generate_response(
+        gh_use_case.map_selected_repos(
+            lambda repo: gh_use_case.call_github_service(
+                "create_issue_from_repo", "", repo, mocker.Mock()
+            )
+        )
+    )
+
+    assert bool(response) is False
+    assert [result.status for result in response.results] == ["success", "error"]
+
+
+def test_map_selected_repos_results(
+    mock_config_manager: MockerFixture, mock_github_service: MockerFixture
+) -> None:
+    """It keeps a result per repo with requests sent for it."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.requests_sent.side_effect = [0, 2, 2, 3]
+    gh_use_case = gh.GhUseCase(config_manager, github_service, jobs=1)
+    gh_use_case.action = "create_issue"
+    outputs = {
+        "staticdev/omg": rr.Output(
+            rr.SUCCESS, "staticdev/omg: create issue successful.\n"
+        ),
+        "staticdev/omg2": rr.Output(
+            rr.SKIPPED, "staticdev/omg2: Issues are disabled. It may be a fork.\n"
+        ),
+    }
+
+    response = gh_use_case.generate_response(
+        gh_use_case.map_selected_repos(outputs.__getitem__)
+    )
+
+    assert [result.to_dict() for result in response.results] == [
+        {
+            "repo": "staticdev/omg",
+            "action": "create_issue",
+            "status": "success",
+            "detail": "create issue successful.",
+            "duration": response.results[0].duration,
+            "api_calls": 2,
+        },
+        {
+            "repo": "staticdev/omg2",
+            "action": "create_issue",
+            "status": "skipped",
+            "detail": "Issues are disabled. It may be a fork.",
+            "duration": response.results[1].duration,
+            "api_calls": 1,
+        },
+    ]
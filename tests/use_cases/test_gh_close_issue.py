@@ -3,6 +3,8 @@ import pytest
 from pytest_mock import MockerFixture
 
 import git_portfolio.domain.config as c
+import git_portfolio.domain.gh_connection_settings as cs
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.request_objects.issue_list as il
 import git_portfolio.responses as res
 import git_portfolio.use_cases.gh_close_issue as ghci
@@ -26,7 +28,10 @@ def mock_config_manager(mocker: MockerFixture) -> MockerFixture:
 def mock_github_service(mocker: MockerFixture) -> MockerFixture:
     """Fixture for mocking GithubService."""
     mock = mocker.patch("git_portfolio.github_service.GithubService", autospec=True)
-    mock.return_value.close_issues_from_repo.return_value = "success message\n"
+    mock.return_value.close_issues_from_repo.return_value = rr.Output(
+        rr.SUCCESS, "success message\n"
+    )
+    mock.return_value.close_issues_from_repos.return_value = {}
     return mock
 
 
@@ -73,6 +78,25 @@ def test_execute_for_all_repos_failed(
     assert f"{REPO}: no issues closed.\n{REPO2}: no issues closed.\n" == response.value
 
 
+@pytest.mark.parametrize("github_repo", ["", REPO])
+def test_execute_token_revoked(
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+    github_repo: str,
+) -> None:
+    """It raises AuthError instead of closing no issues, eg. cached identity."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.list_issues_from_repos.side_effect = cs.AuthError("Invalid token.")
+    github_service.list_issues_from_repo.side_effect = cs.AuthError("Invalid token.")
+
+    with pytest.raises(cs.AuthError):
+        ghci.GhCloseIssueUseCase(config_manager, github_service).execute(
+            REQUEST_ISSUES, github_repo
+        )
+    github_service.close_issues_from_repo.assert_not_called()
+
+
 def test_execute_for_specific_repo(
     mock_config_manager: MockerFixture,
     mock_github_service: MockerFixture,
@@ -109,3 +133,46 @@ def test_execute_for_specific_repo_failed(
 
     assert bool(response) is True
     assert f"{REPO}: no issues closed.\n" == response.value
+
+
+def test_execute_for_all_repos_searched(
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_gh_list_issue_use_case: MockerFixture,
+) -> None:
+    """It lists only repos not covered by the search."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    list_use_case = mock_gh_list_issue_use_case.return_value
+    list_use_case.execute_for_repos.return_value = {REPO: []}
+    list_use_case.execute.return_value = res.ResponseSuccess([])
+    response = ghci.GhCloseIssueUseCase(config_manager, github_service).execute(
+        REQUEST_ISSUES
+    )
+
+    assert "success message\nsuccess message\n" == response.value
+    list_use_case.execute.assert_called_once_with(REQUEST_ISSUES, REPO2)
+
+
+def test_execute_for_all_repos_batched(
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_gh_list_issue_use_case: MockerFixture,
+) -> None:
+    """It closes one by one only repos not closed in batch."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.close_issues_from_repos.return_value = {
+        REPO: rr.Output(rr.SUCCESS, "batch message\n")
+    }
+    list_use_case = mock_gh_list_issue_use_case.return_value
+    list_use_case.execute_for_repos.return_value = {REPO: [], REPO2: []}
+    response = ghci.GhCloseIssueUseCase(config_manager, github_service).execute(
+        REQUEST_ISSUES
+    )
+
+    assert "batch message\nsuccess message\n" == response.value
+    github_service.close_issues_from_repos.assert_called_once_with(
+        {REPO: [], REPO2: []}
+    )
+    github_service.close_issues_from_repo.assert_called_once_with(REPO2, [])
@@ -6,6 +6,7 @@ from pytest_mock import MockerFixture
 
 import git_portfolio.domain.config as c
 import git_portfolio.domain.pull_request as pr
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.request_objects.issue_list as il
 import git_portfolio.responses as res
 import git_portfolio.use_cases.gh_create_pr as ghcp
@@ -29,7 +30,9 @@ def mock_config_manager(mocker: MockerFixture) -> MockerFixture:
 def mock_github_service(mocker: MockerFixture) -> MockerFixture:
     """Fixture for mocking GithubService."""
     mock = mocker.patch("git_portfolio.github_service.GithubService", autospec=True)
-    mock.return_value.create_pull_request_from_repo.return_value = "success message\n"
+    mock.return_value.create_pull_request_from_repo.return_value = rr.Output(
+        rr.SUCCESS, "success message\n"
+    )
     return mock
 
 
@@ -226,3 +229,23 @@ def test_execute_link_issue_for_specific_repo_e2e(
 
     assert bool(response) is True
     assert "success message\n" == response.value
+
+
+def test_execute_link_issue_searched(
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_gh_list_issue_use_case: MockerFixture,
+    domain_prs: List[pr.PullRequest],
+) -> None:
+    """It lists only repos not covered by the search."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    list_use_case = mock_gh_list_issue_use_case.return_value
+    list_use_case.execute_for_repos.return_value = {"staticdev/omg": []}
+    list_use_case.execute.return_value = res.ResponseSuccess([])
+    response = ghcp.GhCreatePrUseCase(config_manager, github_service).execute(
+        domain_prs[1], REQUEST_ISSUES
+    )
+
+    assert "success message\nsuccess message\n" == response.value
+    list_use_case.execute.assert_called_once_with(REQUEST_ISSUES, "staticdev/omg2")
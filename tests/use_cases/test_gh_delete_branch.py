@@ -3,6 +3,7 @@ import pytest
 from pytest_mock import MockerFixture
 
 import git_portfolio.domain.config as c
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.use_cases.gh_delete_branch as ghdb
 
 
@@ -20,7 +21,9 @@ def mock_config_manager(mocker: MockerFixture) -> MockerFixture:
 def mock_github_service(mocker: MockerFixture) -> MockerFixture:
     """Fixture for mocking GithubService."""
     mock = mocker.patch("git_portfolio.github_service.GithubService", autospec=True)
-    mock.return_value.delete_branch_from_repo.return_value = "success message\n"
+    mock.return_value.delete_branch_from_repo.return_value = rr.Output(
+        rr.SUCCESS, "success message\n"
+    )
     return mock
 
 
@@ -139,3 +139,37 @@ def test_execute_handles_bad_request(
         "type": res.ResponseTypes.PARAMETERS_ERROR,
         "message": "filters: Is not iterable",
     }
+
+
+def test_execute_for_repos(
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+    domain_issues: List[i.Issue],
+) -> None:
+    """It returns issues by repo."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.list_issues_from_repos.return_value = {
+        "staticdev/omg": domain_issues
+    }
+    request = il.build_list_request(filters={"state__eq": "open"})
+    result = li.GhListIssueUseCase(config_manager, github_service).execute_for_repos(
+        request, ["staticdev/omg"]
+    )
+
+    assert result == {"staticdev/omg": domain_issues}
+
+
+def test_execute_for_repos_handles_generic_error(
+    mock_config_manager: MockerFixture, mock_github_service: MockerFixture
+) -> None:
+    """It returns no searched repos."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.list_issues_from_repos.side_effect = Exception("Just an error")
+    request = il.build_list_request(filters={"state__eq": "open"})
+    result = li.GhListIssueUseCase(config_manager, github_service).execute_for_repos(
+        request, ["staticdev/omg"]
+    )
+
+    assert result == {}
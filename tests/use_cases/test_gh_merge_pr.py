@@ -6,6 +6,7 @@ from pytest_mock import MockerFixture
 
 import git_portfolio.domain.config as c
 import git_portfolio.domain.pull_request_merge as mpr
+import git_portfolio.domain.repo_result as rr
 import git_portfolio.use_cases.gh_merge_pr as ghmp
 
 
@@ -25,7 +26,10 @@ def mock_config_manager(mocker: MockerFixture) -> MockerFixture:
 def mock_github_service(mocker: MockerFixture) -> MockerFixture:
     """Fixture for mocking GithubService."""
     mock = mocker.patch("git_portfolio.github_service.GithubService", autospec=True)
-    mock.return_value.merge_pull_request_from_repo.return_value = "success message\n"
+    mock.return_value.merge_pull_request_from_repo.return_value = rr.Output(
+        rr.SUCCESS, "success message\n"
+    )
+    mock.return_value.merge_pull_requests_from_repos.return_value = {}
     return mock
 
 
@@ -62,6 +66,9 @@ def test_execute_for_all_repos(
 
     assert bool(response) is True
     assert "success message\nsuccess message\n" == response.value
+    github_service.prefetch_pull_requests.assert_called_once_with(
+        config_manager.config.github_selected_repos, domain_mprs[0]
+    )
 
 
 def test_execute_delete_branch(
@@ -113,3 +120,24 @@ def test_execute_delete_branch_for_specific_repo(
     assert bool(response) is True
     assert "success message\n" == response.value
     mock_gh_delete_branch_use_case.assert_called_once()
+
+
+def test_execute_for_all_repos_batched(
+    mock_config_manager: MockerFixture,
+    mock_github_service: MockerFixture,
+    domain_mprs: List[mpr.PullRequestMerge],
+) -> None:
+    """It merges one by one only repos not merged in batch."""
+    config_manager = mock_config_manager.return_value
+    github_service = mock_github_service.return_value
+    github_service.merge_pull_requests_from_repos.return_value = {
+        REPO: rr.Output(rr.SUCCESS, "batch message\n")
+    }
+    response = ghmp.GhMergePrUseCase(config_manager, github_service).execute(
+        domain_mprs[0]
+    )
+
+    assert "batch message\nsuccess message\n" == response.value
+    github_service.merge_pull_request_from_repo.assert_called_once_with(
+        REPO2, domain_mprs[0]
+    )
@@ -1,9 +1,13 @@
 """Test cases for the git use case."""
+import threading
 from typing import Any
+from typing import Tuple
 
 import pytest
 from pytest_mock import MockerFixture
 
+import git_portfolio.domain.repo_result as rr
+import git_portfolio.profiling as prof
 import git_portfolio.use_cases.git as git
 
 
@@ -102,3 +106,101 @@ def test_execute_error_during_execution(mock_popen: MockerFixture) -> None:
         response.value
         == "notcloned: error: pathspec 'xyz' did not match any file(s) known to git"
     )
+
+
+def test_execute_keeps_repo_order(
+    mocker: MockerFixture, mock_check_command_installed: MockerFixture
+) -> None:
+    """It returns output blocks in configured order even if finished out of order."""
+    finished = threading.Event()
+
+    def first_communicate() -> Tuple[bytes, bytes]:
+        finished.wait(timeout=1)
+        return b"first", b""
+
+    def second_communicate() -> Tuple[bytes, bytes]:
+        finished.set()
+        return b"second", b""
+
+    def popen(*args: Any, **kwargs: Any) -> Any:
+        if kwargs["cwd"].endswith("omg"):
+            return mocker.Mock(returncode=0, communicate=first_communicate)
+        return mocker.Mock(returncode=0, communicate=second_communicate)
+
+    mocker.patch("subprocess.Popen", side_effect=popen)
+    response = git.GitUseCase(jobs=2).execute(
+        ["staticdev/omg", "staticdev/omg2"], "pull", ()
+    )
+
+    assert response.value == "omg: first\nomg2: second\n"
+
+
+def test_execute_streams_outputs(
+    mocker: MockerFixture, mock_check_command_installed: MockerFixture
+) -> None:
+    """It gives results to handler in repo order, before later repos are done."""
+    streamed = threading.Event()
+    outputs = []
+    streamed_before_second = []
+
+    def first_communicate() -> Tuple[bytes, bytes]:
+        return b"first", b""
+
+    def second_communicate() -> Tuple[bytes, bytes]:
+        streamed_before_second.append(streamed.wait(timeout=1))
+        return b"second", b""
+
+    def popen(*args: Any, **kwargs: Any) -> Any:
+        if kwargs["cwd"].endswith("omg"):
+            return mocker.Mock(returncode=0, communicate=first_communicate)
+        return mocker.Mock(returncode=0, communicate=second_communicate)
+
+    def on_output(result: rr.RepoResult) -> None:
+        outputs.append(result.output)
+        streamed.set()
+
+    mocker.patch("subprocess.Popen", side_effect=popen)
+    response = git.GitUseCase(jobs=2, on_output=on_output).execute(
+        ["staticdev/omg", "staticdev/omg2"], "pull", ()
+    )
+
+    assert response.value == ""
+    assert outputs == ["omg: first\n", "omg2: second\n"]
+    assert streamed_before_second == [True]
+
+
+def test_execute_results(
+    mock_popen: MockerFixture, mock_check_command_installed: MockerFixture
+) -> None:
+    """It returns a result per repo."""
+    mock_popen.return_value.returncode = 1
+    mock_popen.return_value.communicate.return_value = (b"", b"error: no branch\n")
+    response = git.GitUseCase().execute(["staticdev/omg"], "checkout", ("xx",))
+
+    result = response.results[0]
+
+    assert (result.repo, result.action, result.status, result.detail) == (
+        "staticdev/omg",
+        "checkout",
+        "error",
+        "error: no branch",
+    )
+
+
+def test_execute_profiled(
+    mock_popen: MockerFixture, mock_check_command_installed: MockerFixture
+) -> None:
+    """It records git command and time spent on each repo."""
+    prof.start()
+    git.GitUseCase().execute(["staticdev/omg"], "checkout", ("xx",))
+    profiler = prof.stop()
+
+    assert profiler is not None
+    git_call = profiler.git_calls[0]
+    assert (git_call.repo, git_call.argv, git_call.returncode) == (
+        "staticdev/omg",
+        ["git", "checkout", "xx"],
+        0,
+    )
+    span = profiler.repo_spans[0]
+    assert (span.repo, span.action) == ("staticdev/omg", "checkout")
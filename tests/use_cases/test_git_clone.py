@@ -16,6 +16,12 @@ def mock_popen(mocker: MockerFixture) -> Any:
     return mock
 
 
+@pytest.fixture
+def mock_perf_counter(mocker: MockerFixture) -> Any:
+    """Fixture for mocking time.perf_counter."""
+    return mocker.patch("time.perf_counter", side_effect=[0.0, 1.5, 0.0, 1.5])
+
+
 @pytest.fixture
 def mock_github_service(mocker: MockerFixture) -> MockerFixture:
     """Fixture for mocking GithubService."""
@@ -32,6 +38,7 @@ def mock_check_command_installed(mocker: MockerFixture) -> Any:
 
 
 def test_execute_success(
+    mock_perf_counter: MockerFixture,
     mock_github_service: MockerFixture,
     mock_check_command_installed: MockerFixture,
     mock_popen: MockerFixture,
@@ -43,7 +50,39 @@ def test_execute_success(
     )
 
     assert bool(response) is True
-    assert response.value == "omg: clone successful.\nomg2: clone successful.\n"
+    assert response.value == (
+        "omg: clone successful (1.50s).\nomg2: clone successful (1.50s).\n"
+    )
+    github_service.prefetch_repo_urls.assert_called_once_with(
+        ["staticdev/omg", "staticdev/omg2"]
+    )
+
+
+def test_execute_streams_outputs(
+    mocker: MockerFixture,
+    mock_perf_counter: MockerFixture,
+    mock_github_service: MockerFixture,
+    mock_check_command_installed: MockerFixture,
+    mock_popen: MockerFixture,
+) -> None:
+    """It gives results to handler."""
+    on_output = mocker.Mock()
+    github_service = mock_github_service.return_value
+    github_service.requests_sent.side_effect = [4, 5]
+    response = gcuc.GitCloneUseCase(
+        github_service, jobs=1, on_output=on_output
+    ).execute(["staticdev/omg"])
+    result = on_output.call_args[0][0]
+
+    assert response.value == ""
+    assert response.results == []
+    assert result.output == "omg: clone successful (1.50s).\n"
+    assert (result.repo, result.action, result.status) == (
+        "staticdev/omg",
+        "clone",
+        "success",
+    )
+    assert result.api_calls == 1
 
 
 def test_execute_git_not_installed(
@@ -97,3 +136,24 @@ def test_execute_error_during_execution(
         "x: fatal: destination path 'x' already exists and is not an empty "
         "directory.\n"
     )
+
+
+def test_execute_with_args(
+    mock_github_service: MockerFixture,
+    mock_check_command_installed: MockerFixture,
+    mock_popen: MockerFixture,
+) -> None:
+    """It passes extra arguments before the clone url."""
+    github_service = mock_github_service.return_value
+    github_service.get_repo_url.return_value = "git@github.com:staticdev/omg.git"
+    gcuc.GitCloneUseCase(github_service).execute(
+        ["staticdev/omg"], ("--depth=1", "--filter=blob:none")
+    )
+
+    assert mock_popen.call_args[0][0] == [
+        "git",
+        "clone",
+        "--depth=1",
+        "--filter=blob:none",
+        "git@github.com:staticdev/omg.git",
+    ]